@@ -1,21 +1,43 @@
 """Anatomical fiducial classes"""
 from __future__ import annotations
 
-import json
+import os
 import warnings
-from collections.abc import Iterable
-from importlib import resources
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from functools import partial
 from os import PathLike
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast, overload
 
 import attrs
+import numpy as np
+from numpy.typing import NDArray
 
 from afids_utils.exceptions import InvalidFiducialError, InvalidFileError
+from afids_utils.ext._io import (
+    AfidsSource,
+    AfidsTarget,
+    is_path,
+    resolve_format,
+)
+from afids_utils.resources import load_protocol, load_protocol_index
 
-with resources.open_text(
-    "afids_utils.resources", "afids_descs.json"
-) as json_fpath:
-    HUMAN_PROTOCOL_MAP = json.load(json_fpath)["human"]
+if TYPE_CHECKING:
+    from afids_utils.cache import ParseCache
+    from afids_utils.ext.binary import MmapMode
+
+
+def __getattr__(name: str) -> Any:
+    # Protocol is only parsed on first access, rather than at import
+    if name == "HUMAN_PROTOCOL_MAP":
+        return [afid._asdict() for afid in load_protocol("human")]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _validate_desc(
@@ -23,10 +45,7 @@ def _validate_desc(
     attribute: attrs.Attribute[str],
     value: str,
 ):
-    if value not in [
-        HUMAN_PROTOCOL_MAP[self.label - 1]["desc"],
-        HUMAN_PROTOCOL_MAP[self.label - 1]["acronym"],
-    ]:
+    if value not in load_protocol_index("human").descs[self.label - 1]:
         raise InvalidFiducialError(
             f"Description {value} does not correspond to label {self.label}."
         )
@@ -66,11 +85,11 @@ def sort_afids(afids: Iterable[AfidPosition]) -> list[AfidPosition]:
 
 
 def _validate_afids(
-    instance: AfidSet,
-    attribute: attrs.Attribute[list[AfidPosition]],
+    instance: _AfidSetBase,
+    attribute: attrs.Attribute[list[AfidPosition]] | None,
     value: list[AfidPosition],
 ):
-    if len(value) != (expected_length := len(HUMAN_PROTOCOL_MAP)):
+    if len(value) != (expected_length := len(load_protocol("human"))):
         raise ValueError(
             f"Incorrect number of AFIDs. Expected {expected_length}, "
             f"found: {len(value)}"
@@ -93,6 +112,80 @@ def _validate_afids(
         raise ValueError(msg)
 
 
+def _validate_labelled_descs(
+    labels: NDArray[np.int_], descs: Sequence[str]
+) -> None:
+    """Validate labels and descriptions parsed alongside an array of
+    coordinates, as would be done when creating each ``AfidPosition``"""
+    protocol_descs = load_protocol_index("human").descs
+    for label, desc in zip(labels.tolist(), descs):
+        if not 1 <= label <= len(protocol_descs):
+            raise ValueError(
+                f"'label' must be in range(1, {len(protocol_descs) + 1}) "
+                f"(got {label})"
+            )
+        if desc not in protocol_descs[label - 1]:
+            raise InvalidFiducialError(
+                f"Description {desc} does not correspond to label {label}."
+            )
+
+
+def _slicer_coord_system(coord_system: str) -> str:
+    """Internal function to validate a coordinate system, returning the code
+    used by Slicer to store it ("0" for RAS, "1" for LPS)"""
+    if coord_system not in ["RAS", "LPS", "0", "1"]:
+        raise ValueError("AfidSet contains an invalid coordinate system")
+    return {"RAS": "0", "LPS": "1"}.get(coord_system, coord_system)
+
+
+def _afids_to_coords(
+    instance: _AfidSetBase, afids: Iterable[AfidPosition]
+) -> NDArray[np.float_]:
+    """Internal function to sort and validate AFIDs, returning their spatial
+    coordinates as a (32, 3) array"""
+    afids = list(afids)
+    # Only sort if AFIDs are not already ordered by label
+    if any(prev.label > afid.label for prev, afid in zip(afids, afids[1:])):
+        afids = sort_afids(afids)
+    _validate_afids(instance, None, afids)
+
+    return np.array(
+        [[afid.x, afid.y, afid.z] for afid in afids], dtype=np.float_
+    )
+
+
+def _create_executor(executor: str, workers: int | None) -> Executor:
+    """Internal function to create a bounded pool of workers
+
+    Parameters
+    ----------
+    executor
+        Type of pool to create - one of ["thread", "process"]
+
+    workers
+        Maximum number of workers in pool. If none provided, the number of
+        CPUs is used
+
+    Returns
+    -------
+    Executor
+        Pool of workers to submit tasks to
+
+    Raises
+    ------
+    ValueError
+        If invalid executor type provided
+    """
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    elif executor == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+
+    raise ValueError(
+        "Unsupported executor - please select 'thread' or 'process'"
+    )
+
+
 @attrs.define
 class AfidVoxel:
     """Class for Afid voxel position
@@ -122,10 +215,58 @@ class AfidVoxel:
     desc: str = attrs.field()
 
 
-@attrs.define(kw_only=True)
-class AfidSet:
+class _AfidSetBase:
+    """Internal base class storing the AFIDs of an ``AfidSet`` as a (32, 3)
+    array, exposed through the ``afids`` field as ``AfidPosition`` objects.
+    The array of a lazily loaded set is only parsed when first accessed"""
+
+    _coords_array: NDArray[np.float_]
+    # File (and its format) to parse the AFIDs from on first access
+    _lazy_source: tuple[PathLike[str] | str | bytes, str | None] | None = None
+
+    @property
+    def _coords(self) -> NDArray[np.float_]:
+        if self._lazy_source is not None:
+            afids_fpath, file_format = self._lazy_source
+            self._coords = AfidSet.load(
+                afids_fpath, format=file_format
+            )._coords
+        return self._coords_array
+
+    @_coords.setter
+    def _coords(self, value: NDArray[np.float_]) -> None:
+        self._coords_array = value
+        if self._lazy_source is not None:
+            self._lazy_source = None
+
+    @property
+    def afids(self) -> list[AfidPosition]:
+        """List of AFID labels and their coordinates"""
+        protocol = load_protocol("human")
+        return [
+            AfidPosition(
+                label=label,
+                x=x,
+                y=y,
+                z=z,
+                desc=protocol[label - 1].desc,
+            )
+            for label, (x, y, z) in enumerate(self._coords.tolist(), start=1)
+        ]
+
+    @afids.setter
+    def afids(self, value: Iterable[AfidPosition]) -> None:
+        self._coords = _afids_to_coords(self, value)
+
+
+@attrs.define(kw_only=True, slots=False)
+class AfidSet(_AfidSetBase):
     """Base class for a set of AFIDs
 
+    Coordinates are stored internally as a contiguous (32, 3) array, ordered
+    by AFID label. ``AfidPosition`` objects are only created when ``afids``
+    or ``get_afid`` are accessed.
+
     Parameters
     ----------
     slicer_version
@@ -140,21 +281,243 @@ class AfidSet:
 
     slicer_version: str = attrs.field()
     coord_system: str = attrs.field()
+    # Stored as an array by the inherited property (see ``_AfidSetBase``)
+    afids: list[AfidPosition] = attrs.field()  # pyright: ignore
 
-    afids: list[AfidPosition] = attrs.field(
-        converter=sort_afids,
-        validator=_validate_afids,
-    )
+    def __eq__(self, other: object) -> bool:
+        if (
+            not isinstance(other, AfidSet)
+            or other.__class__ is not self.__class__
+        ):
+            return NotImplemented
+        return (
+            self.slicer_version == other.slicer_version
+            and self.coord_system == other.coord_system
+            and np.array_equal(self._coords, other._coords)
+        )
+
+    @classmethod
+    def from_array(
+        cls,
+        coords: NDArray[np.float_],
+        coord_system: str,
+        slicer_version: str = "Unknown",
+        labels: NDArray[np.int_] | Sequence[int] | None = None,
+        validate: str = "full",
+    ) -> AfidSet:
+        """Create an ``AfidSet`` directly from an array of coordinates
+
+        Parameters
+        ----------
+        coords
+            Array of shape (32, 3) containing AFID spatial coordinates. If
+            already a C-contiguous float64 array, it is used without copying
+
+        coord_system
+            Coordinate system AFIDs are placed in (e.g. RAS)
+
+        slicer_version
+            Version of Slicer associated with AfidSet (default: "Unknown")
+
+        labels
+            Label of each row of ``coords``. If none provided, rows are
+            assumed to be ordered by label. Rows are only reordered if the
+            labels are not already in order
+
+        validate
+            Level of validation to perform - one of ["full", "fast",
+            "none"] (default: "full"). "full" validates each AFID as
+            ``AfidPosition``, "fast" performs a single vectorized check of
+            the array shape and labels, while "none" trusts the input
+            entirely
+
+        Returns
+        -------
+        AfidSet
+            Set of anatomical fiducials containing coordinates and metadata
+
+        Raises
+        ------
+        ValueError
+            If invalid validation level provided, or if validation fails
+            due to an incorrect shape or labels
+        """
+        if validate not in ["full", "fast", "none"]:
+            raise ValueError(
+                "Unsupported validation - please select 'full', 'fast' or "
+                "'none'"
+            )
+        coords = np.ascontiguousarray(coords, dtype=np.float_)
+        expected_length = len(load_protocol("human"))
+
+        if validate != "none" and coords.shape != (expected_length, 3):
+            raise ValueError(
+                f"Incorrect shape of AFID coordinates. Expected "
+                f"({expected_length}, 3), found: {coords.shape}"
+            )
+
+        if validate == "full":
+            protocol = load_protocol("human")
+            afid_labels = (
+                range(1, len(coords) + 1) if labels is None else labels
+            )
+            return cls(
+                slicer_version=slicer_version,
+                coord_system=coord_system,
+                afids=[
+                    AfidPosition(
+                        label=int(label),
+                        x=x,
+                        y=y,
+                        z=z,
+                        # Invalid labels are rejected before desc is checked
+                        desc=protocol[(int(label) - 1) % len(protocol)].desc,
+                    )
+                    for label, (x, y, z) in zip(afid_labels, coords.tolist())
+                ],
+            )
+
+        if (
+            validate == "fast"
+            and labels is not None
+            and not np.array_equal(
+                np.sort(labels), np.arange(1, expected_length + 1)
+            )
+        ):
+            raise ValueError("Found afids with incorrect labels")
+
+        # Only reorder rows if labels are not already in order
+        if labels is not None and np.any(np.diff(labels) < 0):
+            coords = coords[np.argsort(labels, kind="stable")]
+
+        return cls._from_coords(
+            slicer_version=slicer_version,
+            coord_system=coord_system,
+            coords=coords,
+        )
+
+    @classmethod
+    def _from_coords(
+        cls,
+        slicer_version: str,
+        coord_system: str,
+        coords: NDArray[np.float_],
+    ) -> AfidSet:
+        """Internal constructor wrapping an already validated (32, 3) array
+        without copying it"""
+        afid_set = cls.__new__(cls)
+        afid_set.slicer_version = slicer_version
+        afid_set.coord_system = coord_system
+        afid_set._coords = coords
+        return afid_set
+
+    @property
+    def coords(self) -> NDArray[np.float_]:
+        """Read-only (32, 3) view of AFID spatial coordinates (in mm), ordered
+        by label"""
+        coords = self._coords.view()
+        coords.flags.writeable = False
+        return coords
+
+    @classmethod
+    def _from_labelled_arrays(
+        cls,
+        slicer_version: str,
+        coord_system: str,
+        labels: NDArray[np.int_],
+        descs: Sequence[str],
+        coords: NDArray[np.float_],
+    ) -> AfidSet:
+        """Create an AfidSet from arrays parsed from a fiducial file, with the
+        same validation as creating each ``AfidPosition``"""
+        _validate_labelled_descs(labels, descs)
+
+        # Check expected number of fiducials exist
+        if len(labels) != len(load_protocol("human")):
+            raise InvalidFileError("Unexpected number of fiducials")
+
+        return cls.from_array(
+            coords,
+            coord_system=coord_system,
+            slicer_version=slicer_version,
+            labels=labels,
+            validate="fast",
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether AFIDs have been parsed (see ``load_lazy``)"""
+        return self._lazy_source is None
+
+    @classmethod
+    def load_lazy(
+        cls,
+        afids_fpath: PathLike[str] | str | bytes,
+        format: str | None = None,
+    ) -> AfidSet:
+        """
+        Load an AFIDs file, reading only its metadata until its AFIDs are
+        first accessed
+
+        Parameters
+        ----------
+        afids_fpath
+            Path to .fcsv or .json file (optionally compressed) containing
+            AFIDs information, or bytes of its contents
+
+        format
+            Format of the AFIDs file ("fcsv" or "json"). Required if not
+            loading from a path, otherwise inferred from the file extension
+
+        Returns
+        -------
+        AfidSet
+            Set of anatomical fiducials, whose AFIDs are parsed (and
+            validated) from the file when first accessed
+
+        Raises
+        ------
+        ValueError
+            If not loading from a path or bytes, as streams cannot be read
+            again once AFIDs are accessed
+
+        InvalidFileError
+            If header of fiducial file is missing or invalid
+        """
+        if not (is_path(afids_fpath) or isinstance(afids_fpath, bytes)):
+            raise ValueError("Lazy loading requires a file path or bytes")
+
+        afid_set = cls.__new__(cls)
+        afid_set.slicer_version, afid_set.coord_system = scan_metadata(
+            afids_fpath, format
+        )
+        afid_set._lazy_source = (afids_fpath, format)
+        return afid_set
 
     @classmethod
-    def load(cls, afids_fpath: PathLike[str] | str) -> AfidSet:
+    def load(
+        cls,
+        afids_fpath: AfidsSource,
+        format: str | None = None,
+        cache: ParseCache | None = None,
+    ) -> AfidSet:
         """
         Load an AFIDs file
 
         Parameters
         ----------
         afids_fpath
-            Path to .fcsv or .json file containing AFIDs information
+            Path to .fcsv or .json file (optionally compressed, e.g.
+            ".fcsv.gz") containing AFIDs information, or a text / binary
+            stream or bytes of its contents
+
+        format
+            Format of the AFIDs file ("fcsv" or "json"). Required if not
+            loading from a path, otherwise inferred from the file extension
+
+        cache
+            Cache of previously parsed files (see ``ParseCache``), used when
+            loading from a path
 
         Returns
         -------
@@ -173,90 +536,183 @@ class AfidSet:
             If description in fiducial file does not match expected
         """
         # Check if file exists
-        afids_fpath = Path(afids_fpath)
-        if not afids_fpath.exists():
+        if is_path(afids_fpath) and not Path(afids_fpath).exists():
             raise FileNotFoundError("Provided AFID file does not exist")
 
-        afids_fpath_ext = afids_fpath.suffix
+        # Skip parsing if file is unchanged since being cached
+        if cache is not None and is_path(afids_fpath):
+            afid_set = cache.get(afids_fpath)
+            if afid_set is None:
+                afid_set = cls.load(afids_fpath, format=format)
+                cache.put(afids_fpath, afid_set)
+            return afid_set
+
+        # Load fiducial file directly into arrays, skipping the creation of
+        # AfidPosition objects
+        if resolve_format(afids_fpath, format) == "fcsv":
+            from afids_utils.ext.fcsv import load_fcsv_arrays as load_arrays
+        else:
+            from afids_utils.ext.json import load_json_arrays as load_arrays
 
-        # Loading fcsv
-        if afids_fpath_ext == ".fcsv":
-            from afids_utils.ext.fcsv import load_fcsv
+        return cls._from_labelled_arrays(*load_arrays(afids_fpath))
 
-            slicer_version, coord_system, afids_positions = load_fcsv(
-                afids_fpath
-            )
-        # Loading json
-        elif afids_fpath_ext == ".json":
-            from afids_utils.ext.json import load_json
+    @classmethod
+    def load_many(
+        cls,
+        afids_fpaths: Iterable[PathLike[str] | str],
+        workers: int | None = None,
+        executor: str = "thread",
+        cache: ParseCache | None = None,
+    ) -> list[AfidSet]:
+        """
+        Load multiple AFIDs files concurrently
 
-            slicer_version, coord_system, afids_positions = load_json(
-                afids_fpath
-            )
-        else:
-            raise ValueError("Unsupported file extension")
-
-        # Perform validation of loaded file
-        # Load expected mappings
-        with resources.open_text(
-            "afids_utils.resources", "afids_descs.json"
-        ) as json_fpath:
-            mappings = json.load(json_fpath)
-        # Check expected number of fiducials exist
-        if len(afids_positions) != len(mappings["human"]):
-            raise InvalidFileError("Unexpected number of fiducials")
+        Parameters
+        ----------
+        afids_fpaths
+            Paths to .fcsv or .json files containing AFIDs information
 
-        return cls(
-            slicer_version=slicer_version,
-            coord_system=coord_system,
-            afids=afids_positions,
+        workers
+            Maximum number of files loaded at once. If none provided, the
+            number of CPUs is used
+
+        executor
+            Type of worker pool to load files with - one of ["thread",
+            "process"] (default: "thread")
+
+        cache
+            Cache of previously parsed files (see ``ParseCache``)
+
+        Returns
+        -------
+        list[AfidSet]
+            Sets of anatomical fiducials, in the same order as the provided
+            paths
+
+        Raises
+        ------
+        ValueError
+            If invalid executor type provided
+
+        Notes
+        -----
+        Any error raised while loading a file (see ``AfidSet.load``) is
+        re-raised once encountered
+        """
+        afids_fpaths = list(afids_fpaths)
+        # Batch files sent to each process to reduce pickling overhead
+        chunksize = max(
+            1, len(afids_fpaths) // (4 * (workers or os.cpu_count() or 1))
         )
 
-    def save(self, out_fpath: PathLike[str] | str) -> None:
+        with _create_executor(executor, workers) as pool:
+            return list(
+                pool.map(
+                    partial(cls.load, cache=cache),
+                    afids_fpaths,
+                    chunksize=chunksize,
+                )
+            )
+
+    @classmethod
+    def iter_load_many(
+        cls,
+        afids_fpaths: Iterable[PathLike[str] | str],
+        workers: int | None = None,
+        executor: str = "thread",
+        cache: ParseCache | None = None,
+    ) -> Iterator[tuple[PathLike[str] | str, AfidSet]]:
+        """
+        Load multiple AFIDs files concurrently, yielding each as it completes
+
+        Parameters
+        ----------
+        afids_fpaths
+            Paths to .fcsv or .json files containing AFIDs information
+
+        workers
+            Maximum number of files loaded at once. If none provided, the
+            number of CPUs is used
+
+        executor
+            Type of worker pool to load files with - one of ["thread",
+            "process"] (default: "thread")
+
+        cache
+            Cache of previously parsed files (see ``ParseCache``)
+
+        Yields
+        ------
+        tuple[PathLike[str] | str, AfidSet]
+            Path of loaded file and its set of anatomical fiducials, in order
+            of completion
+
+        Raises
+        ------
+        ValueError
+            If invalid executor type provided
+        """
+        with _create_executor(executor, workers) as pool:
+            futures = {
+                pool.submit(cls.load, afids_fpath, cache=cache): afids_fpath
+                for afids_fpath in afids_fpaths
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def save(
+        self,
+        out_fpath: AfidsTarget,
+        format: str | None = None,
+        compresslevel: int | None = None,
+    ) -> None:
         """Save AFIDs to Slicer-compatible file
 
         Parameters
         ----------
         out_fpath
-            Path of file (including filename and extension) to save AFIDs to
+            Path of file (including filename and extension) to save AFIDs to,
+            or a text / binary stream to write to
+
+        format
+            Format to save AFIDs as ("fcsv" or "json"). Required if not
+            saving to a path, otherwise inferred from the file extension
+
+        compresslevel
+            Compression level when saving to a compressed file (i.e. with a
+            ".gz", ".bz2" or ".xz" suffix). If none provided, the default
+            level of the compression library is used
 
         Raises
         ------
         ValueError
             If file extension is not supported
         """
-
-        out_fpath_ext = Path(out_fpath).suffix
+        out_format = resolve_format(out_fpath, format)
 
         # Update coordinate system for template
-        if self.coord_system not in ["RAS", "LPS", "0", "1"]:
-            raise ValueError("AfidSet contains an invalid coordinate system")
-        elif self.coord_system == "RAS":
-            self.coord_system = "0"
-        elif self.coord_system == "LPS":
-            self.coord_system = "1"
+        self.coord_system = _slicer_coord_system(self.coord_system)
 
         # Saving fcsv
-        if out_fpath_ext == ".fcsv":
+        if out_format == "fcsv":
             from afids_utils.ext.fcsv import save_fcsv
 
-            save_fcsv(self, out_fpath)
+            save_fcsv(self, out_fpath, compresslevel=compresslevel)
         # Saving json
-        elif out_fpath_ext == ".json":
+        else:
             from afids_utils.ext.json import save_json
 
-            save_json(self, out_fpath)
-        else:
-            raise ValueError("Unsupported file extension")
+            save_json(self, out_fpath, compresslevel=compresslevel)
 
-    def get_afid(self, label: int) -> AfidPosition:
+    def get_afid(self, label: int | str) -> AfidPosition:
         """
         Extract a specific AFID's spatial coordinates
 
         Parameters
         ----------
         label
-            Unique AFID label to extract from
+            Unique AFID label, or its description / acronym (e.g. "AC"),
+            to extract from
 
         Returns
         -------
@@ -266,14 +722,306 @@ class AfidSet:
         Raises
         ------
         InvalidFiducialError
-            If AFID label given out of valid range
+            If AFID label given out of valid range or description / acronym
+            is not part of the protocol
         """
+        # Look up label by description / acronym
+        if isinstance(label, str):
+            try:
+                label = load_protocol_index("human").labels[label]
+            except KeyError:
+                raise InvalidFiducialError(f"AFID {label} is not valid")
 
         # Fiducial selection out of bounds
-        if label < 1 or label > len(self.afids):
+        if label < 1 or label > len(self._coords):
             raise InvalidFiducialError(f"AFID label {label} is not valid")
 
-        return self.afids[label - 1]
+        x, y, z = self._coords[label - 1].tolist()
+        protocol = load_protocol("human")
+        return AfidPosition(
+            label=label,
+            x=x,
+            y=y,
+            z=z,
+            desc=protocol[label - 1].desc,
+        )
+
+
+def scan_metadata(
+    afids_fpath: AfidsSource, format: str | None = None
+) -> tuple[str, str]:
+    """Read only the metadata of an AFIDs file, without parsing any AFIDs
+
+    Only the header of .fcsv files is read, while .json files are streamed
+    until the coordinate system of the first markups node.
+
+    Parameters
+    ----------
+    afids_fpath
+        Path to .fcsv or .json file (optionally compressed) containing AFIDs
+        information, or a text / binary stream or bytes of its contents
+
+    format
+        Format of the AFIDs file ("fcsv" or "json"). Required if not
+        reading from a path, otherwise inferred from the file extension
+
+    Returns
+    -------
+    slicer_version
+        Slicer version associated with fiducial file
+
+    coord_system
+        Coordinate system of fiducials
+
+    Raises
+    ------
+    InvalidFileError
+        If header of fiducial file is missing or invalid
+    """
+    if is_path(afids_fpath) and not Path(afids_fpath).exists():
+        raise FileNotFoundError("Provided AFID file does not exist")
+
+    if resolve_format(afids_fpath, format) == "fcsv":
+        from afids_utils.ext.fcsv import load_fcsv_metadata as load_metadata
+    else:
+        from afids_utils.ext.json import load_json_metadata as load_metadata
+
+    return load_metadata(afids_fpath)
+
+
+def _validate_cohort_coords(
+    instance: AfidCohort,
+    attribute: attrs.Attribute[NDArray[np.float_]],
+    value: NDArray[np.float_],
+):
+    expected_length = len(load_protocol("human"))
+    if value.ndim != 3 or value.shape[1:] != (expected_length, 3):
+        raise ValueError(
+            f"Incorrect shape of cohort coordinates. Expected "
+            f"(N, {expected_length}, 3), found: {value.shape}"
+        )
+
+
+def _validate_cohort_metadata(
+    instance: AfidCohort,
+    attribute: attrs.Attribute[NDArray[np.str_]],
+    value: NDArray[np.str_],
+):
+    if value.shape != (expected_length := len(instance.coords),):
+        raise ValueError(
+            f"Incorrect number of {attribute.name}. Expected "
+            f"{expected_length}, found: {len(value)}"
+        )
+
+
+def _to_str_array(value: Iterable[str]) -> NDArray[np.str_]:
+    if isinstance(value, np.ndarray):
+        array = np.asarray(cast("NDArray[Any]", value))
+        if array.dtype.kind == "U":
+            return array
+    values = [str(item) for item in value]
+
+    # NumPy strings cannot store trailing null characters, which would
+    # otherwise be silently stripped
+    if any(item.endswith("\x00") for item in values):
+        raise ValueError("Cohort metadata cannot end with a null character")
+    return np.asarray(values, dtype=np.str_)
+
+
+def _default_subject_ids(instance: AfidCohort) -> NDArray[np.str_]:
+    return np.arange(len(instance.coords)).astype(np.str_)
+
+
+def _default_slicer_versions(instance: AfidCohort) -> NDArray[np.str_]:
+    return np.full(len(instance.coords), "Unknown")
+
+
+@attrs.define(kw_only=True)
+class AfidCohort:
+    """Class for a collection of ``AfidSet`` objects stored as one array
+
+    Indexing with an integer returns an ``AfidSet``, while slicing returns
+    an ``AfidCohort``. Both share memory with the original cohort whenever
+    NumPy indexing allows it.
+
+    Parameters
+    ----------
+    coords
+        Array of shape (N, 32, 3) containing AFID spatial coordinates of N
+        subjects, ordered by label
+
+    coord_systems
+        Coordinate system of each subject's AFIDs (e.g. RAS)
+
+    subject_ids
+        Unique identifier of each subject (default: index of subject)
+
+    slicer_versions
+        Version of Slicer associated with each subject (default: "Unknown")
+    """
+
+    coords: NDArray[np.float_] = attrs.field(
+        converter=lambda coords: np.asarray(coords, dtype=np.float_),
+        validator=_validate_cohort_coords,
+        eq=attrs.cmp_using(eq=np.array_equal),
+    )
+    coord_systems: NDArray[np.str_] = attrs.field(
+        converter=_to_str_array,
+        validator=_validate_cohort_metadata,
+        eq=attrs.cmp_using(eq=np.array_equal),
+    )
+    subject_ids: NDArray[np.str_] = attrs.field(
+        default=attrs.Factory(_default_subject_ids, takes_self=True),
+        converter=_to_str_array,
+        validator=_validate_cohort_metadata,
+        eq=attrs.cmp_using(eq=np.array_equal),
+    )
+    slicer_versions: NDArray[np.str_] = attrs.field(
+        default=attrs.Factory(_default_slicer_versions, takes_self=True),
+        converter=_to_str_array,
+        validator=_validate_cohort_metadata,
+        eq=attrs.cmp_using(eq=np.array_equal),
+    )
+
+    @classmethod
+    def from_afid_sets(
+        cls,
+        afid_sets: Sequence[AfidSet],
+        subject_ids: Sequence[str] | None = None,
+    ) -> AfidCohort:
+        """Stack a collection of ``AfidSet`` objects into a cohort
+
+        Parameters
+        ----------
+        afid_sets
+            Sequence of ``AfidSet`` objects to stack
+
+        subject_ids
+            Unique identifier of each ``AfidSet``. If none provided, the
+            index of each ``AfidSet`` will be used
+
+        Returns
+        -------
+        AfidCohort
+            Cohort containing a copy of the coordinates and metadata of each
+            ``AfidSet``
+        """
+        coords = (
+            np.stack([afid_set.coords for afid_set in afid_sets])
+            if afid_sets
+            else np.empty((0, len(load_protocol("human")), 3))
+        )
+        return cls(
+            coords=coords,
+            coord_systems=[afid_set.coord_system for afid_set in afid_sets],
+            subject_ids=subject_ids
+            if subject_ids is not None
+            else [str(idx) for idx in range(len(afid_sets))],
+            slicer_versions=[
+                afid_set.slicer_version for afid_set in afid_sets
+            ],
+        )
+
+    @classmethod
+    def load_binary(
+        cls, in_fpath: PathLike[str] | str, mmap_mode: MmapMode = "r"
+    ) -> AfidCohort:
+        """Load a cohort from a binary cohort file
+
+        Parameters
+        ----------
+        in_fpath
+            Path of binary cohort file to load
+
+        mmap_mode
+            Mode to memory-map the file with (see ``numpy.memmap``), so
+            subjects are only read from disk when accessed - one of ["r",
+            "r+", "c"]. With "r+", changes to the coordinates of the cohort
+            are written back to the file. If none provided, the whole file
+            is read into memory (default: "r")
+
+        Returns
+        -------
+        AfidCohort
+            Cohort containing coordinates and metadata of each subject
+
+        Raises
+        ------
+        InvalidFileError
+            If file is not a valid (or complete) binary cohort file
+
+        ValueError
+            If an unsupported memory-map mode is provided
+        """
+        from afids_utils.ext.binary import load_binary
+
+        return load_binary(in_fpath, mmap_mode=mmap_mode)
+
+    def save_binary(
+        self, out_fpath: PathLike[str] | str, append: bool = False
+    ) -> None:
+        """Save cohort to a binary cohort file
+
+        Parameters
+        ----------
+        out_fpath
+            Path of binary cohort file to save cohort to
+
+        append
+            Append subjects to the end of an existing binary cohort file,
+            which is created if it does not exist (default: False)
+
+        Raises
+        ------
+        InvalidFileError
+            If appending to an invalid binary cohort file
+
+        ValueError
+            If metadata of a subject is longer than supported by the file
+        """
+        from afids_utils.ext.binary import save_binary
+
+        save_binary(self, out_fpath, append=append)
+
+    def to_afid_sets(self) -> list[AfidSet]:
+        """Split cohort into a list of ``AfidSet`` objects, each a view into
+        the cohort coordinates"""
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __iter__(self) -> Iterator[AfidSet]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    @overload
+    def __getitem__(self, key: int) -> AfidSet:
+        ...
+
+    @overload
+    def __getitem__(
+        self, key: slice | Sequence[int] | NDArray[np.int_ | np.bool_]
+    ) -> AfidCohort:
+        ...
+
+    def __getitem__(
+        self,
+        key: int | slice | Sequence[int] | NDArray[np.int_ | np.bool_],
+    ) -> AfidSet | AfidCohort:
+        if isinstance(key, (int, np.integer)):
+            return AfidSet._from_coords(
+                slicer_version=str(self.slicer_versions[key]),
+                coord_system=str(self.coord_systems[key]),
+                coords=self.coords[key],
+            )
+
+        return AfidCohort(
+            coords=self.coords[key],
+            coord_systems=self.coord_systems[key],
+            subject_ids=self.subject_ids[key],
+            slicer_versions=self.slicer_versions[key],
+        )
 
 
 @attrs.define()
@@ -0,0 +1,206 @@
+"""Persistent cache of parsed AFIDs files"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import suppress
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import attrs
+import numpy as np
+
+from afids_utils.afids import AfidSet
+from afids_utils.resources import load_protocol
+
+CACHE_KEYS = ("stat", "hash")
+
+# Suffix of cache entries, each holding a line of json metadata followed by
+# the raw (little-endian) coordinates
+_ENTRY_SUFFIX = ".afc"
+_COORDS_DTYPE = np.dtype("<f8")
+
+
+@attrs.define(slots=False)
+class ParseCache:
+    """Opt-in on-disk cache of parsed AFIDs files, so unchanged files skip
+    parsing and validation when loaded again
+
+    Parameters
+    ----------
+    cache_dir
+        Directory to store cached AfidSets in (created if it does not exist)
+
+    max_bytes
+        Maximum size of cache on disk, after which least recently used
+        entries are evicted (default: 64 MiB)
+
+    key
+        How to identify unchanged files - one of ["stat", "hash"]. "stat"
+        uses the path, size and modification time of a file, while "hash"
+        uses a hash of its contents (default: "stat")
+
+    Notes
+    -----
+    ``hits`` and ``misses`` only count lookups made in the current process
+    """
+
+    cache_dir: Path = attrs.field(converter=Path)
+    max_bytes: int = attrs.field(default=64 * 1024**2)
+    key: str = attrs.field(
+        default="stat", validator=attrs.validators.in_(CACHE_KEYS)
+    )
+    hits: int = attrs.field(default=0, init=False)
+    misses: int = attrs.field(default=0, init=False)
+    _size: int = attrs.field(default=0, init=False, repr=False, eq=False)
+    _lock: threading.Lock = attrs.field(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+
+    def __attrs_post_init__(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Locks cannot be pickled (e.g. when sent to a process pool)
+        return {
+            name: value
+            for name, value in self.__dict__.items()
+            if name != "_lock"
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _entries(self) -> list[os.DirEntry[str]]:
+        """Internal function to list the entries stored in the cache"""
+        with os.scandir(self.cache_dir) as dir_entries:
+            return [
+                entry
+                for entry in dir_entries
+                if entry.name.endswith(_ENTRY_SUFFIX)
+            ]
+
+    def _entry_path(self, afids_fpath: PathLike[str] | str) -> Path:
+        """Internal function to get the path of a file's cache entry"""
+        digest = hashlib.sha256()
+        if self.key == "stat":
+            stat = os.stat(afids_fpath)
+            digest.update(
+                f"{Path(afids_fpath).resolve()}\0{stat.st_size}\0"
+                f"{stat.st_mtime_ns}".encode()
+            )
+        else:
+            with open(afids_fpath, "rb") as afids_file:
+                for chunk in iter(lambda: afids_file.read(1024**2), b""):
+                    digest.update(chunk)
+
+        return self.cache_dir / f"{digest.hexdigest()}{_ENTRY_SUFFIX}"
+
+    def get(self, afids_fpath: PathLike[str] | str) -> AfidSet | None:
+        """Look up a previously parsed AFIDs file
+
+        Parameters
+        ----------
+        afids_fpath
+            Path to .fcsv or .json file containing AFIDs information
+
+        Returns
+        -------
+        AfidSet | None
+            Cached set of anatomical fiducials, or none if file is not cached
+            (or has changed since being cached)
+        """
+        entry_path = self._entry_path(afids_fpath)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                metadata, coords = entry_file.read().split(b"\n", 1)
+            metadata = json.loads(metadata)
+            num_afids = len(load_protocol("human"))
+            if len(coords) != num_afids * 3 * _COORDS_DTYPE.itemsize:
+                raise ValueError("Incomplete cache entry")
+            afid_set = AfidSet._from_coords(
+                slicer_version=metadata["slicer_version"],
+                coord_system=metadata["coord_system"],
+                coords=np.frombuffer(coords, dtype=_COORDS_DTYPE)
+                .reshape(num_afids, 3)
+                .astype(np.float_),
+            )
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Mark entry as recently used (unless concurrently evicted)
+        with suppress(OSError):
+            os.utime(entry_path)
+        with self._lock:
+            self.hits += 1
+        return afid_set
+
+    def put(self, afids_fpath: PathLike[str] | str, afid_set: AfidSet) -> None:
+        """Store a parsed AFIDs file, evicting least recently used entries
+        if the cache exceeds its maximum size
+
+        Parameters
+        ----------
+        afids_fpath
+            Path to .fcsv or .json file the AfidSet was loaded from
+
+        afid_set
+            Set of anatomical fiducials parsed from the file
+        """
+        entry_path = self._entry_path(afids_fpath)
+        entry = (
+            json.dumps(
+                {
+                    "slicer_version": afid_set.slicer_version,
+                    "coord_system": afid_set.coord_system,
+                }
+            ).encode()
+            + b"\n"
+            + afid_set.coords.astype(_COORDS_DTYPE).tobytes()
+        )
+
+        # Write to a temporary file first, so concurrent lookups never see
+        # a partially written entry
+        tmp_path = entry_path.with_name(
+            f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_bytes(entry)
+        os.replace(tmp_path, entry_path)
+
+        with self._lock:
+            self._size += len(entry)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Internal function to remove least recently used entries until the
+        cache is within its maximum size"""
+        entries: list[tuple[os.stat_result, str]] = []
+        for entry in self._entries():
+            with suppress(FileNotFoundError):
+                entries.append((entry.stat(), entry.path))
+        entries.sort(key=lambda entry: entry[0].st_mtime_ns)
+
+        self._size = sum(stat.st_size for stat, _ in entries)
+        for stat, entry_path in entries:
+            if self._size <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                os.remove(entry_path)
+            self._size -= stat.st_size
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset hit / miss counts"""
+        with self._lock:
+            for entry in self._entries():
+                os.remove(entry.path)
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
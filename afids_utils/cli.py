@@ -0,0 +1,480 @@
+"""Command-line interface of afids-utils"""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from afids_utils.afids import AfidCohort, AfidSet, _create_executor
+from afids_utils.dataset import _file_format
+from afids_utils.exceptions import InvalidFiducialError, InvalidFileError
+from afids_utils.ext._io import (
+    COMPRESSED_OPENERS,
+    DECOMPRESSION_ERRORS,
+    SUPPORTED_FORMATS,
+)
+from afids_utils.ext.binary import is_binary_cohort
+from afids_utils.transforms import xfm_coord_system
+
+CONVERT_FORMATS = (*SUPPORTED_FORMATS, "binary")
+
+# Errors reported per file, without stopping the remaining conversions
+_CONVERT_ERRORS = (
+    InvalidFileError,
+    InvalidFiducialError,
+    KeyError,
+    ValueError,
+    *DECOMPRESSION_ERRORS,
+)
+
+
+def _strip_suffixes(fname: str) -> str:
+    """Internal function to remove the compression and AFIDs format
+    suffixes of a file name"""
+    path = PurePosixPath(fname)
+    if path.suffix in COMPRESSED_OPENERS:
+        path = path.with_suffix("")
+    if path.suffix.lstrip(".") in SUPPORTED_FORMATS:
+        path = path.with_suffix("")
+    return str(path)
+
+
+def _find_inputs(
+    inputs: Sequence[str], exclude: str | None = None
+) -> list[tuple[Path, str]]:
+    """Internal function to expand globs and directories into input files
+
+    Parameters
+    ----------
+    inputs
+        Paths, glob patterns or directories (searched recursively for .fcsv
+        and .json files)
+
+    exclude
+        Directory skipped when searching directories (e.g. the output
+        directory, so previously converted files are not converted again)
+
+    Returns
+    -------
+    list[tuple[Path, str]]
+        Path of each input file and its (POSIX-style) path relative to the
+        output directory
+
+    Raises
+    ------
+    FileNotFoundError
+        If a path does not exist, or a glob pattern matches no files
+    """
+    excluded = None if exclude is None else os.path.realpath(exclude)
+    found: list[tuple[Path, str]] = []
+    for in_path in inputs:
+        if glob.has_magic(in_path):
+            matches = sorted(glob.glob(in_path, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match pattern: {in_path}")
+            found.extend(
+                (Path(match), Path(match).name)
+                for match in matches
+                if os.path.isfile(match)
+            )
+        elif os.path.isdir(in_path):
+            for dir_path, dir_names, fnames in os.walk(in_path):
+                dir_names[:] = sorted(
+                    dir_name
+                    for dir_name in dir_names
+                    if os.path.realpath(os.path.join(dir_path, dir_name))
+                    != excluded
+                )
+                found.extend(
+                    (
+                        Path(dir_path, fname),
+                        Path(dir_path, fname).relative_to(in_path).as_posix(),
+                    )
+                    for fname in sorted(fnames)
+                    if _file_format(fname)
+                )
+        elif os.path.isfile(in_path):
+            found.append((Path(in_path), Path(in_path).name))
+        else:
+            raise FileNotFoundError(f"Provided path does not exist: {in_path}")
+
+    return found
+
+
+def _read_file_list(file_list: Iterable[str]) -> list[str]:
+    """Internal function to read the (non-empty) lines of a file list"""
+    return [line.strip() for line in file_list if line.strip()]
+
+
+def _output_path(
+    out_dir: Path, rel_path: str, out_format: str, compress: str | None
+) -> Path:
+    """Internal function to get the output path of a converted file, kept
+    within the output directory"""
+    parts = [
+        part
+        for part in PurePosixPath(_strip_suffixes(rel_path)).parts
+        if part not in ("/", ".", "..")
+    ] or ["afids"]
+    parts[-1] += f".{out_format}" + (f".{compress}" if compress else "")
+    return out_dir.joinpath(*parts)
+
+
+def _is_up_to_date(out_fpath: Path, in_fpaths: Sequence[Path]) -> bool:
+    """Internal function to check whether an output exists and is at least
+    as new as all of its inputs"""
+    try:
+        out_mtime = out_fpath.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return all(
+        out_mtime >= in_fpath.stat().st_mtime_ns for in_fpath in in_fpaths
+    )
+
+
+def _save_afid_set(
+    afid_set: AfidSet, out_fpath: Path, coord_system: str | None
+) -> None:
+    """Internal function to save an AfidSet, converting its coordinate
+    system if requested"""
+    if coord_system is not None:
+        afid_set = xfm_coord_system(afid_set, coord_system)
+    out_fpath.parent.mkdir(parents=True, exist_ok=True)
+    afid_set.save(out_fpath)
+
+
+def _convert_file(
+    in_fpath: Path, out_fpath: Path, coord_system: str | None
+) -> None:
+    """Internal function to convert a single .fcsv / .json file"""
+    _save_afid_set(AfidSet.load(in_fpath), out_fpath, coord_system)
+
+
+def _run_tasks(
+    tasks: Sequence[tuple[str, Callable[..., Any], tuple[Any, ...]]],
+    jobs: int,
+) -> Iterator[tuple[str, Any, Exception | None]]:
+    """Internal function to run tasks, in a pool of processes if more than
+    one job
+
+    Yields
+    ------
+    tuple[str, Any, Exception | None]
+        Source of each task, and its result or error, in order of tasks
+    """
+    if jobs == 1:
+        for source, func, task_args in tasks:
+            try:
+                yield source, func(*task_args), None
+            except _CONVERT_ERRORS as err:
+                yield source, None, err
+        return
+
+    with _create_executor("process", jobs) as pool:
+        futures = [
+            (source, pool.submit(func, *task_args))
+            for source, func, task_args in tasks
+        ]
+        for source, future in futures:
+            try:
+                yield source, future.result(), None
+            except _CONVERT_ERRORS as err:
+                yield source, None, err
+
+
+def _report_error(source: Path | str, err: Exception) -> None:
+    """Internal function to report an input which could not be converted"""
+    print(f"afids-utils convert: {source}: {err}", file=sys.stderr)
+
+
+def _load_binary_input(in_fpath: Path) -> AfidCohort:
+    """Internal function to load an input without an AFIDs file suffix,
+    which must be a binary cohort"""
+    if not is_binary_cohort(in_fpath):
+        raise InvalidFileError("Unsupported input file")
+    return AfidCohort.load_binary(in_fpath, mmap_mode=None)
+
+
+def _convert_to_files(
+    inputs: list[tuple[Path, str]], args: argparse.Namespace
+) -> tuple[int, int, int]:
+    """Internal function to convert inputs to individual .fcsv / .json
+    files, with each subject of a binary cohort saved separately
+
+    Returns
+    -------
+    tuple[int, int, int]
+        Number of converted, skipped and failed files
+
+    Raises
+    ------
+    ValueError
+        If multiple inputs would be converted to the same output
+    """
+    out_dir = Path(args.output)
+    outputs: dict[Path, str] = {}
+    tasks: list[tuple[str, Callable[..., Any], tuple[Any, ...]]] = []
+    skipped = failed = 0
+
+    for in_fpath, rel_path in inputs:
+        if _file_format(in_fpath.name):
+            afids_inputs = [(str(in_fpath), rel_path, None)]
+        else:
+            try:
+                afid_cohort = _load_binary_input(in_fpath)
+            except _CONVERT_ERRORS as err:
+                _report_error(in_fpath, err)
+                failed += 1
+                continue
+            afids_inputs = [
+                (f"{in_fpath}[{subject_id}]", subject_id, afid_set)
+                for subject_id, afid_set in zip(
+                    afid_cohort.subject_ids.tolist(), afid_cohort
+                )
+            ]
+
+        for source, afids_rel_path, afid_set in afids_inputs:
+            out_fpath = _output_path(
+                out_dir, afids_rel_path, args.to, args.compress
+            )
+            if out_fpath in outputs:
+                raise ValueError(
+                    f"Multiple inputs ({outputs[out_fpath]}, {source}) map "
+                    f"to output {out_fpath}"
+                )
+            outputs[out_fpath] = source
+
+            if not args.force and _is_up_to_date(out_fpath, [in_fpath]):
+                skipped += 1
+            elif afid_set is None:
+                tasks.append(
+                    (
+                        source,
+                        _convert_file,
+                        (in_fpath, out_fpath, args.coord_system),
+                    )
+                )
+            else:
+                tasks.append(
+                    (
+                        source,
+                        _save_afid_set,
+                        (afid_set, out_fpath, args.coord_system),
+                    )
+                )
+
+    converted = 0
+    for source, _, err in _run_tasks(tasks, args.jobs):
+        if err is None:
+            converted += 1
+        else:
+            _report_error(source, err)
+            failed += 1
+
+    return converted, skipped, failed
+
+
+def _convert_to_cohort(
+    inputs: list[tuple[Path, str]], args: argparse.Namespace
+) -> tuple[int, int, int]:
+    """Internal function to combine inputs into a single binary cohort,
+    using relative paths of .fcsv / .json files as subject ids
+
+    Returns
+    -------
+    tuple[int, int, int]
+        Number of converted, skipped and failed files
+    """
+    out_fpath = Path(args.output)
+    if not args.force and _is_up_to_date(
+        out_fpath, [in_fpath for in_fpath, _ in inputs]
+    ):
+        return 0, len(inputs), 0
+
+    tasks = [
+        (
+            str(in_fpath),
+            AfidSet.load
+            if _file_format(in_fpath.name)
+            else _load_binary_input,
+            (in_fpath,),
+        )
+        for in_fpath, _ in inputs
+    ]
+    afid_sets: list[AfidSet] = []
+    subject_ids: list[str] = []
+    failed = 0
+    for (source, loaded, err), (_, rel_path) in zip(
+        _run_tasks(tasks, args.jobs), inputs
+    ):
+        if err is not None:
+            _report_error(source, err)
+            failed += 1
+        elif isinstance(loaded, AfidCohort):
+            afid_sets.extend(loaded)
+            subject_ids.extend(loaded.subject_ids.tolist())
+        else:
+            afid_sets.append(loaded)
+            subject_ids.append(rel_path)
+
+    # Cohort is only saved once all inputs load, as a partial cohort would
+    # otherwise be considered up to date
+    if failed:
+        return 0, 0, failed
+
+    afid_cohort = AfidCohort.from_afid_sets(afid_sets, subject_ids=subject_ids)
+    if args.coord_system is not None:
+        afid_cohort = xfm_coord_system(afid_cohort, args.coord_system)
+    out_fpath.parent.mkdir(parents=True, exist_ok=True)
+    afid_cohort.save_binary(out_fpath)
+
+    return len(inputs), 0, 0
+
+
+def _convert(args: argparse.Namespace) -> int:
+    """Internal function to run the ``convert`` command
+
+    Returns
+    -------
+    int
+        Exit code - 0 if all inputs were converted (or skipped), 1 if any
+        input failed to convert and 2 if inputs could not be resolved
+    """
+    start = time.perf_counter()
+
+    in_paths = list(args.inputs)
+    try:
+        if args.file_list == "-":
+            in_paths.extend(_read_file_list(sys.stdin))
+        elif args.file_list is not None:
+            with open(args.file_list, encoding="utf-8") as file_list:
+                in_paths.extend(_read_file_list(file_list))
+
+        inputs = _find_inputs(in_paths, exclude=args.output)
+        if not inputs:
+            raise FileNotFoundError("No input files found")
+        if args.to == "binary":
+            converted, skipped, failed = _convert_to_cohort(inputs, args)
+        else:
+            converted, skipped, failed = _convert_to_files(inputs, args)
+    except (FileNotFoundError, ValueError) as err:
+        print(f"afids-utils convert: error: {err}", file=sys.stderr)
+        return 2
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Converted {converted} file(s) ({skipped} skipped, {failed} failed) "
+        f"in {elapsed:.2f} s ({converted / elapsed:.1f} files/s)"
+    )
+    return 1 if failed else 0
+
+
+def _positive_int(value: str) -> int:
+    """Internal function to parse a positive integer argument"""
+    if not value.isdecimal() or int(value) < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer (got {value})"
+        )
+    return int(value)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Internal function to build the command-line argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="afids-utils",
+        description="Utility functions for working with AFIDs data",
+    )
+    subparsers = parser.add_subparsers(
+        title="commands", dest="command", required=True
+    )
+
+    convert = subparsers.add_parser(
+        "convert",
+        help="convert between AFIDs file formats",
+        description=(
+            "Convert AFIDs files between .fcsv, .json and binary cohort "
+            "formats. Outputs at least as new as their inputs are skipped."
+        ),
+    )
+    convert.add_argument(
+        "inputs",
+        nargs="*",
+        help=(
+            "AFIDs files, glob patterns or directories (searched "
+            "recursively for .fcsv and .json files) to convert"
+        ),
+    )
+    convert.add_argument(
+        "--file-list",
+        metavar="FILE",
+        help="file listing an input per line ('-' to read from stdin)",
+    )
+    convert.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help=(
+            "output directory, or path of the output file when converting "
+            "to a binary cohort"
+        ),
+    )
+    convert.add_argument(
+        "-t",
+        "--to",
+        required=True,
+        choices=CONVERT_FORMATS,
+        help="format to convert inputs to",
+    )
+    convert.add_argument(
+        "--coord-system",
+        choices=("RAS", "LPS"),
+        help="coordinate system to convert AFIDs to (default: unchanged)",
+    )
+    convert.add_argument(
+        "--compress",
+        choices=[suffix.lstrip(".") for suffix in COMPRESSED_OPENERS],
+        help="compress .fcsv / .json outputs",
+    )
+    convert.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="number of files to convert in parallel (default: 1)",
+    )
+    convert.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="convert all inputs, even if outputs are up to date",
+    )
+    convert.set_defaults(func=_convert)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the ``afids-utils`` command
+
+    Parameters
+    ----------
+    argv
+        Command-line arguments (default: ``sys.argv[1:]``)
+
+    Returns
+    -------
+    int
+        Exit code of the command
+    """
+    args = _build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
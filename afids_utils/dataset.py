@@ -0,0 +1,447 @@
+"""Methods for indexing BIDS-style directories of AFIDs files"""
+from __future__ import annotations
+
+import csv
+import os
+from collections.abc import Collection, Iterator
+from os import PathLike
+from pathlib import Path, PurePosixPath
+
+import attrs
+
+from afids_utils.afids import AfidCohort, AfidSet, scan_metadata
+from afids_utils.cache import ParseCache
+from afids_utils.exceptions import InvalidFileError
+from afids_utils.ext._io import (
+    COMPRESSED_OPENERS,
+    DECOMPRESSION_ERRORS,
+    SUPPORTED_FORMATS,
+)
+
+INDEX_FNAME = "afids_index.tsv"
+
+# Fixed columns of the index table, followed by a column per entity
+INDEX_COLUMNS = (
+    "path",
+    "format",
+    "size",
+    "mtime_ns",
+    "valid",
+    "slicer_version",
+    "coord_system",
+    "suffix",
+)
+# BIDS placeholder for missing values
+NA = "n/a"
+
+
+def parse_entities(fname: str) -> tuple[dict[str, str], str]:
+    """Parse BIDS-like entities from the name of an AFIDs file
+
+    Parameters
+    ----------
+    fname
+        Name of file (e.g. "sub-01_ses-02_rater-2_afids.fcsv.gz")
+
+    Returns
+    -------
+    entities
+        Value of each key-value entity (e.g. {"sub": "01", "ses": "02",
+        "rater": "2"})
+
+    suffix
+        Suffix of the filename (e.g. "afids"), or "n/a" if there is none
+    """
+    stem = PurePosixPath(fname)
+    if stem.suffix in COMPRESSED_OPENERS:
+        stem = stem.with_suffix("")
+
+    entities: dict[str, str] = {}
+    suffix = NA
+    for part in stem.with_suffix("").name.split("_"):
+        key, sep, value = part.partition("-")
+        if sep:
+            entities[key] = value
+        else:
+            suffix = part
+
+    return entities, suffix
+
+
+def _file_format(fname: str) -> str | None:
+    """Internal function to get the AFIDs format of a file, if supported"""
+    path = PurePosixPath(fname)
+    if path.suffix in COMPRESSED_OPENERS:
+        path = path.with_suffix("")
+    file_format = path.suffix.lstrip(".")
+    return file_format if file_format in SUPPORTED_FORMATS else None
+
+
+def _no_entities() -> dict[str, str]:
+    return {}
+
+
+@attrs.define(frozen=True)
+class AfidsIndexEntry:
+    """Indexed information of a single AFIDs file
+
+    Parameters
+    ----------
+    path
+        Path of file, relative to the root of the dataset (POSIX-style)
+
+    format
+        Format of file (e.g. "fcsv")
+
+    size
+        Size of file in bytes
+
+    mtime_ns
+        Last modification time of file in nanoseconds
+
+    valid
+        Whether metadata could be read from the file
+
+    slicer_version
+        Version of Slicer associated with file ("n/a" if invalid)
+
+    coord_system
+        Coordinate system AFIDs are placed in ("n/a" if invalid)
+
+    suffix
+        Suffix of the filename (e.g. "afids")
+
+    entities
+        BIDS-like entities parsed from the filename (e.g. {"sub": "01"})
+    """
+
+    path: str = attrs.field()
+    format: str = attrs.field()
+    size: int = attrs.field(converter=int)
+    mtime_ns: int = attrs.field(converter=int)
+    valid: bool = attrs.field()
+    slicer_version: str = attrs.field()
+    coord_system: str = attrs.field()
+    suffix: str = attrs.field()
+    entities: dict[str, str] = attrs.field(factory=_no_entities)
+
+    def matches(self, **criteria: str | Collection[str]) -> bool:
+        """Check whether entry matches all provided criteria
+
+        Parameters
+        ----------
+        **criteria
+            Accepted value(s) of each field (e.g. coord_system="LPS") or
+            entity (e.g. rater="2")
+        """
+        for key, accepted in criteria.items():
+            value = (
+                getattr(self, key)
+                if key in INDEX_COLUMNS
+                else self.entities.get(key)
+            )
+            if isinstance(accepted, str):
+                accepted = (accepted,)
+            if value is None or (
+                value not in accepted and str(value) not in accepted
+            ):
+                return False
+        return True
+
+
+def _no_entries() -> dict[str, AfidsIndexEntry]:
+    return {}
+
+
+@attrs.define
+class AfidsIndex:
+    """Index of the AFIDs files (.fcsv / .json, optionally compressed)
+    within a BIDS-style directory
+
+    Parameters
+    ----------
+    root
+        Root directory of dataset
+
+    entries
+        Indexed information of each file, keyed by its relative path
+    """
+
+    root: Path = attrs.field(converter=Path)
+    entries: dict[str, AfidsIndexEntry] = attrs.field(factory=_no_entries)
+
+    @classmethod
+    def from_directory(
+        cls,
+        root: PathLike[str] | str,
+        index_fpath: PathLike[str] | str | None = None,
+    ) -> AfidsIndex:
+        """Index a directory, re-using and updating a previously saved index
+
+        Parameters
+        ----------
+        root
+            Root directory of dataset
+
+        index_fpath
+            Path of index table (default: "afids_index.tsv" within root)
+
+        Returns
+        -------
+        AfidsIndex
+            Up-to-date index of the directory, also saved to disk
+        """
+        index_fpath = (
+            Path(root) / INDEX_FNAME if index_fpath is None else index_fpath
+        )
+        index = (
+            cls.load(root, index_fpath)
+            if os.path.exists(index_fpath)
+            else cls(root=root)
+        )
+        if index.update():
+            index.save(index_fpath)
+        return index
+
+    @classmethod
+    def load(
+        cls,
+        root: PathLike[str] | str,
+        index_fpath: PathLike[str] | str | None = None,
+    ) -> AfidsIndex:
+        """Load a previously saved index, without checking for changes
+
+        Parameters
+        ----------
+        root
+            Root directory of dataset
+
+        index_fpath
+            Path of index table (default: "afids_index.tsv" within root)
+
+        Returns
+        -------
+        AfidsIndex
+            Index as previously saved
+
+        Raises
+        ------
+        InvalidFileError
+            If index table is missing expected columns
+        """
+        index_fpath = (
+            Path(root) / INDEX_FNAME if index_fpath is None else index_fpath
+        )
+        with open(index_fpath, encoding="utf-8", newline="") as index_file:
+            reader = csv.reader(index_file, delimiter="\t")
+            header = next(reader, None) or []
+            if tuple(header[: len(INDEX_COLUMNS)]) != INDEX_COLUMNS:
+                raise InvalidFileError("Invalid columns in AFIDs index")
+            entity_keys = header[len(INDEX_COLUMNS) :]
+
+            entries: dict[str, AfidsIndexEntry] = {}
+            for row in reader:
+                (
+                    path,
+                    file_format,
+                    size,
+                    mtime_ns,
+                    valid,
+                    slicer_version,
+                    coord_system,
+                    suffix,
+                ) = row[: len(INDEX_COLUMNS)]
+                entries[path] = AfidsIndexEntry(
+                    path=path,
+                    format=file_format,
+                    size=size,
+                    mtime_ns=mtime_ns,
+                    valid=valid == "true",
+                    slicer_version=slicer_version,
+                    coord_system=coord_system,
+                    suffix=suffix,
+                    entities={
+                        key: value
+                        for key, value in zip(
+                            entity_keys, row[len(INDEX_COLUMNS) :]
+                        )
+                        if value != NA
+                    },
+                )
+
+        return cls(root=root, entries=entries)
+
+    def save(self, index_fpath: PathLike[str] | str | None = None) -> None:
+        """Save index to a (tab-separated) table
+
+        Parameters
+        ----------
+        index_fpath
+            Path of index table (default: "afids_index.tsv" within root)
+        """
+        index_fpath = (
+            self.root / INDEX_FNAME if index_fpath is None else index_fpath
+        )
+        entity_keys = sorted(
+            {key for entry in self.entries.values() for key in entry.entities}
+        )
+
+        # Write to a temporary file first, so an existing index is never
+        # left partially written
+        tmp_fpath = f"{index_fpath}.tmp"
+        with open(tmp_fpath, "w", encoding="utf-8", newline="") as index_file:
+            writer = csv.writer(index_file, delimiter="\t")
+            writer.writerow((*INDEX_COLUMNS, *entity_keys))
+            writer.writerows(
+                (
+                    entry.path,
+                    entry.format,
+                    entry.size,
+                    entry.mtime_ns,
+                    "true" if entry.valid else "false",
+                    entry.slicer_version,
+                    entry.coord_system,
+                    entry.suffix,
+                    *(entry.entities.get(key, NA) for key in entity_keys),
+                )
+                for entry in sorted(
+                    self.entries.values(), key=lambda entry: entry.path
+                )
+            )
+        os.replace(tmp_fpath, index_fpath)
+
+    def _walk(self) -> Iterator[tuple[str, os.stat_result]]:
+        """Internal function to find AFIDs files (and their stats) within
+        the dataset"""
+        dirs = [self.root]
+        while dirs:
+            with os.scandir(dirs.pop()) as dir_entries:
+                for dir_entry in dir_entries:
+                    if dir_entry.is_dir():
+                        dirs.append(Path(dir_entry.path))
+                    elif dir_entry.is_file() and _file_format(dir_entry.name):
+                        yield (
+                            Path(dir_entry.path)
+                            .relative_to(self.root)
+                            .as_posix(),
+                            dir_entry.stat(),
+                        )
+
+    def update(self) -> bool:
+        """Re-index the dataset, only reading the header of files which are
+        new or whose size / modification time changed
+
+        Returns
+        -------
+        bool
+            Whether any file was added, changed or removed
+        """
+        entries: dict[str, AfidsIndexEntry] = {}
+        changed = False
+
+        for path, stat in self._walk():
+            entry = self.entries.get(path)
+            if (
+                entry is None
+                or entry.size != stat.st_size
+                or entry.mtime_ns != stat.st_mtime_ns
+            ):
+                entry = self._index_file(path, stat)
+                changed = True
+            entries[path] = entry
+
+        changed = changed or entries.keys() != self.entries.keys()
+        self.entries = entries
+        return changed
+
+    def _index_file(self, path: str, stat: os.stat_result) -> AfidsIndexEntry:
+        """Internal function to read the information of a single file"""
+        try:
+            slicer_version, coord_system = scan_metadata(self.root / path)
+            valid = True
+        except (InvalidFileError, ValueError, *DECOMPRESSION_ERRORS):
+            slicer_version, coord_system = NA, NA
+            valid = False
+
+        entities, suffix = parse_entities(PurePosixPath(path).name)
+        return AfidsIndexEntry(
+            path=path,
+            format=_file_format(path) or NA,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            valid=valid,
+            slicer_version=slicer_version,
+            coord_system=coord_system,
+            suffix=suffix,
+            entities=entities,
+        )
+
+    def query(
+        self, **criteria: str | Collection[str]
+    ) -> list[AfidsIndexEntry]:
+        """Find valid AFIDs files matching all provided criteria, without
+        opening any file
+
+        Parameters
+        ----------
+        **criteria
+            Accepted value(s) of each field (e.g. format="fcsv",
+            coord_system="LPS") or entity (e.g. rater="2")
+
+        Returns
+        -------
+        list[AfidsIndexEntry]
+            Matching entries, sorted by path
+        """
+        return [
+            entry
+            for _, entry in sorted(self.entries.items())
+            if entry.valid and entry.matches(**criteria)
+        ]
+
+    def paths(self, **criteria: str | Collection[str]) -> list[Path]:
+        """Find paths of valid AFIDs files matching all provided criteria
+        (see ``query``)"""
+        return [self.root / entry.path for entry in self.query(**criteria)]
+
+    def load_cohort(
+        self,
+        workers: int | None = None,
+        executor: str = "thread",
+        cache: ParseCache | None = None,
+        **criteria: str | Collection[str],
+    ) -> AfidCohort:
+        """Load valid AFIDs files matching all provided criteria (see
+        ``query``) into a cohort, using relative paths as subject ids
+
+        Parameters
+        ----------
+        workers
+            Maximum number of files loaded at once. If none provided, the
+            number of CPUs is used
+
+        executor
+            Type of worker pool to load files with - one of ["thread",
+            "process"] (default: "thread")
+
+        cache
+            Cache of previously parsed files (see ``ParseCache``)
+
+        **criteria
+            Accepted value(s) of each field or entity
+
+        Returns
+        -------
+        AfidCohort
+            Cohort of matching files, ordered by path
+        """
+        entries = self.query(**criteria)
+        afid_sets = AfidSet.load_many(
+            [self.root / entry.path for entry in entries],
+            workers=workers,
+            executor=executor,
+            cache=cache,
+        )
+        return AfidCohort.from_afid_sets(
+            afid_sets, subject_ids=[entry.path for entry in entries]
+        )
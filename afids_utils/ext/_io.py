@@ -0,0 +1,208 @@
+"""Internal helpers for reading and writing AFIDs from paths, streams and
+in-memory bytes"""
+from __future__ import annotations
+
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+import zlib
+from collections.abc import Iterator
+from itertools import islice
+from os import PathLike
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Union, cast
+
+if TYPE_CHECKING:
+    from typing_extensions import TypeGuard
+
+# Sources and targets accepted by the load / save functions
+AfidsSource = Union["PathLike[str]", str, bytes, IO[str], IO[bytes]]
+AfidsTarget = Union["PathLike[str]", str, IO[str], IO[bytes]]
+
+SUPPORTED_FORMATS = ("fcsv", "json")
+
+# Openers of compressed files, keyed by the (final) compression suffix
+COMPRESSED_OPENERS: dict[str, Callable[..., IO[Any]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+# Errors raised when reading a corrupt or truncated compressed file
+DECOMPRESSION_ERRORS = (OSError, EOFError, zlib.error, lzma.LZMAError)
+
+
+def is_path(
+    source: AfidsSource | AfidsTarget,
+) -> TypeGuard[PathLike[str] | str]:
+    """Check whether source / target refers to a filesystem path"""
+    return isinstance(source, (str, PathLike))
+
+
+def _open_path(
+    path: PathLike[str] | str,
+    mode: str,
+    newline: str | None = None,
+    compresslevel: int | None = None,
+) -> IO[str]:
+    """Open a (possibly compressed) file in text mode, decompressing and
+    compressing based on its final suffix"""
+    opener = COMPRESSED_OPENERS.get(Path(path).suffix)
+    if opener is None:
+        return open(path, mode, encoding="utf-8", newline=newline)
+
+    kwargs: dict[str, int] = {}
+    if compresslevel is not None:
+        # lzma refers to the compression level as a preset
+        kwargs[
+            "preset" if opener is lzma.open else "compresslevel"
+        ] = compresslevel
+    return opener(
+        path, f"{mode}t", encoding="utf-8", newline=newline, **kwargs
+    )
+
+
+def _is_text_stream(stream: IO[str] | IO[bytes]) -> bool:
+    """Check whether stream expects text rather than bytes"""
+    if isinstance(stream, io.TextIOBase):
+        return True
+    # Wrappers (e.g. tempfile) do not subclass TextIOBase, but expose a mode
+    mode = getattr(stream, "mode", None)
+    return isinstance(mode, str) and "b" not in mode
+
+
+def resolve_format(
+    source: AfidsSource | AfidsTarget, file_format: str | None
+) -> str:
+    """Determine the format of a source / target, either from the provided
+    format or from the extension of its path (ignoring any compression
+    suffix, e.g. ".fcsv.gz")
+
+    Parameters
+    ----------
+    source
+        Path, stream or bytes to be read from or written to
+
+    file_format
+        Explicit format (e.g. "fcsv" or "json"), required if source is not a
+        path
+
+    Returns
+    -------
+    str
+        Format of the source, without leading period
+
+    Raises
+    ------
+    ValueError
+        If the format cannot be determined or is not supported
+    """
+    if file_format is not None:
+        file_format = file_format.lower().lstrip(".")
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError("Unsupported file format")
+        return file_format
+
+    if not is_path(source):
+        raise ValueError(
+            "File format must be provided when not using a file path"
+        )
+
+    path = Path(source)
+    if path.suffix in COMPRESSED_OPENERS:
+        path = path.with_suffix("")
+    file_format = path.suffix.lstrip(".")
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError("Unsupported file extension")
+    return file_format
+
+
+def read_text(source: AfidsSource) -> str:
+    """Read the full (utf-8) contents of a (possibly compressed) path,
+    stream or bytes"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source).decode("utf-8")
+    if is_path(source):
+        with _open_path(source, "r") as in_file:
+            return in_file.read()
+
+    content = cast("IO[str] | IO[bytes]", source).read()
+    return content.decode("utf-8") if isinstance(content, bytes) else content
+
+
+def read_lines(source: AfidsSource, num_lines: int) -> list[str]:
+    """Read only the first lines (including line endings) of a (possibly
+    compressed) path, stream or bytes"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source).decode("utf-8").splitlines(True)[:num_lines]
+    if is_path(source):
+        with _open_path(source, "r") as in_file:
+            return list(islice(in_file, num_lines))
+
+    stream = cast("IO[str] | IO[bytes]", source)
+    lines = [stream.readline() for _ in range(num_lines)]
+    return [
+        line.decode("utf-8") if isinstance(line, bytes) else line
+        for line in lines
+        if line
+    ]
+
+
+def iter_chunks(source: AfidsSource, chunk_size: int) -> Iterator[str]:
+    """Read the contents of a (possibly compressed) path, stream or bytes in
+    chunks, so reading can stop early"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield bytes(source).decode("utf-8")
+        return
+    if is_path(source):
+        with _open_path(source, "r") as in_file:
+            yield from iter(lambda: in_file.read(chunk_size), "")
+        return
+
+    stream = cast("IO[str] | IO[bytes]", source)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while chunk := stream.read(chunk_size):
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+
+def write_text(
+    target: AfidsTarget,
+    content: str,
+    newline: str | None = None,
+    compresslevel: int | None = None,
+) -> None:
+    """Write contents to a (possibly compressed) path, or a text / binary
+    stream (utf-8 encoded)
+
+    Parameters
+    ----------
+    target
+        Path or stream to write to
+
+    content
+        Contents to write
+
+    newline
+        Newline translation to use when writing to a path (see ``open``)
+
+    compresslevel
+        Compression level when writing to a compressed path (e.g. ".gz"). If
+        none provided, the default level of the compression library is used
+    """
+    if is_path(target):
+        with _open_path(
+            target,
+            "w",
+            newline=newline,
+            compresslevel=compresslevel,
+        ) as out_file:
+            out_file.write(content)
+        return
+
+    stream = cast("IO[str] | IO[bytes]", target)
+    if _is_text_stream(stream):
+        cast("IO[str]", stream).write(content)
+    else:
+        cast("IO[bytes]", stream).write(content.encode("utf-8"))
@@ -0,0 +1,191 @@
+"""Methods for reading AFIDs files directly from .tar and .zip archives"""
+from __future__ import annotations
+
+import io
+import os
+import tarfile
+import zipfile
+from collections.abc import Iterator, Sequence
+from itertools import chain
+from os import PathLike
+from pathlib import PurePosixPath
+from typing import TypeVar
+
+from afids_utils.afids import AfidCohort, AfidSet, _create_executor
+from afids_utils.ext._io import COMPRESSED_OPENERS, resolve_format
+
+_T = TypeVar("_T")
+
+
+def _member_format(member_name: str) -> str | None:
+    """Internal function to get the AFIDs format of an archive member
+    (ignoring any compression suffix), if it is a supported AFIDs file"""
+    try:
+        return resolve_format(member_name, None)
+    except ValueError:
+        return None
+
+
+def _decompress_member(member_name: str, contents: bytes) -> bytes:
+    """Internal function to decompress the contents of a compressed archive
+    member (e.g. ".fcsv.gz"), based on its final suffix"""
+    opener = COMPRESSED_OPENERS.get(PurePosixPath(member_name).suffix)
+    if opener is None:
+        return contents
+    with opener(io.BytesIO(contents), "rb") as member_file:
+        return member_file.read()
+
+
+def _chunk(items: Sequence[_T], workers: int | None) -> list[Sequence[_T]]:
+    """Internal function to split items into batches sent to each worker"""
+    chunksize = max(1, len(items) // (4 * (workers or os.cpu_count() or 1)))
+    return [
+        items[idx : idx + chunksize] for idx in range(0, len(items), chunksize)
+    ]
+
+
+def _load_members(
+    members: Sequence[tuple[str, bytes]]
+) -> list[tuple[str, AfidSet]]:
+    """Internal function to parse a batch of (already extracted) members"""
+    return [
+        (
+            name,
+            AfidSet.load(
+                _decompress_member(name, contents),
+                format=_member_format(name),
+            ),
+        )
+        for name, contents in members
+    ]
+
+
+def _load_zip_members(
+    archive_path: PathLike[str] | str, names: Sequence[str]
+) -> list[tuple[str, AfidSet]]:
+    """Internal function to decompress and parse a batch of zip members"""
+    with zipfile.ZipFile(archive_path) as zip_file:
+        return _load_members([(name, zip_file.read(name)) for name in names])
+
+
+def _read_tar_members(
+    archive_path: PathLike[str] | str,
+) -> list[tuple[str, bytes]]:
+    """Internal function to read AFIDs files from a (compressed) tar archive
+
+    Members of a compressed tar archive can only be decompressed in order,
+    and so are all read upfront
+    """
+    members: list[tuple[str, bytes]] = []
+    with tarfile.open(archive_path) as tar_file:
+        for member in tar_file:
+            if not member.isfile() or _member_format(member.name) is None:
+                continue
+            member_file = tar_file.extractfile(member)
+            if member_file is not None:
+                members.append((member.name, member_file.read()))
+
+    return members
+
+
+def iter_archive(
+    archive_path: PathLike[str] | str,
+    workers: int | None = None,
+    executor: str = "thread",
+) -> Iterator[tuple[str, AfidSet]]:
+    """Parse the AFIDs files (.fcsv / .json) of an archive in memory
+
+    Parameters
+    ----------
+    archive_path
+        Path to .zip or (optionally compressed) .tar archive
+
+    workers
+        Maximum number of batches parsed at once. If none provided, the
+        number of CPUs is used
+
+    executor
+        Type of worker pool to parse members with - one of ["thread",
+        "process"] (default: "thread")
+
+    Yields
+    ------
+    tuple[str, AfidSet]
+        Path of each member within the archive and its parsed AfidSet, in
+        archive order
+
+    Raises
+    ------
+    FileNotFoundError
+        If archive does not exist
+
+    ValueError
+        If archive is not a .zip or .tar file, or invalid executor type
+        provided
+
+    Notes
+    -----
+    Members of a zip archive are decompressed by each worker, while members
+    of a tar archive are decompressed in order before being parsed by the
+    workers. Individually compressed members (e.g. ".fcsv.gz") are
+    decompressed by the workers parsing them. Any error raised while parsing
+    a member (see ``AfidSet.load``) is re-raised once encountered
+    """
+    if not os.path.exists(archive_path):
+        raise FileNotFoundError("Provided archive does not exist")
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as zip_file:
+            names = [
+                info.filename
+                for info in zip_file.infolist()
+                if not info.is_dir() and _member_format(info.filename)
+            ]
+        batches = _chunk(names, workers)
+        with _create_executor(executor, workers) as pool:
+            yield from chain.from_iterable(
+                pool.map(
+                    _load_zip_members, [archive_path] * len(batches), batches
+                )
+            )
+    elif tarfile.is_tarfile(archive_path):
+        batches = _chunk(_read_tar_members(archive_path), workers)
+        with _create_executor(executor, workers) as pool:
+            yield from chain.from_iterable(pool.map(_load_members, batches))
+    else:
+        raise ValueError("Unsupported archive format")
+
+
+def load_archive(
+    archive_path: PathLike[str] | str,
+    workers: int | None = None,
+    executor: str = "thread",
+) -> AfidCohort:
+    """Parse the AFIDs files (.fcsv / .json) of an archive into a cohort
+
+    Parameters
+    ----------
+    archive_path
+        Path to .zip or (optionally compressed) .tar archive
+
+    workers
+        Maximum number of batches parsed at once. If none provided, the
+        number of CPUs is used
+
+    executor
+        Type of worker pool to parse members with - one of ["thread",
+        "process"] (default: "thread")
+
+    Returns
+    -------
+    AfidCohort
+        Cohort of parsed AfidSets, using the path of each member within the
+        archive as its subject identifier
+    """
+    names: list[str] = []
+    afid_sets: list[AfidSet] = []
+    for name, afid_set in iter_archive(archive_path, workers, executor):
+        names.append(name)
+        afid_sets.append(afid_set)
+
+    return AfidCohort.from_afid_sets(afid_sets, subject_ids=names)
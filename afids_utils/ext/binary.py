@@ -0,0 +1,259 @@
+"""Methods for handling the binary cohort format of AFIDs
+
+A binary cohort file consists of a fixed-size header followed by one record
+per subject, holding its (32, 3) coordinates and metadata (coordinate
+system, subject id and Slicer version) as fixed-width fields. Records are
+stored back-to-back so the cohort can be memory-mapped, and new subjects
+can be appended without rewriting existing records.
+"""
+from __future__ import annotations
+
+import os
+import struct
+from os import PathLike
+from typing import BinaryIO, Literal, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from afids_utils.afids import AfidCohort
+from afids_utils.exceptions import InvalidFileError
+from afids_utils.resources import load_protocol
+
+BINARY_MAGIC = b"AFIDCOHT"
+BINARY_VERSION = 1
+
+# magic, version, number of afids, widths of the coordinate system, subject
+# id and slicer version fields, number of subjects (padded to 64 bytes)
+_HEADER = struct.Struct("<8sHHHHHxxQ")
+HEADER_SIZE = 64
+
+# Minimum widths (in characters) of metadata fields, leaving room to append
+# subjects with longer metadata to an existing file
+_MIN_WIDTHS = {"coord_systems": 8, "subject_ids": 64, "slicer_versions": 16}
+
+# Supported modes to memory-map a binary cohort with: read-only,
+# read-write or copy-on-write ("w+" is not supported, as it would
+# truncate the file)
+MmapMode = Optional[Literal["r", "r+", "c"]]
+MMAP_MODES = ("r", "r+", "c", None)
+
+
+def _record_dtype(widths: dict[str, int]) -> np.dtype[np.void]:
+    """Internal function to create the dtype of a single subject record"""
+    return np.dtype(
+        [("coords", "<f8", (len(load_protocol("human")), 3))]
+        + [(field, f"<U{width}") for field, width in widths.items()]
+    )
+
+
+def is_binary_cohort(in_fpath: PathLike[str] | str) -> bool:
+    """Check whether a file is a binary cohort file, from its magic bytes
+
+    Parameters
+    ----------
+    in_fpath
+        Path of file to check
+
+    Returns
+    -------
+    bool
+        Whether file starts with the binary cohort magic bytes
+    """
+    with open(in_fpath, "rb") as in_file:
+        return in_file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def _read_header(in_file: BinaryIO) -> tuple[dict[str, int], int]:
+    """Internal function to read and validate the header of a binary cohort
+
+    Returns
+    -------
+    widths
+        Width of each metadata field
+
+    count
+        Number of subjects stored in the file
+    """
+    header = in_file.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(BINARY_MAGIC):
+        raise InvalidFileError("Invalid binary AFIDs cohort file")
+
+    (
+        _,
+        version,
+        num_afids,
+        coord_width,
+        subject_width,
+        slicer_width,
+        count,
+    ) = _HEADER.unpack_from(header)
+    if version != BINARY_VERSION:
+        raise InvalidFileError(
+            f"Unsupported binary AFIDs cohort version: {version}"
+        )
+    if num_afids != len(load_protocol("human")):
+        raise InvalidFileError("Unexpected number of fiducials")
+
+    widths = {
+        "coord_systems": coord_width,
+        "subject_ids": subject_width,
+        "slicer_versions": slicer_width,
+    }
+    return widths, count
+
+
+def _write_header(
+    out_file: BinaryIO, widths: dict[str, int], count: int
+) -> None:
+    """Internal function to write the header of a binary cohort"""
+    out_file.seek(0)
+    out_file.write(
+        _HEADER.pack(
+            BINARY_MAGIC,
+            BINARY_VERSION,
+            len(load_protocol("human")),
+            widths["coord_systems"],
+            widths["subject_ids"],
+            widths["slicer_versions"],
+            count,
+        ).ljust(HEADER_SIZE, b"\0")
+    )
+
+
+def _max_length(values: NDArray[np.str_]) -> int:
+    """Internal function to get the length of the longest string"""
+    return int(np.char.str_len(values).max()) if values.size else 0
+
+
+def _to_records(
+    afid_cohort: AfidCohort, widths: dict[str, int]
+) -> NDArray[np.void]:
+    """Internal function to convert a cohort to an array of records"""
+    for field, width in widths.items():
+        max_length = _max_length(getattr(afid_cohort, field))
+        if max_length > width:
+            raise ValueError(
+                f"Length of {field} ({max_length}) exceeds maximum length of "
+                f"binary cohort ({width})"
+            )
+
+    records = np.empty(len(afid_cohort), dtype=_record_dtype(widths))
+    records["coords"] = afid_cohort.coords
+    for field in widths:
+        records[field] = getattr(afid_cohort, field)
+    return records
+
+
+def save_binary(
+    afid_cohort: AfidCohort,
+    out_fpath: PathLike[str] | str,
+    append: bool = False,
+) -> None:
+    """Save a cohort of AFIDs to a binary cohort file
+
+    Parameters
+    ----------
+    afid_cohort
+        Cohort containing coordinates and metadata of each subject
+
+    out_fpath
+        Path of binary cohort file to save cohort to
+
+    append
+        Append subjects to the end of an existing binary cohort file, which
+        is created if it does not exist (default: False)
+
+    Raises
+    ------
+    InvalidFileError
+        If appending to an invalid binary cohort file
+
+    ValueError
+        If metadata of a subject is longer than supported by the file
+    """
+    if append and os.path.exists(out_fpath):
+        with open(out_fpath, "r+b") as out_file:
+            widths, count = _read_header(out_file)
+            records = _to_records(afid_cohort, widths)
+
+            # Write records before updating the number of subjects, so an
+            # interrupted append leaves the existing cohort intact
+            out_file.seek(HEADER_SIZE + count * records.dtype.itemsize)
+            out_file.write(records.tobytes())
+            out_file.truncate()
+            _write_header(out_file, widths, count + len(records))
+        return
+
+    # Even widths keep (8-byte) coordinates of each record aligned
+    widths: dict[str, int] = {}
+    for field, min_width in _MIN_WIDTHS.items():
+        values = getattr(afid_cohort, field)
+        width = max(min_width, _max_length(values))
+        widths[field] = width + width % 2
+    records = _to_records(afid_cohort, widths)
+    with open(out_fpath, "wb") as out_file:
+        _write_header(out_file, widths, len(records))
+        out_file.write(records.tobytes())
+
+
+def load_binary(
+    in_fpath: PathLike[str] | str,
+    mmap_mode: MmapMode = "r",
+) -> AfidCohort:
+    """Load a cohort of AFIDs from a binary cohort file
+
+    Parameters
+    ----------
+    in_fpath
+        Path of binary cohort file to load
+
+    mmap_mode
+        Mode to memory-map the file with (see ``numpy.memmap``), so
+        subjects are only read from disk when accessed - one of ["r", "r+",
+        "c"]. With "r+", changes to the coordinates of the cohort are
+        written back to the file. If none provided, the whole file is read
+        into memory (default: "r")
+
+    Returns
+    -------
+    AfidCohort
+        Cohort containing coordinates and metadata of each subject, sharing
+        memory with the memory-mapped file
+
+    Raises
+    ------
+    InvalidFileError
+        If file is not a valid (or complete) binary cohort file
+
+    ValueError
+        If an unsupported memory-map mode is provided
+    """
+    if mmap_mode not in MMAP_MODES:
+        raise ValueError(f"Unsupported memory-map mode: {mmap_mode}")
+
+    with open(in_fpath, "r+b" if mmap_mode == "r+" else "rb") as in_file:
+        widths, count = _read_header(in_file)
+        dtype = _record_dtype(widths)
+        if os.fstat(in_file.fileno()).st_size < (
+            HEADER_SIZE + count * dtype.itemsize
+        ):
+            raise InvalidFileError("Truncated binary AFIDs cohort file")
+
+        if mmap_mode is None or count == 0:
+            records = np.fromfile(in_file, dtype=dtype, count=count)
+        else:
+            records = np.memmap(
+                in_file,
+                dtype=dtype,
+                mode=mmap_mode,
+                offset=HEADER_SIZE,
+                shape=(count,),
+            )
+
+    return AfidCohort(
+        coords=records["coords"],
+        coord_systems=records["coord_systems"],
+        subject_ids=records["subject_ids"],
+        slicer_versions=records["slicer_versions"],
+    )
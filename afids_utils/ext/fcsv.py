@@ -2,12 +2,24 @@
 from __future__ import annotations
 
 import csv
-import re
-from importlib import resources
-from os import PathLike
+import io
+from collections.abc import Iterable
+from functools import lru_cache
+from itertools import zip_longest
 
-from afids_utils.afids import AfidPosition, AfidSet
+import numpy as np
+from numpy.typing import NDArray
+
+from afids_utils.afids import AfidPosition, AfidSet, _slicer_coord_system
 from afids_utils.exceptions import InvalidFileError
+from afids_utils.ext._io import (
+    AfidsSource,
+    AfidsTarget,
+    read_lines,
+    read_text,
+    write_text,
+)
+from afids_utils.resources import load_fcsv_template
 
 HEADER_ROWS: int = 2
 FCSV_FIELDNAMES: tuple[str, ...] = (
@@ -50,15 +62,19 @@ def _get_metadata(in_fcsv: list[str]) -> tuple[str, str]:
         If header is missing or invalid from .fcsv file
     """
     try:
-        header = in_fcsv[: HEADER_ROWS + 1]
-
-        # Parse version and coordinate system
-        parsed_version = re.findall(r"\d+\.\d+", header[0])[0]
-        parsed_coord = re.split(r"\s", header[1])[-2]
-
+        # Parse version (e.g. "... version = 4.6") and coordinate system
+        # (e.g. "# CoordinateSystem = 0") from the end of each header line
+        version = in_fcsv[0].replace("=", " ").split()[-1]
+        major, _, minor = version.partition(".")
+        minor = minor.partition(".")[0]
+        parsed_coord = in_fcsv[1].split()[-1]
     except IndexError:
         raise InvalidFileError("Missing or invalid header in .fcsv file")
 
+    if not (major.isdecimal() and minor.isdecimal()):
+        raise InvalidFileError("Missing or invalid header in .fcsv file")
+    parsed_version = f"{major}.{minor}"
+
     # Transform coordinate system so human-understandable
     if parsed_coord == "0":
         parsed_coord = "RAS"
@@ -71,48 +87,109 @@ def _get_metadata(in_fcsv: list[str]) -> tuple[str, str]:
     return parsed_version, parsed_coord
 
 
-def _get_afids(in_fcsv: list[str]) -> list[AfidPosition]:
-    """Internal function for grabbing AFID positions from .fcsv file
+def _get_afid_arrays(
+    in_fcsv: list[str],
+) -> tuple[NDArray[np.int_], list[str], NDArray[np.float_]]:
+    """Internal function for grabbing AFID labels, descriptions and spatial
+    coordinates from .fcsv file without creating ``AfidPosition`` objects
 
     Parameters
     ----------
     in_fcsv
-        Data from provided fcsv file to parse metadata from
+        Data from provided fcsv file to parse AFIDs from
 
     Returns
     -------
-    afid_positions
-        List containing spatial position of afids
+    labels
+        Array containing label of each afid
+
+    descs
+        List containing description of each afid
+
+    coords
+        Array of shape (N, 3) containing spatial position of each afid
     """
-    # Read in AFIDs from fcsv (set to start from 1 to skip header fields)
-    afids = in_fcsv[HEADER_ROWS + 1 :]
-
-    # Add to list of AfidPosition
-    afids_positions: list[AfidPosition] = []
-    for afid in afids:
-        afid = afid.split(",")
-        afids_positions.append(
-            AfidPosition(
-                label=int(afid[-3]),
-                x=float(afid[1]),
-                y=float(afid[2]),
-                z=float(afid[3]),
-                desc=afid[-2],
-            )
-        )
+    # Read in AFIDs from fcsv (skipping header and any empty lines)
+    rows = [row.split(",") for row in in_fcsv[HEADER_ROWS + 1 :] if row]
+
+    labels = np.array([row[-3] for row in rows], dtype=np.int_)
+    descs = [row[-2] for row in rows]
+    coords = np.array([row[1:4] for row in rows], dtype=np.float_).reshape(
+        -1, 3
+    )
+
+    return labels, descs, coords
+
+
+def load_fcsv_arrays(
+    fcsv_path: AfidsSource,
+) -> tuple[str, str, NDArray[np.int_], list[str], NDArray[np.float_]]:
+    """Read in fcsv and extract relevant information for an AfidSet as
+    arrays, without creating any ``AfidPosition`` objects
+
+    Parameters
+    ----------
+    fcsv_path
+        Path to .fcsv file (or stream / bytes of its contents) containing
+        AFIDs coordinates
+
+    Returns
+    -------
+    slicer_version
+        Slicer version associated with fiducial file
+
+    coord_system
+        Coordinate system of fiducials
+
+    labels
+        Array containing label of each afid
+
+    descs
+        List containing description of each afid
+
+    coords
+        Array of shape (N, 3) containing spatial position of each afid
+    """
+    in_fcsv = read_text(fcsv_path).splitlines()
+
+    # Grab metadata
+    slicer_version, coord_system = _get_metadata(in_fcsv)
+    # Grab afids
+    labels, descs, coords = _get_afid_arrays(in_fcsv)
 
-    return afids_positions
+    return slicer_version, coord_system, labels, descs, coords
+
+
+def load_fcsv_metadata(fcsv_path: AfidsSource) -> tuple[str, str]:
+    """Read only the header of a fcsv file, without parsing any AFIDs
+
+    Parameters
+    ----------
+    fcsv_path
+        Path to .fcsv file (or stream / bytes of its contents) containing
+        AFIDs coordinates
+
+    Returns
+    -------
+    slicer_version
+        Slicer version associated with fiducial file
+
+    coord_system
+        Coordinate system of fiducials
+    """
+    return _get_metadata(read_lines(fcsv_path, HEADER_ROWS + 1))
 
 
 def load_fcsv(
-    fcsv_path: PathLike[str] | str,
+    fcsv_path: AfidsSource,
 ) -> tuple[str, str, list[AfidPosition]]:
     """Read in fcsv and extract relevant information for an AfidSet
 
     Parameters
     ----------
     fcsv_path
-        Path to .fcsv file containing AFIDs coordinates
+        Path to .fcsv file (or stream / bytes of its contents) containing
+        AFIDs coordinates
 
     Returns
     -------
@@ -125,20 +202,60 @@ def load_fcsv(
     afids_positions
         List containing spatial position of afids
     """
-    with open(fcsv_path) as in_fcsv_fpath:
-        in_fcsv = in_fcsv_fpath.readlines()
-
-    # Grab metadata
-    slicer_version, coord_system = _get_metadata(in_fcsv)
-    # Grab afids
-    afids_positions = _get_afids(in_fcsv)
+    slicer_version, coord_system, labels, descs, coords = load_fcsv_arrays(
+        fcsv_path
+    )
+    afids_positions = [
+        AfidPosition(label=label, x=x, y=y, z=z, desc=desc)
+        for label, desc, (x, y, z) in zip(
+            labels.tolist(), descs, coords.tolist()
+        )
+    ]
 
     return slicer_version, coord_system, afids_positions
 
 
+@lru_cache(maxsize=None)
+def _fcsv_format() -> str:
+    """Internal function to pre-render the packaged template into a single
+    format string, taking the coordinate system followed by the x, y, z
+    coordinates of each AFID"""
+    template = load_fcsv_template()
+
+    def _escape(field: str) -> str:
+        return field.replace("{", "{{").replace("}", "}}")
+
+    # Render rows once with the csv writer so quoting and line endings match
+    rows = io.StringIO(newline="")
+    csv.writer(rows).writerows(
+        (
+            _escape(row[0]),
+            "{}",
+            "{}",
+            "{}",
+            *(_escape(field) for field in row[4:]),
+        )
+        for row in template.rows
+    )
+
+    header = [_escape(line) for line in template.header]
+    header[1] = "# CoordinateSystem = {}\n"
+
+    return "".join(header) + rows.getvalue()
+
+
+def _render_fcsv(afid_set: AfidSet, fcsv_format: str) -> str:
+    """Internal function to render an AfidSet with a pre-rendered template"""
+    return fcsv_format.format(
+        _slicer_coord_system(afid_set.coord_system),
+        *afid_set.coords.ravel().tolist(),
+    )
+
+
 def save_fcsv(
     afid_set: AfidSet,
-    out_fcsv: PathLike[str] | str,
+    out_fcsv: AfidsTarget,
+    compresslevel: int | None = None,
 ) -> None:
     """Save fiducials to output fcsv file
 
@@ -148,32 +265,62 @@ def save_fcsv(
         A complete AfidSet containing metadata and positions of AFIDs
 
     out_fcsv
-        Path of fcsv file to save AFIDs to
+        Path of fcsv file (or text / binary stream) to save AFIDs to
+
+    compresslevel
+        Compression level when saving to a compressed file (e.g. ".fcsv.gz").
+        If none provided, the default level of the compression library is
+        used
+
+    Raises
+    ------
+    ValueError
+        If AfidSet contains an invalid coordinate system
     """
-    # Read in fcsv template
-    with resources.open_text(
-        "afids_utils.resources", "template.fcsv"
-    ) as template_fcsv_file:
-        header = [
-            template_fcsv_file.readline() for _ in range(HEADER_ROWS + 1)
-        ]
-        reader = csv.DictReader(template_fcsv_file, fieldnames=FCSV_FIELDNAMES)
-        fcsv = list(reader)
-
-    # Update header coordinate system
-    header[1] = f"# CoordinateSystem = {afid_set.coord_system}\n"
-
-    # Loop over fiducials and update with fiducial spatial coordinates
-    for idx, row in enumerate(fcsv):
-        row["x"] = afid_set.afids[idx].x
-        row["y"] = afid_set.afids[idx].y
-        row["z"] = afid_set.afids[idx].z
-
-    # Write output fcsv
-    with open(out_fcsv, "w", encoding="utf-8", newline="") as out_fcsv_file:
-        for line in header:
-            out_fcsv_file.write(line)
-        writer = csv.DictWriter(out_fcsv_file, fieldnames=FCSV_FIELDNAMES)
-
-        for row in fcsv:
-            writer.writerow(row)
+    write_text(
+        out_fcsv,
+        _render_fcsv(afid_set, _fcsv_format()),
+        newline="",
+        compresslevel=compresslevel,
+    )
+
+
+def save_many_fcsv(
+    afid_sets: Iterable[AfidSet],
+    out_fcsvs: Iterable[AfidsTarget],
+    compresslevel: int | None = None,
+) -> None:
+    """Save multiple sets of fiducials to output fcsv files
+
+    Parameters
+    ----------
+    afid_sets
+        Complete AfidSets containing metadata and positions of AFIDs
+
+    out_fcsvs
+        Paths of fcsv files (or text / binary streams) to save each AfidSet
+        to
+
+    compresslevel
+        Compression level when saving to a compressed file (e.g. ".fcsv.gz").
+        If none provided, the default level of the compression library is
+        used
+
+    Raises
+    ------
+    ValueError
+        If number of AfidSets and output paths differ, or an AfidSet
+        contains an invalid coordinate system
+    """
+    fcsv_format = _fcsv_format()
+
+    for afid_set, out_fcsv in zip_longest(afid_sets, out_fcsvs):
+        if afid_set is None or out_fcsv is None:
+            raise ValueError("Mismatched number of AfidSets and output paths")
+
+        write_text(
+            out_fcsv,
+            _render_fcsv(afid_set, fcsv_format),
+            newline="",
+            compresslevel=compresslevel,
+        )
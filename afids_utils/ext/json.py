@@ -2,13 +2,25 @@
 from __future__ import annotations
 
 import json
-from importlib import resources
-from os import PathLike
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Any
 
+import attrs
+import numpy as np
+from numpy.typing import NDArray
 from typing_extensions import TypedDict
 
-from afids_utils.afids import AfidPosition, AfidSet
-from afids_utils.exceptions import InvalidFileError
+from afids_utils.afids import AfidCohort, AfidPosition, AfidSet
+from afids_utils.exceptions import InvalidFiducialError, InvalidFileError
+from afids_utils.ext._io import (
+    AfidsSource,
+    AfidsTarget,
+    iter_chunks,
+    read_text,
+    write_text,
+)
+from afids_utils.resources import load_json_template
 
 
 class ControlPoint(TypedDict):
@@ -24,6 +36,11 @@ class ControlPoint(TypedDict):
     positionStatus: str
 
 
+# Key and size of chunks read while scanning for the coordinate system
+_COORD_SYSTEM_KEY = '"coordinateSystem"'
+_METADATA_CHUNK_SIZE = 512
+
+
 def _get_metadata(coord_system: str) -> tuple[str, str]:
     """Internal function to extract metadata from json files
 
@@ -64,42 +81,144 @@ def _get_metadata(coord_system: str) -> tuple[str, str]:
     return parsed_version, parsed_coord
 
 
-def _get_afids(control_points: list[ControlPoint]) -> list[AfidPosition]:
-    """Internal function to parse fiducial information from json file
+def _get_afid_arrays(
+    control_points: list[ControlPoint],
+) -> tuple[NDArray[np.int_], list[str], NDArray[np.float_]]:
+    """Internal function to parse fiducial labels, descriptions and spatial
+    coordinates from json file without creating ``AfidPosition`` objects
 
     Parameters
     ----------
-    ctrl_points
+    control_points
         List of dicts containing fiducial information from parsed json file
 
     Returns
     -------
-    afid_positions
-        List containing spatial position of afids
+    labels
+        Array containing label of each afid
+
+    descs
+        List containing description of each afid
+
+    coords
+        Array of shape (N, 3) containing spatial position of each afid
     """
-    afids_positions = [
-        AfidPosition(
-            label=int(afid["label"]),
-            x=float(afid["position"][0]),
-            y=float(afid["position"][1]),
-            z=float(afid["position"][2]),
-            desc=afid["description"],
-        )
-        for afid in control_points
-    ]
+    labels = np.array(
+        [int(afid["label"]) for afid in control_points], dtype=np.int_
+    )
+    descs = [afid["description"] for afid in control_points]
+    coords = np.array(
+        [afid["position"][:3] for afid in control_points], dtype=np.float_
+    ).reshape(-1, 3)
+
+    return labels, descs, coords
+
+
+def _get_markup_arrays(
+    markup: dict[str, Any],
+) -> tuple[str, str, NDArray[np.int_], list[str], NDArray[np.float_]]:
+    """Internal function to parse metadata and fiducials of a single markups
+    node as arrays"""
+    slicer_version, coord_system = _get_metadata(markup["coordinateSystem"])
+    labels, descs, coords = _get_afid_arrays(markup["controlPoints"])
+
+    return slicer_version, coord_system, labels, descs, coords
 
-    return afids_positions
+
+def load_json_arrays(
+    json_path: AfidsSource,
+) -> tuple[str, str, NDArray[np.int_], list[str], NDArray[np.float_]]:
+    """Read in json and extract relevant information for an AfidSet as
+    arrays, without creating any ``AfidPosition`` objects
+
+    Parameters
+    ----------
+    json_path
+        Path to .json file (or stream / bytes of its contents) containing
+        AFIDs coordinates
+
+    Returns
+    -------
+    slicer_version
+        Slicer version associated with fiducial file
+
+    coord_system
+        Coordinate system of fiducials
+
+    labels
+        Array containing label of each afid
+
+    descs
+        List containing description of each afid
+
+    coords
+        Array of shape (N, 3) containing spatial position of each afid
+    """
+    afids_json = json.loads(read_text(json_path))
+
+    return _get_markup_arrays(afids_json["markups"][0])
+
+
+def load_json_metadata(json_path: AfidsSource) -> tuple[str, str]:
+    """Stream a json file only until the coordinate system of its first
+    markups node, without parsing any AFIDs
+
+    Parameters
+    ----------
+    json_path
+        Path to .json file (or stream / bytes of its contents) containing
+        AFIDs coordinates
+
+    Returns
+    -------
+    slicer_version
+        Slicer version associated with fiducial file
+
+    coord_system
+        Coordinate system of fiducials
+
+    Raises
+    ------
+    InvalidFileError
+        If coordinate system is missing or invalid
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+
+    for chunk in iter_chunks(json_path, _METADATA_CHUNK_SIZE):
+        buffer += chunk
+        key_idx = buffer.find(_COORD_SYSTEM_KEY)
+        if key_idx < 0:
+            # Keep enough to match a key split across chunks
+            buffer = buffer[-len(_COORD_SYSTEM_KEY) :]
+            continue
+
+        # Decode value following the key, reading more if incomplete
+        buffer = buffer[key_idx:]
+        value_idx = buffer.find(":", len(_COORD_SYSTEM_KEY)) + 1
+        if not value_idx:
+            continue
+        while buffer[value_idx : value_idx + 1].isspace():
+            value_idx += 1
+        try:
+            coord_system, _ = decoder.raw_decode(buffer, value_idx)
+        except ValueError:
+            continue
+        return _get_metadata(coord_system)
+
+    raise InvalidFileError("Missing coordinate system in .json file")
 
 
 def load_json(
-    json_path: PathLike[str] | str,
+    json_path: AfidsSource,
 ) -> tuple[str, str, list[AfidPosition]]:
     """Read in json and extract relevant information for an AfidSet
 
     Parameters
     ----------
     json_path
-        Path to .json file containing AFIDs coordinates
+        Path to .json file (or stream / bytes of its contents) containing
+        AFIDs coordinates
 
     Returns
     -------
@@ -112,22 +231,180 @@ def load_json(
     afids_positions
         List containing spatial position of afids
     """
-    with open(json_path) as json_file:
-        afids_json = json.load(json_file)
-
-    # Grab metadata
-    slicer_version, coord_system = _get_metadata(
-        afids_json["markups"][0]["coordinateSystem"]
+    slicer_version, coord_system, labels, descs, coords = load_json_arrays(
+        json_path
     )
-    # Grab afids
-    afids_positions = _get_afids(afids_json["markups"][0]["controlPoints"])
+    afids_positions = [
+        AfidPosition(label=label, x=x, y=y, z=z, desc=desc)
+        for label, desc, (x, y, z) in zip(
+            labels.tolist(), descs, coords.tolist()
+        )
+    ]
 
     return slicer_version, coord_system, afids_positions
 
 
+@attrs.define(frozen=True)
+class MarkupsNode:
+    """Result of parsing a single markups node of a .json file
+
+    Parameters
+    ----------
+    index
+        Position of the node within the "markups" list of the file
+
+    afid_set
+        AfidSet parsed from the node, if the node is valid
+
+    error
+        Error raised while parsing the node, if the node is invalid
+    """
+
+    index: int
+    afid_set: AfidSet | None = None
+    error: Exception | None = None
+
+
+def iter_json_nodes(json_path: AfidsSource) -> Iterator[MarkupsNode]:
+    """Parse a .json file once and yield an AfidSet for every markups node
+
+    Parameters
+    ----------
+    json_path
+        Path to .json file (or stream / bytes of its contents) containing
+        one or more markups nodes
+
+    Yields
+    ------
+    MarkupsNode
+        Index of each node with its parsed AfidSet, or the error raised
+        while parsing it
+    """
+    afids_json = json.loads(read_text(json_path))
+
+    try:
+        markups = afids_json["markups"]
+    except (KeyError, TypeError):
+        raise InvalidFileError("Missing markups in .json file")
+
+    for idx, markup in enumerate(markups):
+        try:
+            afid_set = AfidSet._from_labelled_arrays(
+                *_get_markup_arrays(markup)
+            )
+        except (KeyError, IndexError, TypeError):
+            yield MarkupsNode(
+                index=idx,
+                error=InvalidFileError(
+                    f"Missing or invalid fields in markups node {idx}"
+                ),
+            )
+        except (ValueError, InvalidFileError, InvalidFiducialError) as err:
+            yield MarkupsNode(index=idx, error=err)
+        else:
+            yield MarkupsNode(index=idx, afid_set=afid_set)
+
+
+def load_json_nodes(json_path: AfidsSource) -> list[MarkupsNode]:
+    """Parse a .json file once and load an AfidSet for every markups node
+
+    Parameters
+    ----------
+    json_path
+        Path to .json file (or stream / bytes of its contents) containing
+        one or more markups nodes
+
+    Returns
+    -------
+    list[MarkupsNode]
+        Index of each node with its parsed AfidSet, or the error raised
+        while parsing it
+    """
+    return list(iter_json_nodes(json_path))
+
+
+def load_json_cohort(
+    json_path: AfidsSource,
+) -> tuple[AfidCohort, dict[int, Exception]]:
+    """Parse a .json file once and stack every valid markups node into a
+    cohort
+
+    Parameters
+    ----------
+    json_path
+        Path to .json file (or stream / bytes of its contents) containing
+        one or more markups nodes
+
+    Returns
+    -------
+    afid_cohort
+        Cohort of valid nodes, using the index of each node as its subject
+        identifier
+
+    errors
+        Error raised while parsing each invalid node, keyed by node index
+    """
+    afid_sets: list[AfidSet] = []
+    subject_ids: list[str] = []
+    errors: dict[int, Exception] = {}
+
+    for node in iter_json_nodes(json_path):
+        if node.afid_set is not None:
+            afid_sets.append(node.afid_set)
+            subject_ids.append(str(node.index))
+        elif node.error is not None:
+            errors[node.index] = node.error
+
+    return (
+        AfidCohort.from_afid_sets(afid_sets, subject_ids=subject_ids),
+        errors,
+    )
+
+
+# Placeholders serialized into the skeleton, to be replaced by fields
+_COORD_SYSTEM_PLACEHOLDER = "@@coordinateSystem@@"
+_POSITION_PLACEHOLDER = "@@position@@"
+
+
+@lru_cache(maxsize=None)
+def _json_format(compact: bool = False) -> str:
+    """Internal function to pre-serialize the packaged template into a single
+    format string, taking the coordinate system followed by the x, y, z
+    coordinates of each AFID (all already JSON-encoded)"""
+    template = load_json_template()
+
+    skeleton = {
+        **template.root,
+        "markups": [
+            {
+                **template.markup,
+                "coordinateSystem": _COORD_SYSTEM_PLACEHOLDER,
+                "controlPoints": [
+                    {**control_point, "position": [_POSITION_PLACEHOLDER] * 3}
+                    for control_point in template.control_points
+                ],
+            }
+        ],
+    }
+    skeleton_json = (
+        json.dumps(skeleton, separators=(",", ":"))
+        if compact
+        else json.dumps(skeleton, indent=4)
+    )
+
+    return (
+        skeleton_json.replace("{", "{{")
+        .replace("}", "}}")
+        .replace(json.dumps(_COORD_SYSTEM_PLACEHOLDER), "{}")
+        .replace(json.dumps(_POSITION_PLACEHOLDER), "{}")
+    )
+
+
 def save_json(
     afid_set: AfidSet,
-    out_json: PathLike[str] | str,
+    out_json: AfidsTarget,
+    compact: bool = False,
+    compresslevel: int | None = None,
 ) -> None:
     """Save fiducials to output json file
 
@@ -137,27 +414,27 @@ def save_json(
         A complete AfidSet containing metadata and positions of AFIDs
 
     out_json
-        Path of json file to save AFIDs to
+        Path of json file (or text / binary stream) to save AFIDs to
+
+    compact
+        Write json without indentation or whitespace between separators
+        (default: False)
+
+    compresslevel
+        Compression level when saving to a compressed file (e.g. ".json.gz").
+        If none provided, the default level of the compression library is
+        used
     """
-    # Read in json template
-    with resources.open_text(
-        "afids_utils.resources", "template.json"
-    ) as template_json_file:
-        template_content = json.load(template_json_file)
-
-        # Update header
-        template_content["markups"][0][
-            "coordinateSystem"
-        ] = afid_set.coord_system
-
-    # Loop and update with fiducial coordinates
-    for idx in range(len(template_content["markups"][0]["controlPoints"])):
-        template_content["markups"][0]["controlPoints"][idx]["position"] = [
-            afid_set.afids[idx].x,
-            afid_set.afids[idx].y,
-            afid_set.afids[idx].z,
-        ]
-
-    # Write output json
-    with open(out_json, "w") as out_json_file:
-        json.dump(template_content, out_json_file, indent=4)
+    positions = afid_set.coords.ravel().tolist()
+    # Non-finite values are encoded as NaN / Infinity, as done by json.dump
+    if not np.isfinite(afid_set.coords).all():
+        positions = [json.dumps(position) for position in positions]
+
+    # Write output json, splicing fields into the pre-serialized template
+    write_text(
+        out_json,
+        _json_format(compact).format(
+            json.dumps(afid_set.coord_system), *positions
+        ),
+        compresslevel=compresslevel,
+    )
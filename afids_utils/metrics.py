@@ -1,19 +1,45 @@
 """Methods for computing various metrics pertaining to AFIDs"""
 from __future__ import annotations
 
-import statistics as stats
+from collections.abc import Iterable, Sequence
+from os import PathLike
 
-from afids_utils.afids import AfidDistanceSet, AfidPosition, AfidSet
+import attrs
+import numpy as np
+from numpy.typing import NDArray
 
+from afids_utils.afids import AfidCohort, AfidSet
+from afids_utils.resources import load_protocol
 
-def mean_afid_sets(afid_sets: list[AfidSet]) -> AfidSet:
+DISTANCE_COMPONENTS: tuple[str, ...] = ("x", "y", "z", "distance")
+
+
+def _as_cohort(afid_sets: Sequence[AfidSet] | AfidCohort) -> AfidCohort:
+    """Internal function to stack a collection of ``AfidSet`` objects into a
+    single ``AfidCohort`` (returned as-is if already a cohort)"""
+    if isinstance(afid_sets, AfidCohort):
+        return afid_sets
+
+    return AfidCohort.from_afid_sets(afid_sets)
+
+
+def mean_afid_sets(
+    afid_sets: Sequence[AfidSet] | AfidCohort | NDArray[np.float_],
+    coord_system: str | None = None,
+) -> AfidSet:
     """Calculate the average spatial coordinates for corresponding AFIDs
-    within a list of ``AfidSet`` objects.
+    within a collection of ``AfidSet`` objects.
 
     Parameters
     ----------
     afid_sets
-        List of ``AfidSet`` to compute mean from
+        List of ``AfidSet`` (or an ``AfidCohort``) to compute mean from.
+        Alternatively, an array of shape (N, 32, 3) containing the spatial
+        coordinates of N sets of AFIDs
+
+    coord_system
+        Coordinate system of the provided array of coordinates. Only used
+        (and required) if ``afid_sets`` is an array
 
     Returns
     -------
@@ -23,55 +49,142 @@ def mean_afid_sets(afid_sets: list[AfidSet]) -> AfidSet:
     Raises
     ------
     ValueError
-        If input list does not consist of all ``AfidSet`` objects or if there
-        are different coordinate systems in provided list of ``AfidSet``
-        objects
+        If there are different coordinate systems in provided collection of
+        ``AfidSet`` objects, if no ``AfidSet`` objects are provided or if
+        an array is provided without a coordinate system
     """
+    if isinstance(afid_sets, np.ndarray):
+        if coord_system is None:
+            raise ValueError(
+                "Coordinate system required to compute mean of array"
+            )
+        cohort = AfidCohort(
+            coords=afid_sets,
+            coord_systems=np.full(len(afid_sets), coord_system),
+        )
+    else:
+        cohort = _as_cohort(afid_sets)
+
+    if not len(cohort):
+        raise ValueError("No AfidSet provided to compute mean from")
+
     # Check if coordinate systems are all the same
-    if not all(
-        afid_set.coord_system == afid_sets[0].coord_system
-        for afid_set in afid_sets
-    ):
+    if np.any(cohort.coord_systems != cohort.coord_systems[0]):
         raise ValueError(
             "Mismatched coordinate system in provided list of AfidSet"
         )
 
-    mean_afid_set = AfidSet(
+    return AfidSet._from_coords(
         slicer_version="Unknown",
-        coord_system=afid_sets[0].coord_system,
-        afids=[
-            AfidPosition(
-                label=afid.label,
-                x=stats.mean(
-                    [afid_set.afids[idx].x for afid_set in afid_sets]
-                ),
-                y=stats.mean(
-                    [afid_set.afids[idx].y for afid_set in afid_sets]
-                ),
-                z=stats.mean(
-                    [afid_set.afids[idx].z for afid_set in afid_sets]
-                ),
-                desc=afid.desc,
-            )
-            for idx, afid in enumerate(afid_sets[0].afids)
-        ],
+        coord_system=str(cohort.coord_systems[0]),
+        coords=cohort.coords.mean(axis=0),
     )
 
-    return mean_afid_set
+
+def distance_components(
+    afid_sets: Sequence[AfidSet] | AfidCohort,
+    template_afid_set: AfidSet,
+) -> NDArray[np.float_]:
+    """Calculate the distance along each spatial component, as well as the
+    Euclidean distance, between every AFID of a collection of ``AfidSet``
+    objects and a common / template ``AfidSet``.
+
+    Parameters
+    ----------
+    afid_sets
+        List of ``AfidSet`` objects (or an ``AfidCohort``) to compute
+        distances with
+
+    template_afid_set
+        Template / common ``AfidSet`` to compute distances against
+
+    Returns
+    -------
+    NDArray[np.float_]
+        Array of shape (N, 32, 4), containing the distances along each
+        component of ``DISTANCE_COMPONENTS`` (x, y, z and Euclidean distance)
+
+    Raises
+    ------
+    ValueError
+        If coordinate systems are mismatched with the template ``AfidSet``,
+        or if no ``AfidSet`` objects are provided
+    """
+    cohort = _as_cohort(afid_sets)
+
+    if not len(cohort):
+        raise ValueError("No AfidSet provided to compute distances with")
+
+    # Check if the coordinate systems match
+    if np.any(cohort.coord_systems != template_afid_set.coord_system):
+        raise ValueError("Mismatched coordinate systems")
+
+    # Compute spatial and Euclidean distances in a single broadcast
+    components = np.empty((*cohort.coords.shape[:2], 4))
+    np.subtract(
+        cohort.coords, template_afid_set.coords, out=components[..., :3]
+    )
+    components[..., 3] = np.sqrt(
+        np.sum(np.square(components[..., :3]), axis=-1)
+    )
+
+    return components
+
+
+def mean_distance_components(
+    afid_sets: Sequence[AfidSet] | AfidCohort,
+    template_afid_set: AfidSet,
+) -> dict[str, NDArray[np.float_]]:
+    """Calculate the average distance along every spatial component, as well
+    as the average Euclidean distance, between a collection of ``AfidSet``
+    objects and a common / template ``AfidSet``.
+
+    Parameters
+    ----------
+    afid_sets
+        List of ``AfidSet`` objects (or an ``AfidCohort``) to compute
+        distances with
+
+    template_afid_set
+        Template / common ``AfidSet`` to compute distances against
+
+    Returns
+    -------
+    dict[str, NDArray[np.float_]]
+        Mapping of each component in ``DISTANCE_COMPONENTS`` to an array
+        containing the average distance for each AFID
+
+    Raises
+    ------
+    ValueError
+        If coordinate systems are mismatched with the template ``AfidSet``,
+        or if no ``AfidSet`` objects are provided
+    """
+    mean_components = distance_components(
+        afid_sets=afid_sets, template_afid_set=template_afid_set
+    ).mean(axis=0)
+
+    return {
+        component: mean_components[:, idx]
+        for idx, component in enumerate(DISTANCE_COMPONENTS)
+    }
 
 
 def mean_distances(
-    afid_sets: list[AfidSet],
+    afid_sets: Sequence[AfidSet] | AfidCohort,
     template_afid_set: AfidSet,
     component: str = "distance",
 ) -> list[float]:
     """Calculate the average distance for a given spatial component between
     a collection of ``AfidSet`` objects and a common / template ``AfidSet``.
 
+    To compute all components at once, use ``mean_distance_components``.
+
     Parameters
     ----------
     afid_sets
-        List of ``AfidSet`` objects to compute distances with
+        List of ``AfidSet`` objects (or an ``AfidCohort``) to compute
+        distances with
 
     template_afid_set
         Template / common ``AfidSet`` to compute distances against
@@ -86,22 +199,248 @@ def mean_distances(
         List of average distances along each spatial component and Euclidean
         distance
 
+    Raises
+    ------
+    ValueError
+        If invalid component provided, if coordinate systems are mismatched
+        with the template ``AfidSet`` or if no ``AfidSet`` objects are
+        provided
     """
-    # Compute distances
-    afid_distance_sets = [
-        AfidDistanceSet(afid_set1=afid_set, afid_set2=template_afid_set)
-        for afid_set in afid_sets
-    ]
-
-    # Compute mean distance for each AFID
-    mean_component = [
-        stats.mean(
-            [
-                afid_distance_set.afids[idx].get(component)
-                for afid_distance_set in afid_distance_sets
-            ]
+    if component not in DISTANCE_COMPONENTS:
+        raise ValueError(f"Invalid component '{component}'")
+
+    return mean_distance_components(
+        afid_sets=afid_sets, template_afid_set=template_afid_set
+    )[component].tolist()
+
+
+@attrs.define(kw_only=True)
+class AfidDispersion:
+    """Class to store the spread of AFID spatial coordinates about their mean
+
+    Parameters
+    ----------
+    count
+        Number of ``AfidSet`` objects the dispersion was computed from
+
+    std
+        Array of shape (32, 3) containing the standard deviation (in mm) of
+        each AFID along each spatial component
+
+    radial_std
+        Array of shape (32,) containing the root-mean-square Euclidean
+        distance (in mm) of each AFID from its mean position
+    """
+
+    count: int = attrs.field()
+    std: NDArray[np.float_] = attrs.field(
+        eq=attrs.cmp_using(eq=np.array_equal)
+    )
+    radial_std: NDArray[np.float_] = attrs.field(
+        eq=attrs.cmp_using(eq=np.array_equal)
+    )
+
+
+def _zero_coords() -> NDArray[np.float_]:
+    return np.zeros((len(load_protocol("human")), 3))
+
+
+@attrs.define
+class AfidSetAccumulator:
+    """Streaming accumulator of the mean and variance of AFID spatial
+    coordinates, using Welford's online algorithm.
+
+    ``AfidSet`` objects (or paths to AFID files) can be provided one at a
+    time, so memory use is independent of the number of sets. Accumulators
+    built in parallel can be combined with ``merge``.
+
+    Parameters
+    ----------
+    coord_system
+        Coordinate system of accumulated AFIDs. If none provided, the
+        coordinate system of the first ``AfidSet`` is used
+    """
+
+    coord_system: str | None = attrs.field(default=None)
+    count: int = attrs.field(default=0, init=False)
+    _mean: NDArray[np.float_] = attrs.field(
+        factory=_zero_coords, init=False, eq=attrs.cmp_using(eq=np.array_equal)
+    )
+    _m2: NDArray[np.float_] = attrs.field(
+        factory=_zero_coords, init=False, eq=attrs.cmp_using(eq=np.array_equal)
+    )
+
+    def _check_coord_system(self, coord_system: str) -> None:
+        if self.coord_system is None:
+            self.coord_system = coord_system
+        elif coord_system != self.coord_system:
+            raise ValueError("Mismatched coordinate system in AfidSet")
+
+    def update(self, afid_set: AfidSet | PathLike[str] | str) -> None:
+        """Add a single ``AfidSet`` to the accumulator
+
+        Parameters
+        ----------
+        afid_set
+            ``AfidSet`` object, or path to an AFIDs file to load, to add
+
+        Raises
+        ------
+        ValueError
+            If coordinate system of ``AfidSet`` does not match the
+            accumulator
+        """
+        if not isinstance(afid_set, AfidSet):
+            afid_set = AfidSet.load(afid_set)
+        self._check_coord_system(afid_set.coord_system)
+
+        self.count += 1
+        delta = afid_set.coords - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (afid_set.coords - self._mean)
+
+    def update_many(
+        self,
+        afid_sets: Iterable[AfidSet | PathLike[str] | str] | AfidCohort,
+    ) -> None:
+        """Add a collection of ``AfidSet`` objects to the accumulator
+
+        Parameters
+        ----------
+        afid_sets
+            Iterable (e.g. generator) of ``AfidSet`` objects or paths to
+            AFIDs files to add. If an ``AfidCohort`` is provided, it is
+            accumulated in a single vectorized step
+
+        Raises
+        ------
+        ValueError
+            If coordinate system of any ``AfidSet`` does not match the
+            accumulator
+        """
+        if not isinstance(afid_sets, AfidCohort):
+            for afid_set in afid_sets:
+                self.update(afid_set)
+            return
+
+        if not len(afid_sets):
+            return
+        for coord_system in np.unique(afid_sets.coord_systems):
+            self._check_coord_system(str(coord_system))
+
+        batch = AfidSetAccumulator(coord_system=self.coord_system)
+        batch.count = len(afid_sets)
+        batch._mean = afid_sets.coords.mean(axis=0)
+        batch._m2 = np.sum(np.square(afid_sets.coords - batch._mean), axis=0)
+        self._combine(batch)
+
+    def _combine(self, other: AfidSetAccumulator) -> None:
+        """Internal function to combine statistics of another accumulator
+        into this one (Chan et al. parallel algorithm)"""
+        if not other.count:
+            return
+
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean = self._mean + delta * (other.count / count)
+        self._m2 = (
+            self._m2
+            + other._m2
+            + np.square(delta) * (self.count * other.count / count)
+        )
+        self.count = count
+
+    def merge(self, other: AfidSetAccumulator) -> AfidSetAccumulator:
+        """Combine with another accumulator (e.g. from a parallel worker)
+
+        Parameters
+        ----------
+        other
+            Accumulator to combine with
+
+        Returns
+        -------
+        AfidSetAccumulator
+            New accumulator containing the statistics of both accumulators
+
+        Raises
+        ------
+        ValueError
+            If coordinate systems of accumulators are mismatched
+        """
+        merged = AfidSetAccumulator(coord_system=self.coord_system)
+        merged._combine(self)
+        if other.coord_system is not None and other.count:
+            merged._check_coord_system(other.coord_system)
+        merged._combine(other)
+
+        return merged
+
+    def mean_afid_set(self) -> AfidSet:
+        """Mean position of each accumulated AFID
+
+        Returns
+        -------
+        AfidSet
+            Object containing mean spatial components for each AFID
+
+        Raises
+        ------
+        ValueError
+            If no ``AfidSet`` has been accumulated
+        """
+        if not self.count or self.coord_system is None:
+            raise ValueError("No AfidSet accumulated to compute mean from")
+
+        return AfidSet._from_coords(
+            slicer_version="Unknown",
+            coord_system=self.coord_system,
+            coords=self._mean.copy(),
         )
-        for idx in range(len(afid_distance_sets[0].afids))
-    ]
 
-    return mean_component
+    def variance(self, ddof: int = 1) -> NDArray[np.float_]:
+        """Variance of each accumulated AFID along each spatial component
+
+        Parameters
+        ----------
+        ddof
+            Delta degrees of freedom (default: 1, sample variance)
+
+        Returns
+        -------
+        NDArray[np.float_]
+            Array of shape (32, 3) containing the variance (in mm^2)
+
+        Raises
+        ------
+        ValueError
+            If not enough ``AfidSet`` objects have been accumulated
+        """
+        if self.count <= ddof:
+            raise ValueError(
+                f"At least {ddof + 1} AfidSet required to compute variance"
+            )
+
+        return self._m2 / (self.count - ddof)
+
+    def dispersion(self, ddof: int = 1) -> AfidDispersion:
+        """Summarize the spread of each accumulated AFID about its mean
+
+        Parameters
+        ----------
+        ddof
+            Delta degrees of freedom (default: 1, sample variance)
+
+        Returns
+        -------
+        AfidDispersion
+            Object containing the per-component and radial standard
+            deviation of each AFID
+        """
+        variance = self.variance(ddof=ddof)
+
+        return AfidDispersion(
+            count=self.count,
+            std=np.sqrt(variance),
+            radial_std=np.sqrt(variance.sum(axis=-1)),
+        )
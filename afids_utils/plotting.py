@@ -1,19 +1,23 @@
 """Methods for plotting anatomical fiducials"""
 from __future__ import annotations
 
+from functools import lru_cache
 from importlib import resources
+from typing import TYPE_CHECKING, Any
 
-import nibabel as nib
-import nilearn.plotting as niplot
 import numpy as np
-import plotly.graph_objects as go
-from matplotlib.colors import LinearSegmentedColormap
-from nilearn.plotting.displays._projectors import LYRZProjector
 from numpy.typing import NDArray
-from plotly.graph_objs._figure import Figure as goFigure
 
 from afids_utils.afids import AfidPosition, AfidSet, AfidVoxel
-from afids_utils.transforms import world_to_voxel
+from afids_utils.transforms import voxels_in_bounds, world_to_voxel_batch
+
+# Plotting stacks are slow to import, so are only imported on first use
+if TYPE_CHECKING:
+    import nibabel as nib
+    import nilearn.plotting as niplot
+    from matplotlib.colors import LinearSegmentedColormap
+    from nilearn.plotting.displays._projectors import LYRZProjector
+    from plotly.graph_objs._figure import Figure as goFigure
 
 # Matplotlib colormap object with 32-discrete colors
 COLORS: list[str] = [
@@ -50,9 +54,23 @@ COLORS: list[str] = [
     "#FFB6C1",  # Light Pink
     "#9932CC",  # Dark Orchid
 ]
-CMAP = LinearSegmentedColormap.from_list(  # pyright: ignore
-    name="afids_cmap", colors=COLORS, N=len(COLORS)
-)
+
+
+@lru_cache(maxsize=None)
+def _afids_cmap() -> LinearSegmentedColormap:
+    """Internal function to create the matplotlib colormap of AFIDs"""
+    from matplotlib.colors import LinearSegmentedColormap
+
+    return LinearSegmentedColormap.from_list(  # pyright: ignore
+        name="afids_cmap", colors=COLORS, N=len(COLORS)
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # Colormap is only created on first access (see ``_afids_cmap``)
+    if name == "CMAP":
+        return _afids_cmap()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _create_afid_nii(
@@ -72,13 +90,35 @@ def _create_afid_nii(
     -------
     nib.nifti1.Nifti1Image
         3D nifti image object associated with afid positions
+
+    Raises
+    ------
+    ValueError
+        If any voxel indices lie outside of the nifti image
     """
+    import nibabel as nib
+
+    # Check all indices lie within image (negative indices would wrap)
+    voxel_pos = np.array(
+        [[afid.i, afid.j, afid.k] for afid in afid_voxels], dtype=int
+    ).reshape(-1, 3)
+    nii_shape: tuple[int, int, int] = afid_nii.shape  # pyright: ignore
+    in_bounds = voxels_in_bounds(voxel_pos, nii_shape)
+    if not np.all(in_bounds):
+        invalid_labels = [
+            afid.label
+            for afid, valid in zip(afid_voxels, in_bounds.tolist())
+            if not valid
+        ]
+        raise ValueError(
+            f"AFID voxel indices outside of image for labels: {invalid_labels}"
+        )
+
     # Initialize empty image with zeros
-    afid_img = np.zeros(afid_nii.shape, dtype=int)
+    afid_img = np.zeros(nii_shape, dtype=int)
 
-    # Update image with label values in associatd indices
-    for afid in afid_voxels:
-        afid_img[afid.i, afid.j, afid.k] = afid.label
+    # Update image with label values in associated indices
+    afid_img[tuple(voxel_pos.T)] = [afid.label for afid in afid_voxels]
 
     affine: NDArray[np.float_] = afid_nii.affine  # pyright: ignore
     header: nib.nifti1.Nifti1Header = afid_nii.header
@@ -103,14 +143,14 @@ def _create_connectome_plot(
     LYRZProjector
         Afids overlaid on a glass connectome
     """
+    import nilearn.plotting as niplot
+
     # Get AFID coordinates in MNI
     with resources.open_text(
         "afids_utils.resources", "template.fcsv"
     ) as fcsv_fname:
         template_afid_set = AfidSet.load(fcsv_fname.name)
-    template_coords: list[list[float]] = [
-        [afid.x, afid.y, afid.z] for afid in template_afid_set.afids
-    ]
+    template_coords: list[list[float]] = template_afid_set.coords.tolist()
 
     # Plot connectome
     view: LYRZProjector = niplot.plot_markers(  # pyright: ignore
@@ -187,6 +227,8 @@ def _create_histogram_plot(
         Figure object created with Plotly, demonstrating the histogram
         of distances
     """
+    import plotly.graph_objects as go
+
     # If labels not provided, use index
     if not afid_labels:
         afid_labels = [f"{idx+1}" for idx in range(len(afid_distances))]
@@ -242,6 +284,8 @@ def _create_scatter_plot(
         Figure object created with Plotly, demonstrating the distances as a
         scatter plot
     """
+    import plotly.graph_objects as go
+
     # If labels not provided, use index
     if not afid_labels:
         afid_labels = [f"{idx+1}" for idx in range(len(afid_distances))]
@@ -300,19 +344,30 @@ def plot_ortho(
     niplot.html_stat_map.StatMapView
         View object with fiducials overlaid on provided background nifti image
     """
+    import nilearn.plotting as niplot
 
     # If single position provided, set to list
     if isinstance(afids, (AfidVoxel, AfidPosition)):
         afids = [afids]  # pyright: ignore
 
-    # If list[AfidPosition], convert to list[AfidVoxel]
+    # If list[AfidPosition], convert to list[AfidVoxel] in a single transform
     nii_affine: NDArray[np.float_] = afid_nii.affine  # pyright: ignore
-    afid_voxels: list[AfidVoxel] = [
-        world_to_voxel(afid_world=afid, nii_affine=nii_affine)
-        if isinstance(afid, AfidPosition)
-        else afid
-        for afid in afids  # pyright: ignore
-    ]
+    afid_coords = np.array(
+        [
+            [afid.x, afid.y, afid.z]
+            for afid in afids  # pyright: ignore
+            if isinstance(afid, AfidPosition)
+        ]
+    ).reshape(-1, 3)
+    voxel_pos = iter(
+        world_to_voxel_batch(afid_coords, nii_affine=nii_affine).tolist()
+    )
+    afid_voxels: list[AfidVoxel] = []
+    for afid in afids:  # pyright: ignore
+        if isinstance(afid, AfidPosition):
+            i, j, k = next(voxel_pos)
+            afid = AfidVoxel(label=afid.label, i=i, j=j, k=k, desc=afid.desc)
+        afid_voxels.append(afid)  # pyright: ignore
 
     # Create temporary overlay image
     afid_img = _create_afid_nii(afid_voxels=afid_voxels, afid_nii=afid_nii)
@@ -321,7 +376,7 @@ def plot_ortho(
     view = niplot.view_img(  # pyright: ignore
         stat_map_img=afid_img,
         bg_img=afid_nii,  # pyright: ignore
-        cmap=CMAP,
+        cmap=_afids_cmap(),
         symmetric_cmap=False,
         opacity=opacity,  # pyright: ignore
     )
@@ -0,0 +1,163 @@
+"""Packaged resources, each parsed once into immutable structures"""
+from __future__ import annotations
+
+import csv
+import json
+from functools import lru_cache
+from importlib import resources
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple
+
+
+class ProtocolAfid(NamedTuple):
+    """Description and acronym of a single AFID in a protocol"""
+
+    desc: str
+    acronym: str
+
+
+class ProtocolIndex(NamedTuple):
+    """Lookup tables over the AFIDs of a protocol
+
+    Parameters
+    ----------
+    descs
+        Accepted descriptions (description or acronym) of each AFID,
+        indexed by label - 1
+
+    labels
+        Label of each AFID, keyed by both its description and acronym
+    """
+
+    descs: tuple[frozenset[str], ...]
+    labels: Mapping[str, int]
+
+
+class FcsvTemplate(NamedTuple):
+    """Pre-parsed Slicer .fcsv template
+
+    Parameters
+    ----------
+    header
+        Header lines (including line endings) preceding the AFID rows
+
+    rows
+        Fields of each AFID row, ordered by label
+    """
+
+    header: tuple[str, ...]
+    rows: tuple[tuple[str, ...], ...]
+
+
+class JsonTemplate(NamedTuple):
+    """Pre-parsed Slicer markups .json template
+
+    Parameters
+    ----------
+    root
+        Top-level fields of the markups file ("markups" to be replaced)
+
+    markup
+        Fields of the fiducial markups node ("controlPoints" to be replaced)
+
+    control_points
+        Fields of each control point, ordered by label
+    """
+
+    root: Mapping[str, Any]
+    markup: Mapping[str, Any]
+    control_points: tuple[Mapping[str, Any], ...]
+
+
+@lru_cache(maxsize=None)
+def load_protocol(species: str = "human") -> tuple[ProtocolAfid, ...]:
+    """Load the description and acronym of each AFID in a protocol
+
+    Parameters
+    ----------
+    species
+        Protocol to load (default: "human")
+
+    Returns
+    -------
+    tuple[ProtocolAfid, ...]
+        Description and acronym of each AFID, indexed by label - 1
+    """
+    with resources.open_text(__name__, "afids_descs.json") as json_fpath:
+        mappings = json.load(json_fpath)
+
+    return tuple(
+        ProtocolAfid(desc=afid["desc"], acronym=afid["acronym"])
+        for afid in mappings[species]
+    )
+
+
+@lru_cache(maxsize=None)
+def load_protocol_index(species: str = "human") -> ProtocolIndex:
+    """Build lookup tables over the AFIDs of a protocol
+
+    Parameters
+    ----------
+    species
+        Protocol to index (default: "human")
+
+    Returns
+    -------
+    ProtocolIndex
+        Accepted descriptions of each label, and label of each description
+        and acronym
+    """
+    protocol = load_protocol(species)
+
+    return ProtocolIndex(
+        descs=tuple(frozenset(afid) for afid in protocol),
+        labels=MappingProxyType(
+            {
+                name: label
+                for label, afid in enumerate(protocol, start=1)
+                for name in afid
+            }
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_fcsv_template() -> FcsvTemplate:
+    """Load the Slicer .fcsv template used when saving AFIDs
+
+    Returns
+    -------
+    FcsvTemplate
+        Header lines and row fields of the template
+    """
+    with resources.open_text(__name__, "template.fcsv") as template_file:
+        lines = template_file.readlines()
+
+    header = tuple(line for line in lines if line.startswith("#"))
+    rows = tuple(tuple(row) for row in csv.reader(lines[len(header) :]) if row)
+
+    return FcsvTemplate(header=header, rows=rows)
+
+
+@lru_cache(maxsize=None)
+def load_json_template() -> JsonTemplate:
+    """Load the Slicer markups .json template used when saving AFIDs
+
+    Returns
+    -------
+    JsonTemplate
+        Top-level, markups node and control point fields of the template
+    """
+    with resources.open_text(__name__, "template.json") as template_file:
+        template_content = json.load(template_file)
+
+    markup = template_content["markups"][0]
+    control_points = markup["controlPoints"]
+
+    return JsonTemplate(
+        root=MappingProxyType(template_content),
+        markup=MappingProxyType(markup),
+        control_points=tuple(
+            MappingProxyType(control_point) for control_point in control_points
+        ),
+    )
@@ -11,7 +11,7 @@ from hypothesis import strategies as st
 from hypothesis.extra.numpy import arrays  # type: ignore
 from numpy.typing import NDArray
 
-from afids_utils.afids import AfidPosition, AfidSet, AfidVoxel
+from afids_utils.afids import AfidCohort, AfidPosition, AfidSet, AfidVoxel
 
 with resources.open_text(
     "afids_utils.resources", "afids_descs.json"
@@ -169,6 +169,41 @@ def afid_sets(
     return st_afid_set
 
 
+@st.composite
+def afid_cohorts(
+    draw: st.DrawFn,
+    min_size: int = 1,
+    max_size: int = 5,
+    randomize_header: bool = True,
+) -> AfidCohort:
+    num_subjects = draw(st.integers(min_value=min_size, max_value=max_size))
+    coords = draw(
+        arrays(  # type: ignore
+            shape=(num_subjects, 32, 3),
+            dtype=np.float_,
+            elements=st.floats(min_value=-50.0, max_value=50.0, width=16),
+        )
+    )
+    coord_systems = (
+        draw(
+            st.lists(
+                st.sampled_from(["RAS", "LPS"]),
+                min_size=num_subjects,
+                max_size=num_subjects,
+            )
+        )
+        if randomize_header
+        else ["RAS"] * num_subjects
+    )
+    subject_ids = [f"sub-{idx:03d}" for idx in range(num_subjects)]
+
+    return AfidCohort(
+        coords=coords,  # pyright: ignore
+        coord_systems=coord_systems,
+        subject_ids=subject_ids,
+    )
+
+
 @st.composite
 def affine_xfms(
     draw: st.DrawFn,
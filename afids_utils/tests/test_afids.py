@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import bz2
+import gzip
+import io
 import json
+import lzma
+import pickle
 import re
+import subprocess
+import sys
 import tempfile
 from importlib import resources
 from pathlib import Path
 
+import attrs
+import numpy as np
 import pytest
 from hypothesis import assume, example, given
 from hypothesis import strategies as st
@@ -13,10 +22,12 @@ from more_itertools import pairwise
 
 import afids_utils.tests.strategies as af_st
 from afids_utils.afids import (
+    AfidCohort,
     AfidDistance,
     AfidDistanceSet,
     AfidPosition,
     AfidSet,
+    scan_metadata,
 )
 from afids_utils.exceptions import InvalidFiducialError, InvalidFileError
 from afids_utils.tests.helpers import allow_function_scoped, slow_generation
@@ -95,6 +106,20 @@ class TestAfidSet:
         for first, second in pairwise(afid_set.afids):
             assert first.label <= second.label
 
+    @given(afid_set=af_st.afid_sets(randomize_header=False))
+    @slow_generation
+    def test_evolve_asdict(self, afid_set: AfidSet):
+        evolved = attrs.evolve(afid_set, coord_system="LPS")
+        assert evolved.coord_system == "LPS"
+        assert np.array_equal(evolved.coords, afid_set.coords)
+        assert attrs.evolve(afid_set) == afid_set
+
+        assert attrs.asdict(afid_set) == {
+            "slicer_version": afid_set.slicer_version,
+            "coord_system": afid_set.coord_system,
+            "afids": [attrs.asdict(afid) for afid in afid_set.afids],
+        }
+
     @given(
         slicer_version=st.from_regex(r"\d\.\d+"),
         coord_system=st.sampled_from(["RAS", "LPS", "0", "1"]),
@@ -314,6 +339,182 @@ class TestAfidsIO:
                     assert parsed_coord == "1"
 
 
+class TestAfidsStreamIO:
+    @pytest.mark.parametrize("ext", ["fcsv", "json"])
+    @pytest.mark.parametrize("source", ["bytes", "binary", "text"])
+    def test_load_in_memory(self, valid_file: Path, ext: str, source: str):
+        afids_fpath = valid_file.with_suffix(f".{ext}")
+        contents = afids_fpath.read_bytes()
+        afids_source = {
+            "bytes": contents,
+            "binary": io.BytesIO(contents),
+            "text": io.StringIO(contents.decode("utf-8")),
+        }[source]
+
+        assert AfidSet.load(afids_source, format=ext) == AfidSet.load(
+            afids_fpath
+        )
+
+    def test_load_missing_format(self, valid_file: Path):
+        with pytest.raises(ValueError, match="File format must be provided.*"):
+            AfidSet.load(valid_file.read_bytes())
+
+    def test_load_invalid_format(self, valid_file: Path):
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            AfidSet.load(valid_file.read_bytes(), format="txt")
+
+    @given(
+        afid_set=af_st.afid_sets(randomize_header=False),
+        ext=st.sampled_from(["fcsv", "json"]),
+    )
+    def test_save_stream(self, afid_set: AfidSet, ext: str):
+        coord_system = afid_set.coord_system
+        with tempfile.NamedTemporaryFile(
+            mode="w", prefix="sub-test_desc-", suffix=f"_afids.{ext}"
+        ) as out_file:
+            afid_set.save(out_file.name)
+            with open(out_file.name, "rb") as in_file:
+                expected = in_file.read()
+
+        # Check streams contain the same contents as the saved file
+        binary_stream = io.BytesIO()
+        afid_set.save(binary_stream, format=ext)
+        assert binary_stream.getvalue() == expected
+
+        text_stream = io.StringIO(newline="")
+        afid_set.save(text_stream, format=ext)
+        assert text_stream.getvalue().encode("utf-8") == expected
+
+        loaded = AfidSet.load(binary_stream.getvalue(), format=ext)
+        assert loaded.coord_system == coord_system
+        assert np.array_equal(loaded.coords, afid_set.coords)
+
+    @given(afid_set=af_st.afid_sets())
+    def test_save_stream_missing_format(self, afid_set: AfidSet):
+        with pytest.raises(ValueError, match="File format must be provided.*"):
+            afid_set.save(io.BytesIO())
+
+
+class TestAfidsCompressedIO:
+    @given(
+        afid_set=af_st.afid_sets(randomize_header=False),
+        ext=st.sampled_from(["fcsv", "json"]),
+        compression=st.sampled_from(["gz", "bz2", "xz"]),
+        compresslevel=st.one_of(
+            st.none(), st.integers(min_value=1, max_value=9)
+        ),
+    )
+    def test_compressed_round_trip(
+        self,
+        afid_set: AfidSet,
+        ext: str,
+        compression: str,
+        compresslevel: int | None,
+    ):
+        coord_system = afid_set.coord_system
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fpath = Path(out_dir) / f"sub-test_afids.{ext}.{compression}"
+            afid_set.save(out_fpath, compresslevel=compresslevel)
+
+            # Check file is compressed and contents match uncompressed file
+            uncompressed_fpath = Path(out_dir) / f"sub-test_afids.{ext}"
+            afid_set.save(uncompressed_fpath)
+            opener = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+            with opener[compression](out_fpath) as in_file:
+                assert in_file.read() == uncompressed_fpath.read_bytes()
+
+            loaded = AfidSet.load(out_fpath)
+
+        assert loaded.coord_system == coord_system
+        assert np.array_equal(loaded.coords, afid_set.coords)
+
+    @pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+    def test_compressed_invalid_ext(self, valid_file: Path, compression: str):
+        afid_set = AfidSet.load(valid_file)
+        with tempfile.TemporaryDirectory() as out_dir:
+            with pytest.raises(ValueError, match="Unsupported file extension"):
+                afid_set.save(Path(out_dir) / f"sub-test_afids.{compression}")
+
+
+class TestAfidsLazyIO:
+    @pytest.mark.parametrize("ext", ["fcsv", "json"])
+    def test_scan_metadata(self, valid_file: Path, ext: str):
+        afids_fpath = valid_file.with_suffix(f".{ext}")
+        afid_set = AfidSet.load(afids_fpath)
+
+        assert scan_metadata(afids_fpath) == (
+            afid_set.slicer_version,
+            afid_set.coord_system,
+        )
+
+    def test_scan_metadata_missing(self):
+        with pytest.raises(FileNotFoundError):
+            scan_metadata("/invalid/afids/path.fcsv")
+
+    @pytest.mark.parametrize("ext", ["fcsv", "json"])
+    def test_load_lazy(self, valid_file: Path, ext: str):
+        afids_fpath = valid_file.with_suffix(f".{ext}")
+        afid_set = AfidSet.load(afids_fpath)
+        lazy_afid_set = AfidSet.load_lazy(afids_fpath)
+
+        # Check only metadata is read until AFIDs are accessed
+        assert afid_set.is_loaded
+        assert not lazy_afid_set.is_loaded
+        assert lazy_afid_set.coord_system == afid_set.coord_system
+        assert lazy_afid_set.slicer_version == afid_set.slicer_version
+        assert np.array_equal(lazy_afid_set.coords, afid_set.coords)
+        assert lazy_afid_set.is_loaded
+        assert lazy_afid_set.afids == afid_set.afids
+
+    def test_load_lazy_matches_load(self, valid_file: Path):
+        afid_set = AfidSet.load(valid_file)
+
+        # Unloaded sets stay lazy when copied, until compared
+        unpickled = pickle.loads(pickle.dumps(AfidSet.load_lazy(valid_file)))
+        assert not unpickled.is_loaded
+        assert unpickled == afid_set
+        assert AfidSet.load_lazy(valid_file.read_bytes(), "fcsv") == afid_set
+        assert attrs.evolve(AfidSet.load_lazy(valid_file)) == afid_set
+
+    def test_load_lazy_stream(self, valid_file: Path):
+        with open(valid_file, "rb") as in_file:
+            with pytest.raises(ValueError, match="Lazy loading requires.*"):
+                AfidSet.load_lazy(in_file, format="fcsv")  # pyright: ignore
+
+
+class TestAfidsLoadMany:
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_load_many_ordered(self, valid_file: Path, executor: str):
+        afids_fpaths = [
+            valid_file.with_suffix(f".{ext}") for ext in ["fcsv", "json"] * 3
+        ]
+        afid_sets = AfidSet.load_many(
+            afids_fpaths, workers=2, executor=executor
+        )
+
+        assert afid_sets == [
+            AfidSet.load(afids_fpath) for afids_fpath in afids_fpaths
+        ]
+
+    def test_iter_load_many(self, valid_file: Path):
+        afids_fpaths = [
+            valid_file.with_suffix(f".{ext}") for ext in ["fcsv", "json"]
+        ]
+        loaded = dict(AfidSet.iter_load_many(afids_fpaths, workers=2))
+
+        assert set(loaded) == set(afids_fpaths)
+        for afids_fpath, afid_set in loaded.items():
+            assert afid_set == AfidSet.load(afids_fpath)
+
+    def test_load_many_invalid_fpath(self, valid_file: Path):
+        with pytest.raises(FileNotFoundError, match=".*does not exist"):
+            AfidSet.load_many([valid_file, "invalid/fpath.fcsv"])
+
+    def test_invalid_executor(self, valid_file: Path):
+        with pytest.raises(ValueError, match="Unsupported executor.*"):
+            AfidSet.load_many([valid_file], executor="invalid")
+
+
 class TestAfidsCore:
     @given(label=af_st.valid_labels())
     @allow_function_scoped
@@ -333,6 +534,210 @@ class TestAfidsCore:
         with pytest.raises(InvalidFiducialError, match=".*not valid"):
             afid_set.get_afid(label)
 
+    @given(label=af_st.valid_labels(), use_acronym=st.booleans())
+    @allow_function_scoped
+    def test_get_afid_by_desc(
+        self,
+        valid_file: Path,
+        human_mappings: list[dict[str, str]],
+        label: int,
+        use_acronym: bool,
+    ):
+        afid_set = AfidSet.load(valid_file)
+        desc = human_mappings[label - 1]["acronym" if use_acronym else "desc"]
+
+        assert afid_set.get_afid(desc) == afid_set.get_afid(label)
+
+    @given(desc=st.text())
+    @allow_function_scoped
+    def test_invalid_get_afid_by_desc(
+        self,
+        valid_file: Path,
+        human_mappings: list[dict[str, str]],
+        desc: str,
+    ):
+        assume(
+            desc
+            not in {
+                name for mapping in human_mappings for name in mapping.values()
+            }
+        )
+        afid_set = AfidSet.load(valid_file)
+
+        with pytest.raises(InvalidFiducialError, match=".*not valid"):
+            afid_set.get_afid(desc)
+
+
+class TestAfidSetCoords:
+    @given(afid_set=af_st.afid_sets())
+    def test_coords_view(self, afid_set: AfidSet):
+        coords = afid_set.coords
+
+        assert coords.shape == (32, 3)
+        assert coords.dtype == np.float_
+        assert coords.flags.c_contiguous
+        # Check view is read-only
+        assert not coords.flags.writeable
+        with pytest.raises(ValueError, match=".*read-only"):
+            coords[0, 0] = 0.0
+
+    @given(afid_set=af_st.afid_sets())
+    def test_coords_match_afids(self, afid_set: AfidSet):
+        for afid, coord in zip(afid_set.afids, afid_set.coords):
+            assert (afid.x, afid.y, afid.z) == tuple(coord)
+
+    @given(afid_set=af_st.afid_sets(), label=af_st.valid_labels())
+    def test_get_afid_matches_coords(self, afid_set: AfidSet, label: int):
+        afid_pos = afid_set.get_afid(label)
+
+        assert afid_pos.label == label
+        assert (afid_pos.x, afid_pos.y, afid_pos.z) == tuple(
+            afid_set.coords[label - 1]
+        )
+
+
+class TestAfidSetFromArray:
+    @given(
+        afid_set=af_st.afid_sets(),
+        validate=st.sampled_from(["full", "fast", "none"]),
+    )
+    def test_round_trip_coords(self, afid_set: AfidSet, validate: str):
+        new_afid_set = AfidSet.from_array(
+            afid_set.coords.copy(),
+            coord_system=afid_set.coord_system,
+            slicer_version=afid_set.slicer_version,
+            validate=validate,
+        )
+
+        assert new_afid_set == afid_set
+
+    @given(
+        afid_set=af_st.afid_sets(),
+        labels=st.permutations(list(range(1, 33))),
+        validate=st.sampled_from(["full", "fast", "none"]),
+    )
+    def test_unordered_labels(
+        self, afid_set: AfidSet, labels: list[int], validate: str
+    ):
+        shuffled_coords = afid_set.coords[np.asarray(labels) - 1]
+        new_afid_set = AfidSet.from_array(
+            shuffled_coords,
+            coord_system=afid_set.coord_system,
+            slicer_version=afid_set.slicer_version,
+            labels=labels,
+            validate=validate,
+        )
+
+        assert new_afid_set == afid_set
+
+    @given(
+        num_afids=st.integers(min_value=1, max_value=40).filter(
+            lambda num_afids: num_afids != 32
+        ),
+        validate=st.sampled_from(["full", "fast"]),
+    )
+    def test_invalid_shape(self, num_afids: int, validate: str):
+        with pytest.raises(ValueError, match=r"Incorrect shape.*"):
+            AfidSet.from_array(
+                np.zeros((num_afids, 3)), coord_system="RAS", validate=validate
+            )
+
+    @given(positions=af_st.position_lists(unique=False))
+    @slow_generation
+    def test_repeated_labels(self, positions: list[AfidPosition]):
+        with pytest.raises(ValueError, match=r".*incorrect labels.*"):
+            AfidSet.from_array(
+                np.zeros((32, 3)),
+                coord_system="RAS",
+                labels=[afid.label for afid in positions],
+                validate="fast",
+            )
+
+    def test_fast_no_copy(self):
+        coords = np.zeros((32, 3))
+        afid_set = AfidSet.from_array(
+            coords, coord_system="RAS", validate="fast"
+        )
+
+        assert np.shares_memory(afid_set.coords, coords)
+
+    def test_invalid_validate(self):
+        with pytest.raises(ValueError, match=r"Unsupported validation.*"):
+            AfidSet.from_array(
+                np.zeros((32, 3)), coord_system="RAS", validate="invalid"
+            )
+
+
+class TestAfidCohort:
+    @given(
+        afid_sets=st.lists(
+            # Metadata ending in a null character is rejected by cohorts
+            af_st.afid_sets().filter(
+                lambda afid_set: not afid_set.slicer_version.endswith("\x00")
+            ),
+            min_size=1,
+            max_size=5,
+        )
+    )
+    @slow_generation
+    def test_round_trip_afid_sets(self, afid_sets: list[AfidSet]):
+        cohort = AfidCohort.from_afid_sets(afid_sets)
+
+        assert cohort.coords.shape == (len(afid_sets), 32, 3)
+        assert len(cohort) == len(afid_sets)
+        assert cohort.to_afid_sets() == afid_sets
+
+    @given(cohort=af_st.afid_cohorts())
+    def test_index_returns_view(self, cohort: AfidCohort):
+        afid_set = cohort[0]
+
+        assert isinstance(afid_set, AfidSet)
+        assert afid_set.coord_system == cohort.coord_systems[0]
+        assert np.shares_memory(afid_set.coords, cohort.coords)
+
+    @given(cohort=af_st.afid_cohorts(min_size=2))
+    def test_slice_returns_view(self, cohort: AfidCohort):
+        sub_cohort = cohort[1:]
+
+        assert isinstance(sub_cohort, AfidCohort)
+        assert len(sub_cohort) == len(cohort) - 1
+        assert list(sub_cohort.subject_ids) == list(cohort.subject_ids[1:])
+        assert np.shares_memory(sub_cohort.coords, cohort.coords)
+
+    @given(
+        num_subjects=st.integers(min_value=1, max_value=5),
+        num_afids=st.integers(min_value=0, max_value=40).filter(
+            lambda num_afids: num_afids != 32
+        ),
+    )
+    def test_invalid_coords_shape(self, num_subjects: int, num_afids: int):
+        with pytest.raises(ValueError, match=r"Incorrect shape.*"):
+            AfidCohort(
+                coords=np.zeros((num_subjects, num_afids, 3)),
+                coord_systems=["RAS"] * num_subjects,
+            )
+
+    @given(cohort=af_st.afid_cohorts())
+    def test_null_terminated_metadata(self, cohort: AfidCohort):
+        with pytest.raises(ValueError, match=r".*null character"):
+            AfidCohort(
+                coords=cohort.coords,
+                coord_systems=cohort.coord_systems,
+                slicer_versions=[
+                    f"{slicer_version}\x00"
+                    for slicer_version in cohort.slicer_versions.tolist()
+                ],
+            )
+
+    @given(cohort=af_st.afid_cohorts())
+    def test_mismatched_metadata(self, cohort: AfidCohort):
+        with pytest.raises(ValueError, match=r"Incorrect number of subject.*"):
+            AfidCohort(
+                coords=cohort.coords,
+                coord_systems=cohort.coord_systems,
+                subject_ids=[*cohort.subject_ids, "extra"],
+            )
+
 
 class TestAfidsDistance:
     @given(
@@ -426,3 +831,29 @@ class TestAfidsDistanceSet:
 
         with pytest.raises(ValueError, match=r"Mismatched coord.*"):
             AfidDistanceSet(afid_set1, afid_set2).afids
+
+
+class TestImportBudget:
+    def test_no_plotting_imports(self):
+        # Fresh interpreter, as plotting stacks may already be imported by
+        # other tests
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; import afids_utils.afids; "
+                "from afids_utils.resources import load_protocol; "
+                "print(*(mod.split('.')[0] for mod in sys.modules)); "
+                "print(load_protocol.cache_info().currsize)",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        modules, num_protocols = result.stdout.splitlines()
+
+        assert not {"matplotlib", "nibabel", "nilearn", "plotly"} & set(
+            modules.split()
+        )
+        # Protocol is only parsed on first use
+        assert num_protocols == "0"
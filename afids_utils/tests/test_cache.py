@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import NoReturn
+
+import pytest
+
+from afids_utils import afids as af_afids
+from afids_utils.afids import AfidSet
+from afids_utils.cache import ParseCache
+
+
+@pytest.fixture
+def afids_files(tmp_path: Path) -> list[Path]:
+    data_dir = Path(__file__).parent / "data"
+    afids_files: list[Path] = []
+    for idx, ext in enumerate(["fcsv", "json"] * 2):
+        afids_file = tmp_path / "data" / f"sub-{idx:02d}_afids.{ext}"
+        afids_file.parent.mkdir(exist_ok=True)
+        shutil.copy(
+            data_dir / f"tpl-MNI152NLin2009cAsym_afids.{ext}", afids_file
+        )
+        afids_files.append(afids_file)
+    return afids_files
+
+
+class TestParseCache:
+    @pytest.mark.parametrize("key", ["stat", "hash"])
+    def test_cache_hits(
+        self,
+        tmp_path: Path,
+        afids_files: list[Path],
+        key: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        cache = ParseCache(tmp_path / "cache", key=key)
+
+        # Cold run parses and stores every file (apart from duplicate
+        # contents when keyed by hash)
+        expected = AfidSet.load_many(afids_files, workers=1, cache=cache)
+        assert cache.hits + cache.misses == len(afids_files)
+        cold_hits, cold_misses = cache.hits, cache.misses
+
+        # Warm run skips parsing completely
+        def _fail(*args: object, **kwargs: object) -> NoReturn:
+            raise AssertionError("File parsed despite being cached")
+
+        monkeypatch.setattr(AfidSet, "_from_labelled_arrays", _fail)
+        assert (
+            AfidSet.load_many(afids_files, workers=1, cache=cache) == expected
+        )
+        assert (cache.hits, cache.misses) == (
+            cold_hits + len(afids_files),
+            cold_misses,
+        )
+
+    def test_changed_file(self, tmp_path: Path, afids_files: list[Path]):
+        cache = ParseCache(tmp_path / "cache")
+        afid_set = AfidSet.load(afids_files[0], cache=cache)
+
+        # Modifying file invalidates its cache entry
+        stat = afids_files[0].stat()
+        os.utime(
+            afids_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+        )
+        assert AfidSet.load(afids_files[0], cache=cache) == afid_set
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_hash_key_shared_contents(
+        self, tmp_path: Path, afids_files: list[Path]
+    ):
+        cache = ParseCache(tmp_path / "cache", key="hash")
+        AfidSet.load(afids_files[0], cache=cache)
+
+        # Files with identical contents share a cache entry
+        AfidSet.load(afids_files[2], cache=cache)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_eviction(self, tmp_path: Path, afids_files: list[Path]):
+        cache = ParseCache(tmp_path / "cache")
+        for afids_file in afids_files:
+            AfidSet.load(afids_file, cache=cache)
+        entry_sizes = sorted(
+            entry.stat().st_size for entry in (tmp_path / "cache").iterdir()
+        )
+        cache.clear()
+
+        # Entries are evicted once cache exceeds its maximum size
+        cache = ParseCache(tmp_path / "cache", max_bytes=sum(entry_sizes[-2:]))
+        for afids_file in afids_files:
+            AfidSet.load(afids_file, cache=cache)
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+        assert cache._size <= cache.max_bytes
+
+        cache.clear()
+        assert list((tmp_path / "cache").iterdir()) == []
+        assert (cache.hits, cache.misses) == (0, 0)
+
+    def test_corrupt_entry(self, tmp_path: Path, afids_files: list[Path]):
+        cache = ParseCache(tmp_path / "cache")
+        afid_set = AfidSet.load(afids_files[0], cache=cache)
+        for entry in (tmp_path / "cache").iterdir():
+            entry.write_bytes(b"corrupt")
+
+        assert AfidSet.load(afids_files[0], cache=cache) == afid_set
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_process_pool(self, tmp_path: Path, afids_files: list[Path]):
+        cache = ParseCache(tmp_path / "cache")
+        expected = AfidSet.load_many(afids_files, workers=1)
+
+        assert (
+            AfidSet.load_many(
+                afids_files, workers=2, executor="process", cache=cache
+            )
+            == expected
+        )
+        # Entries stored by workers are visible to the main process
+        assert (
+            AfidSet.load_many(afids_files, workers=1, cache=cache) == expected
+        )
+        assert cache.hits == len(afids_files)
+
+    def test_invalid_key(self, tmp_path: Path):
+        with pytest.raises(ValueError):
+            ParseCache(tmp_path / "cache", key="invalid")
+
+    def test_missing_file(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError):
+            af_afids.AfidSet.load(
+                tmp_path / "missing.fcsv", cache=ParseCache(tmp_path)
+            )
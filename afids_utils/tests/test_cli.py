@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from afids_utils.afids import AfidCohort, AfidSet
+from afids_utils.cli import main
+from afids_utils.transforms import xfm_coord_system
+
+
+@pytest.fixture
+def valid_file() -> Path:
+    return (
+        Path(__file__).parent / "data" / "tpl-MNI152NLin2009cAsym_afids.fcsv"
+    )
+
+
+@pytest.fixture
+def in_dir(tmp_path: Path) -> Path:
+    data_dir = Path(__file__).parent / "data"
+    for sub, ext in [("01", "fcsv"), ("02", "json")]:
+        out_dir = tmp_path / "in" / f"sub-{sub}"
+        out_dir.mkdir(parents=True)
+        shutil.copy(
+            data_dir / f"tpl-MNI152NLin2009cAsym_afids.{ext}",
+            out_dir / f"sub-{sub}_afids.{ext}",
+        )
+    return tmp_path / "in"
+
+
+def _bump_mtime(fpath: Path) -> None:
+    stat = fpath.stat()
+    os.utime(fpath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestConvert:
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_convert_directory(
+        self,
+        in_dir: Path,
+        tmp_path: Path,
+        valid_file: Path,
+        jobs: str,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        out_dir = tmp_path / "out"
+        assert (
+            main(
+                [
+                    "convert",
+                    str(in_dir),
+                    "-o",
+                    str(out_dir),
+                    "-t",
+                    "json",
+                    "-j",
+                    jobs,
+                ]
+            )
+            == 0
+        )
+        assert "Converted 2 file(s) (0 skipped, 0 failed)" in (
+            capsys.readouterr().out
+        )
+
+        expected = AfidSet.load(valid_file)
+        for out_fpath in [
+            out_dir / "sub-01" / "sub-01_afids.json",
+            out_dir / "sub-02" / "sub-02_afids.json",
+        ]:
+            afid_set = AfidSet.load(out_fpath)
+            assert afid_set.coord_system == expected.coord_system
+            assert np.array_equal(afid_set.coords, expected.coords)
+
+    def test_skip_up_to_date(
+        self,
+        in_dir: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        args = ["convert", str(in_dir), "-o", str(tmp_path / "out")]
+        main([*args, "-t", "fcsv"])
+        capsys.readouterr()
+
+        # Unchanged inputs are skipped
+        assert main([*args, "-t", "fcsv"]) == 0
+        assert "Converted 0 file(s) (2 skipped" in capsys.readouterr().out
+
+        # Changed inputs are converted again, as are all inputs if forced
+        _bump_mtime(in_dir / "sub-02" / "sub-02_afids.json")
+        main([*args, "-t", "fcsv"])
+        assert "Converted 1 file(s) (1 skipped" in capsys.readouterr().out
+        main([*args, "-t", "fcsv", "--force"])
+        assert "Converted 2 file(s) (0 skipped" in capsys.readouterr().out
+
+    def test_convert_coord_system(
+        self, in_dir: Path, tmp_path: Path, valid_file: Path
+    ):
+        out_dir = tmp_path / "out"
+        main(
+            [
+                "convert",
+                str(in_dir / "sub-*" / "*.fcsv"),
+                "-o",
+                str(out_dir),
+                "-t",
+                "json",
+                "--coord-system",
+                "LPS",
+                "--compress",
+                "gz",
+            ]
+        )
+
+        afid_set = AfidSet.load(out_dir / "sub-01_afids.json.gz")
+        expected = xfm_coord_system(AfidSet.load(valid_file), "LPS")
+        assert afid_set.coord_system == "LPS"
+        assert np.allclose(afid_set.coords, expected.coords)
+
+    def test_binary_round_trip(
+        self, in_dir: Path, tmp_path: Path, valid_file: Path
+    ):
+        file_list = tmp_path / "files.txt"
+        file_list.write_text(
+            "\n".join(str(fpath) for fpath in sorted(in_dir.rglob("*.*")))
+        )
+        cohort_fpath = tmp_path / "cohort.afids"
+        assert (
+            main(
+                [
+                    "convert",
+                    "--file-list",
+                    str(file_list),
+                    "-o",
+                    str(cohort_fpath),
+                    "-t",
+                    "binary",
+                ]
+            )
+            == 0
+        )
+
+        afid_cohort = AfidCohort.load_binary(cohort_fpath)
+        assert afid_cohort.subject_ids.tolist() == [
+            "sub-01_afids.fcsv",
+            "sub-02_afids.json",
+        ]
+
+        # Each subject of a cohort is converted to an individual file
+        out_dir = tmp_path / "out"
+        assert (
+            main(
+                [
+                    "convert",
+                    str(cohort_fpath),
+                    "-o",
+                    str(out_dir),
+                    "-t",
+                    "fcsv",
+                    "-j",
+                    "2",
+                ]
+            )
+            == 0
+        )
+        assert sorted(fpath.name for fpath in out_dir.iterdir()) == [
+            "sub-01_afids.fcsv",
+            "sub-02_afids.fcsv",
+        ]
+        assert np.array_equal(
+            AfidSet.load(out_dir / "sub-02_afids.fcsv").coords,
+            AfidSet.load(valid_file).coords,
+        )
+
+    def test_invalid_input(
+        self,
+        in_dir: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        (in_dir / "sub-01" / "sub-01_desc-bad_afids.fcsv").write_text("bad")
+
+        assert (
+            main(["convert", str(in_dir), "-o", str(tmp_path), "-t", "json"])
+            == 1
+        )
+        captured = capsys.readouterr()
+        assert "sub-01_desc-bad_afids.fcsv" in captured.err
+        assert "Converted 2 file(s) (0 skipped, 1 failed)" in captured.out
+
+    @pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+    def test_corrupt_compressed_input(
+        self,
+        in_dir: Path,
+        tmp_path: Path,
+        compression: str,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        fname = f"sub-03_afids.fcsv.{compression}"
+        (in_dir / fname).write_bytes(b"not compressed")
+
+        assert (
+            main(["convert", str(in_dir), "-o", str(tmp_path), "-t", "json"])
+            == 1
+        )
+        captured = capsys.readouterr()
+        assert fname in captured.err
+        assert "Converted 2 file(s) (0 skipped, 1 failed)" in captured.out
+
+    def test_output_within_input(
+        self, in_dir: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        args = ["convert", str(in_dir), "-o", str(in_dir / "out")]
+        main([*args, "-t", "json"])
+        capsys.readouterr()
+
+        # Previous outputs are not picked up as inputs
+        assert main([*args, "-t", "fcsv"]) == 0
+        assert "Converted 2 file(s) (0 skipped" in capsys.readouterr().out
+        assert not (in_dir / "out" / "out").exists()
+
+    def test_missing_input(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        assert (
+            main(
+                [
+                    "convert",
+                    str(tmp_path / "*.fcsv"),
+                    "-o",
+                    str(tmp_path),
+                    "-t",
+                    "json",
+                ]
+            )
+            == 2
+        )
+        assert "No files match pattern" in capsys.readouterr().err
+
+    def test_invalid_jobs(self, tmp_path: Path):
+        with pytest.raises(SystemExit):
+            main(["convert", str(tmp_path), "-o", "out", "-t", "json", "-j0"])
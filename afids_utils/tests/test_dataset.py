@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import os
+from os import PathLike
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pytest
+
+from afids_utils import dataset as af_dataset
+from afids_utils.afids import AfidSet
+from afids_utils.dataset import AfidsIndex, parse_entities
+from afids_utils.exceptions import InvalidFileError
+from afids_utils.ext._io import AfidsSource
+from afids_utils.transforms import xfm_coord_system
+
+
+@pytest.fixture
+def valid_file() -> Path:
+    return (
+        Path(__file__).parent / "data" / "tpl-MNI152NLin2009cAsym_afids.fcsv"
+    )
+
+
+@pytest.fixture
+def bids_dir(tmp_path: Path, valid_file: Path) -> Path:
+    afid_set = AfidSet.load(valid_file)
+    for sub in ["01", "02"]:
+        for rater, coord_system, ext in [
+            ("1", "RAS", "fcsv"),
+            ("2", "LPS", "fcsv"),
+            ("2", "RAS", "json.gz"),
+        ]:
+            out_dir = tmp_path / f"sub-{sub}" / "anat"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            xfm_coord_system(afid_set, coord_system).save(
+                out_dir / f"sub-{sub}_rater-{rater}_afids.{ext}"
+            )
+
+    # Non-AFIDs files should be skipped or marked invalid
+    (tmp_path / "dataset_description.json").write_text(
+        json.dumps({"Name": "test"})
+    )
+    (tmp_path / "README").write_text("test dataset")
+    return tmp_path
+
+
+class TestParseEntities:
+    @pytest.mark.parametrize(
+        "fname,entities,suffix",
+        [
+            (
+                "sub-01_ses-02_rater-2_afids.fcsv",
+                {"sub": "01", "ses": "02", "rater": "2"},
+                "afids",
+            ),
+            (
+                "sub-01_desc-mean_afids.json.gz",
+                {"sub": "01", "desc": "mean"},
+                "afids",
+            ),
+            ("afids.fcsv", {}, "afids"),
+            ("sub-01.fcsv", {"sub": "01"}, "n/a"),
+        ],
+    )
+    def test_parse_entities(
+        self, fname: str, entities: dict[str, str], suffix: str
+    ):
+        assert parse_entities(fname) == (entities, suffix)
+
+
+class TestAfidsIndex:
+    def test_index_directory(self, bids_dir: Path):
+        index = AfidsIndex.from_directory(bids_dir)
+
+        assert (bids_dir / af_dataset.INDEX_FNAME).exists()
+        assert len(index.entries) == 7
+        assert not index.entries["dataset_description.json"].valid
+
+        entry = index.entries["sub-01/anat/sub-01_rater-2_afids.fcsv"]
+        assert entry.valid
+        assert entry.format == "fcsv"
+        assert entry.coord_system == "LPS"
+        assert entry.entities == {"sub": "01", "rater": "2"}
+        assert entry.suffix == "afids"
+
+    @pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+    def test_index_corrupt_compressed(self, bids_dir: Path, compression: str):
+        fname = f"sub-03_afids.fcsv.{compression}"
+        (bids_dir / fname).write_bytes(b"not compressed")
+
+        index = AfidsIndex.from_directory(bids_dir)
+        assert not index.entries[fname].valid
+        assert index.entries[fname].format == "fcsv"
+
+    def test_query(self, bids_dir: Path):
+        index = AfidsIndex.from_directory(bids_dir)
+
+        assert [
+            entry.path
+            for entry in index.query(
+                rater="2", format="fcsv", coord_system="LPS"
+            )
+        ] == [
+            "sub-01/anat/sub-01_rater-2_afids.fcsv",
+            "sub-02/anat/sub-02_rater-2_afids.fcsv",
+        ]
+        assert len(index.query(sub=["01", "02"], rater="2")) == 4
+        assert index.query(ses="01") == []
+
+    def test_load_cohort(self, bids_dir: Path, valid_file: Path):
+        index = AfidsIndex.from_directory(bids_dir)
+        afid_cohort = index.load_cohort(workers=1, sub="02", rater="1")
+
+        assert afid_cohort.subject_ids.tolist() == [
+            "sub-02/anat/sub-02_rater-1_afids.fcsv"
+        ]
+        assert np.array_equal(
+            afid_cohort.coords[0], AfidSet.load(valid_file).coords
+        )
+
+    def test_incremental_update(
+        self, bids_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        index = AfidsIndex.from_directory(bids_dir)
+
+        # Track files opened when re-indexing
+        scanned: list[Path] = []
+        scan_metadata = af_dataset.scan_metadata
+
+        def _tracked_scan_metadata(
+            afids_fpath: AfidsSource, format: str | None = None
+        ) -> tuple[str, str]:
+            scanned.append(Path(cast("PathLike[str]", afids_fpath)))
+            return scan_metadata(afids_fpath, format)
+
+        monkeypatch.setattr(
+            af_dataset, "scan_metadata", _tracked_scan_metadata
+        )
+
+        # Unchanged files are not opened
+        assert AfidsIndex.from_directory(bids_dir) == index
+        assert scanned == []
+
+        # Changed and removed files are picked up
+        changed = bids_dir / "sub-01" / "anat" / "sub-01_rater-1_afids.fcsv"
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        (bids_dir / "sub-02" / "anat" / "sub-02_rater-1_afids.fcsv").unlink()
+        new_index = AfidsIndex.from_directory(bids_dir)
+
+        assert scanned == [changed]
+        assert "sub-02/anat/sub-02_rater-1_afids.fcsv" not in new_index.entries
+        assert AfidsIndex.load(bids_dir) == new_index
+
+    def test_invalid_index(self, bids_dir: Path):
+        (bids_dir / af_dataset.INDEX_FNAME).write_text("invalid\tcolumns\n")
+
+        with pytest.raises(InvalidFileError, match="Invalid columns.*"):
+            AfidsIndex.load(bids_dir)
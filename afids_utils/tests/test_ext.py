@@ -1,19 +1,25 @@
 from __future__ import annotations
 
+import io
 import json
 import re
+import tarfile
 import tempfile
+import zipfile
 from pathlib import Path
 
+import numpy as np
 import pytest
 from hypothesis import assume, given
 from hypothesis import strategies as st
 
 import afids_utils.tests.strategies as af_st
-from afids_utils.afids import AfidPosition, AfidSet
+from afids_utils.afids import AfidCohort, AfidSet
 from afids_utils.exceptions import InvalidFileError
+from afids_utils.ext import archive as af_archive
 from afids_utils.ext import fcsv as af_fcsv
 from afids_utils.ext import json as af_json
+from afids_utils.ext.binary import MmapMode
 from afids_utils.tests.helpers import allow_function_scoped
 
 
@@ -139,10 +145,105 @@ class TestLoadFcsv:
     @allow_function_scoped
     def test_valid_get_afids(self, valid_fcsv_file: Path, label: int):
         with open(valid_fcsv_file) as valid_fcsv:
-            afids_positions = af_fcsv._get_afids(valid_fcsv.readlines())
+            labels, descs, coords = af_fcsv._get_afid_arrays(
+                valid_fcsv.readlines()
+            )
+
+        assert labels[label - 1] == label
+        assert isinstance(descs[label - 1], str)
+        assert coords.shape == (len(labels), 3)
+
+    def test_load_arrays_matches_positions(self, valid_fcsv_file: Path):
+        slicer_version, coord_system, afids_positions = af_fcsv.load_fcsv(
+            valid_fcsv_file
+        )
+        (
+            array_version,
+            array_coord_system,
+            labels,
+            descs,
+            coords,
+        ) = af_fcsv.load_fcsv_arrays(valid_fcsv_file)
+
+        assert (array_version, array_coord_system) == (
+            slicer_version,
+            coord_system,
+        )
+        assert coords.shape == (len(afids_positions), 3)
+        assert labels.tolist() == [afid.label for afid in afids_positions]
+        assert descs == [afid.desc for afid in afids_positions]
+        assert coords.tolist() == [
+            [afid.x, afid.y, afid.z] for afid in afids_positions
+        ]
+
+    @given(label=af_st.valid_labels())
+    @allow_function_scoped
+    def test_load_invalid_label(self, valid_fcsv_file: Path, label: int):
+        with open(valid_fcsv_file) as valid_fcsv:
+            fcsv_data = valid_fcsv.readlines()
+            fields = fcsv_data[label + 2].split(",")
+            fields[-3] = "33"
+            fcsv_data[label + 2] = ",".join(fields)
+
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            prefix="sub-test_desc-",
+            suffix="_afids.fcsv",
+        ) as temp_invalid_fcsv_file:
+            temp_invalid_fcsv_file.writelines(fcsv_data)
+            temp_invalid_fcsv_file.flush()
+
+            with pytest.raises(ValueError, match=r".*must be in.*"):
+                AfidSet.load(temp_invalid_fcsv_file.name)
+
 
-        assert isinstance(afids_positions, list)
-        assert isinstance(afids_positions[label - 1], AfidPosition)
+class TestLoadMetadata:
+    @given(coord_num=st.integers(min_value=0, max_value=1))
+    @allow_function_scoped
+    def test_fcsv_metadata(self, valid_fcsv_file: Path, coord_num: int):
+        with open(valid_fcsv_file) as valid_fcsv:
+            fcsv_data = valid_fcsv.read().replace(
+                "# CoordinateSystem = 0",
+                f"# CoordinateSystem = {str(coord_num)}",
+            )
+
+        # Check header is parsed without reading invalid AFIDs rows
+        invalid_fcsv = fcsv_data.split("\n", 3)
+        invalid_fcsv[-1] = "invalid,afids,rows"
+        assert af_fcsv.load_fcsv_metadata(
+            "\n".join(invalid_fcsv).encode("utf-8")
+        ) == af_fcsv._get_metadata(fcsv_data.splitlines())
+
+    @given(
+        coord=st.sampled_from(["RAS", "LPS", "0", "1"]),
+        chunk_size=st.integers(min_value=1, max_value=1024),
+    )
+    @allow_function_scoped
+    def test_json_metadata(
+        self,
+        valid_json_file: Path,
+        coord: str,
+        chunk_size: int,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        with open(valid_json_file) as valid_json:
+            afids_json = json.load(valid_json)
+            afids_json["markups"][0]["coordinateSystem"] = coord
+
+        # Check coordinate system found regardless of how file is chunked
+        monkeypatch.setattr(af_json, "_METADATA_CHUNK_SIZE", chunk_size)
+        json_stream = io.BytesIO(json.dumps(afids_json, indent=4).encode())
+        assert af_json.load_json_metadata(
+            json_stream
+        ) == af_json._get_metadata(coord)
+
+    def test_json_missing_metadata(self, valid_json_file: Path):
+        with open(valid_json_file) as valid_json:
+            afids_json = json.load(valid_json)
+            del afids_json["markups"][0]["coordinateSystem"]
+
+        with pytest.raises(InvalidFileError, match="Missing coordinate.*"):
+            af_json.load_json_metadata(json.dumps(afids_json).encode())
 
 
 class TestSaveFcsv:
@@ -167,6 +268,47 @@ class TestSaveFcsv:
             assert test_load == afid_set
             assert isinstance(test_load, AfidSet)
 
+    @given(afid_cohort=af_st.afid_cohorts())
+    def test_save_many_fcsv(self, afid_cohort: AfidCohort):
+        afid_sets = afid_cohort.to_afid_sets()
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fcsvs = [
+                Path(out_dir) / f"sub-{idx}_afids.fcsv"
+                for idx in range(len(afid_sets))
+            ]
+            af_fcsv.save_many_fcsv(afid_sets, out_fcsvs)
+
+            for afid_set, out_fcsv in zip(afid_sets, out_fcsvs):
+                test_load = AfidSet.load(out_fcsv)
+                assert test_load.coord_system == afid_set.coord_system
+                assert np.array_equal(test_load.coords, afid_set.coords)
+
+                # Check contents match saving sets individually
+                single_fcsv = Path(out_dir) / "single_afids.fcsv"
+                afid_set.save(single_fcsv)
+                assert out_fcsv.read_bytes() == single_fcsv.read_bytes()
+
+    @given(afid_set=af_st.afid_sets())
+    def test_save_many_fcsv_invalid_coord_system(self, afid_set: AfidSet):
+        afid_set.coord_system = "XYZ"
+        with tempfile.TemporaryDirectory() as out_dir:
+            with pytest.raises(ValueError, match=".*invalid coordinate.*"):
+                af_fcsv.save_many_fcsv(
+                    [afid_set], [Path(out_dir) / "sub-0_afids.fcsv"]
+                )
+
+    @given(afid_set=af_st.afid_sets())
+    def test_save_many_fcsv_mismatched(self, afid_set: AfidSet):
+        with tempfile.TemporaryDirectory() as out_dir:
+            with pytest.raises(ValueError, match="Mismatched number.*"):
+                af_fcsv.save_many_fcsv(
+                    [afid_set],
+                    [
+                        Path(out_dir) / f"sub-{idx}_afids.fcsv"
+                        for idx in range(2)
+                    ],
+                )
+
 
 class TestLoadJson:
     @given(coord=st.sampled_from(["RAS", "LPS", "0", "1"]))
@@ -262,12 +404,92 @@ class TestLoadJson:
     def test_json_valid_get_afids(self, valid_json_file: Path, label: int):
         with open(valid_json_file) as valid_json:
             afids_json = json.load(valid_json)
-            afids_positions = af_json._get_afids(
+            labels, descs, coords = af_json._get_afid_arrays(
                 afids_json["markups"][0]["controlPoints"]
             )
 
-        assert isinstance(afids_positions, list)
-        assert isinstance(afids_positions[label], AfidPosition)
+        assert labels[label] == label + 1
+        assert isinstance(descs[label], str)
+        assert coords.shape == (len(labels), 3)
+
+
+class TestLoadJsonNodes:
+    @given(
+        coords=st.lists(
+            st.sampled_from(["RAS", "LPS", "0", "1", "invalid"]),
+            min_size=1,
+            max_size=5,
+        )
+    )
+    @allow_function_scoped
+    def test_load_json_nodes(self, valid_json_file: Path, coords: list[str]):
+        with open(valid_json_file) as valid_json:
+            afids_json = json.load(valid_json)
+        markup = afids_json["markups"][0]
+        afids_json["markups"] = [
+            {**markup, "coordinateSystem": coord} for coord in coords
+        ]
+
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            prefix="sub-test_desc-",
+            suffix="_afids.json",
+        ) as temp_json_file:
+            json.dump(afids_json, temp_json_file, indent=4)
+            temp_json_file.flush()
+
+            nodes = af_json.load_json_nodes(temp_json_file.name)
+            afid_cohort, errors = af_json.load_json_cohort(temp_json_file.name)
+
+        expected = AfidSet.load(valid_json_file)
+        assert [node.index for node in nodes] == list(range(len(coords)))
+        for node, coord in zip(nodes, coords):
+            # Check invalid nodes are reported without failing other nodes
+            if coord == "invalid":
+                assert node.afid_set is None
+                assert isinstance(node.error, InvalidFileError)
+            else:
+                assert node.error is None
+                assert node.afid_set is not None
+                assert np.array_equal(node.afid_set.coords, expected.coords)
+
+        # Check cohort only stacks valid nodes
+        valid_idxs = [
+            str(idx) for idx, coord in enumerate(coords) if coord != "invalid"
+        ]
+        assert afid_cohort.subject_ids.tolist() == valid_idxs
+        assert len(afid_cohort) == len(valid_idxs)
+        assert sorted(errors) == [
+            idx for idx, coord in enumerate(coords) if coord == "invalid"
+        ]
+
+    def test_load_json_nodes_missing_fields(self, valid_json_file: Path):
+        with open(valid_json_file) as valid_json:
+            afids_json = json.load(valid_json)
+        markup = afids_json["markups"][0]
+        afids_json["markups"] = [
+            {
+                key: val
+                for key, val in markup.items()
+                if key != "controlPoints"
+            },
+            markup,
+        ]
+
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            prefix="sub-test_desc-",
+            suffix="_afids.json",
+        ) as temp_json_file:
+            json.dump(afids_json, temp_json_file, indent=4)
+            temp_json_file.flush()
+
+            invalid_node, valid_node = af_json.load_json_nodes(
+                temp_json_file.name
+            )
+
+        assert isinstance(invalid_node.error, InvalidFileError)
+        assert valid_node.afid_set == AfidSet.load(valid_json_file)
 
 
 class TestSaveJson:
@@ -293,3 +515,202 @@ class TestSaveJson:
             assert test_load.coord_system == afid_set.coord_system
             assert test_load.afids == afid_set.afids
             assert isinstance(test_load, AfidSet)
+
+    @given(afid_set=af_st.afid_sets(), compact=st.booleans())
+    def test_save_json_matches_json_dump(
+        self, afid_set: AfidSet, compact: bool
+    ):
+        with tempfile.NamedTemporaryFile(
+            mode="w", prefix="sub-test_desc-", suffix="_afids.json"
+        ) as out_json_file:
+            af_json.save_json(afid_set, out_json_file.name, compact=compact)
+
+            with open(out_json_file.name) as in_json_file:
+                out_json = in_json_file.read()
+
+        # Check output is identical to serializing the full document
+        afids_json = json.loads(out_json)
+        assert out_json == (
+            json.dumps(afids_json, separators=(",", ":"))
+            if compact
+            else json.dumps(afids_json, indent=4)
+        )
+        assert (
+            afids_json["markups"][0]["coordinateSystem"]
+            == afid_set.coord_system
+        )
+        assert [
+            control_point["position"]
+            for control_point in afids_json["markups"][0]["controlPoints"]
+        ] == afid_set.coords.tolist()
+
+
+class TestArchive:
+    @pytest.mark.parametrize("archive_ext", ["zip", "tar", "tar.gz"])
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_load_archive(
+        self,
+        valid_fcsv_file: Path,
+        valid_json_file: Path,
+        archive_ext: str,
+        executor: str,
+    ):
+        members = {
+            f"site-{site}/sub-{idx:03d}_afids.{ext}": afids_file
+            for site in range(2)
+            for idx, (ext, afids_file) in enumerate(
+                [("fcsv", valid_fcsv_file), ("json", valid_json_file)] * 3
+            )
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            archive_path = Path(tmp_dir) / f"afids.{archive_ext}"
+            if archive_ext == "zip":
+                with zipfile.ZipFile(
+                    archive_path, "w", compression=zipfile.ZIP_DEFLATED
+                ) as zip_file:
+                    zip_file.writestr("README.txt", "not an afids file")
+                    for name, afids_file in members.items():
+                        zip_file.write(afids_file, name)
+            else:
+                with tarfile.open(
+                    archive_path, "w:gz" if archive_ext == "tar.gz" else "w"
+                ) as tar_file:
+                    tar_file.add(
+                        valid_fcsv_file.parent, "data", recursive=False
+                    )
+                    for name, afids_file in members.items():
+                        tar_file.add(afids_file, name)
+
+            afid_cohort = af_archive.load_archive(
+                archive_path, workers=2, executor=executor
+            )
+
+        expected = AfidSet.load(valid_fcsv_file)
+        assert afid_cohort.subject_ids.tolist() == list(members)
+        for afid_set in afid_cohort:
+            assert np.array_equal(afid_set.coords, expected.coords)
+
+    @pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+    def test_load_compressed_members(
+        self, valid_fcsv_file: Path, valid_json_file: Path, compression: str
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            archive_path = Path(tmp_dir) / "afids.zip"
+            with zipfile.ZipFile(archive_path, "w") as zip_file:
+                for ext, afids_file in [
+                    ("fcsv", valid_fcsv_file),
+                    ("json", valid_json_file),
+                ]:
+                    name = f"sub-{ext}_afids.{ext}.{compression}"
+                    AfidSet.load(afids_file).save(Path(tmp_dir) / name)
+                    zip_file.write(Path(tmp_dir) / name, name)
+
+            afid_cohort = af_archive.load_archive(archive_path, workers=1)
+
+        expected = AfidSet.load(valid_fcsv_file)
+        assert afid_cohort.subject_ids.tolist() == [
+            f"sub-fcsv_afids.fcsv.{compression}",
+            f"sub-json_afids.json.{compression}",
+        ]
+        for afid_set in afid_cohort:
+            assert np.allclose(afid_set.coords, expected.coords)
+
+    def test_invalid_archive(self, valid_fcsv_file: Path):
+        with pytest.raises(ValueError, match="Unsupported archive.*"):
+            af_archive.load_archive(valid_fcsv_file)
+
+    def test_missing_archive(self):
+        with pytest.raises(FileNotFoundError):
+            af_archive.load_archive("/invalid/archive/path.zip")
+
+
+class TestBinaryCohort:
+    @given(
+        afid_cohort=af_st.afid_cohorts(min_size=0),
+        mmap_mode=st.sampled_from(["r", "r+", "c", None]),
+    )
+    def test_round_trip(self, afid_cohort: AfidCohort, mmap_mode: MmapMode):
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fpath = Path(out_dir) / "cohort.afids"
+            afid_cohort.save_binary(out_fpath)
+
+            assert (
+                AfidCohort.load_binary(out_fpath, mmap_mode=mmap_mode)
+                == afid_cohort
+            )
+
+    @given(afid_cohort=af_st.afid_cohorts())
+    def test_mmap_write_through(self, afid_cohort: AfidCohort):
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fpath = Path(out_dir) / "cohort.afids"
+            afid_cohort.save_binary(out_fpath)
+
+            # Changes are only written back to the file in "r+" mode
+            expected = afid_cohort.coords.copy()
+            mmap_modes: list[MmapMode] = ["c", "r+"]
+            for mmap_mode in mmap_modes:
+                loaded = AfidCohort.load_binary(out_fpath, mmap_mode=mmap_mode)
+                loaded.coords[0] += 1.0
+                del loaded
+
+                if mmap_mode == "r+":
+                    expected[0] += 1.0
+                assert np.array_equal(
+                    AfidCohort.load_binary(out_fpath, mmap_mode=None).coords,
+                    expected,
+                )
+
+    def test_invalid_mmap_mode(self, valid_fcsv_file: Path):
+        with pytest.raises(ValueError, match="Unsupported memory-map.*"):
+            AfidCohort.load_binary(
+                valid_fcsv_file, mmap_mode="w+"  # pyright: ignore
+            )
+
+    @given(afid_cohorts=st.lists(af_st.afid_cohorts(), min_size=1, max_size=3))
+    def test_append(self, afid_cohorts: list[AfidCohort]):
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fpath = Path(out_dir) / "cohort.afids"
+            for afid_cohort in afid_cohorts:
+                afid_cohort.save_binary(out_fpath, append=True)
+
+            loaded = AfidCohort.load_binary(out_fpath)
+            # Check appended subjects are stored in order
+            assert np.array_equal(
+                loaded.coords,
+                np.concatenate([cohort.coords for cohort in afid_cohorts]),
+            )
+            assert loaded.subject_ids.tolist() == [
+                subject_id
+                for cohort in afid_cohorts
+                for subject_id in cohort.subject_ids.tolist()
+            ]
+
+    @given(afid_cohort=af_st.afid_cohorts())
+    def test_append_metadata_too_long(self, afid_cohort: AfidCohort):
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fpath = Path(out_dir) / "cohort.afids"
+            afid_cohort.save_binary(out_fpath)
+
+            long_cohort = AfidCohort(
+                coords=afid_cohort.coords,
+                coord_systems=afid_cohort.coord_systems,
+                subject_ids=["sub-" * 32] * len(afid_cohort),
+            )
+            with pytest.raises(ValueError, match=r"Length of subject_ids.*"):
+                long_cohort.save_binary(out_fpath, append=True)
+
+    def test_invalid_file(self, valid_fcsv_file: Path):
+        with pytest.raises(InvalidFileError, match="Invalid binary.*"):
+            AfidCohort.load_binary(valid_fcsv_file)
+
+    @given(afid_cohort=af_st.afid_cohorts())
+    def test_truncated_file(self, afid_cohort: AfidCohort):
+        with tempfile.TemporaryDirectory() as out_dir:
+            out_fpath = Path(out_dir) / "cohort.afids"
+            afid_cohort.save_binary(out_fpath)
+            with open(out_fpath, "r+b") as out_file:
+                out_file.truncate(out_fpath.stat().st_size - 1)
+
+            with pytest.raises(InvalidFileError, match="Truncated binary.*"):
+                AfidCohort.load_binary(out_fpath)
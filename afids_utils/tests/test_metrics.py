@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import statistics as stats
 from copy import deepcopy
+from pathlib import Path
 
+import numpy as np
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
 import afids_utils.metrics as af_metrics
 import afids_utils.tests.strategies as af_st
-from afids_utils.afids import AfidPosition, AfidSet
+from afids_utils.afids import (
+    AfidCohort,
+    AfidDistanceSet,
+    AfidPosition,
+    AfidSet,
+)
 from afids_utils.tests.helpers import slow_generation
 
 
@@ -41,6 +49,51 @@ class TestMeanAfidSet:
             )
         )
 
+    @given(cohort=af_st.afid_cohorts(randomize_header=False))
+    def test_cohort_matches_afid_sets(self, cohort: AfidCohort):
+        mean_afid_set = af_metrics.mean_afid_sets(cohort)
+
+        assert mean_afid_set == af_metrics.mean_afid_sets(
+            cohort.to_afid_sets()
+        )
+        assert mean_afid_set.coord_system == "RAS"
+        assert np.allclose(
+            mean_afid_set.coords,
+            [
+                [
+                    stats.mean(
+                        afid_set.coords[idx, axis] for afid_set in cohort
+                    )
+                    for axis in range(3)
+                ]
+                for idx in range(32)
+            ],
+        )
+
+    @given(
+        cohort=af_st.afid_cohorts(randomize_header=False),
+        coord_system=st.sampled_from(["RAS", "LPS"]),
+    )
+    def test_valid_array(self, cohort: AfidCohort, coord_system: str):
+        mean_afid_set = af_metrics.mean_afid_sets(
+            cohort.coords, coord_system=coord_system
+        )
+
+        assert isinstance(mean_afid_set, AfidSet)
+        assert mean_afid_set.coord_system == coord_system
+        assert np.array_equal(
+            mean_afid_set.coords, af_metrics.mean_afid_sets(cohort).coords
+        )
+
+    @given(cohort=af_st.afid_cohorts(randomize_header=False))
+    def test_array_missing_coord_system(self, cohort: AfidCohort):
+        with pytest.raises(ValueError, match=r"Coordinate system required.*"):
+            af_metrics.mean_afid_sets(cohort.coords)
+
+    def test_no_afid_sets(self):
+        with pytest.raises(ValueError, match=r"No AfidSet.*"):
+            af_metrics.mean_afid_sets([])
+
 
 class TestMeanDistances:
     @given(
@@ -72,3 +125,171 @@ class TestMeanDistances:
                 )
             )
         )
+
+    @given(
+        afid_set=af_st.afid_sets(randomize_header=False),
+        template_set=af_st.afid_sets(randomize_header=False),
+    )
+    def test_invalid_component(self, afid_set: AfidSet, template_set: AfidSet):
+        with pytest.raises(ValueError, match="Invalid component"):
+            af_metrics.mean_distances(
+                afid_sets=[afid_set],
+                template_afid_set=template_set,
+                component="invalid_component",
+            )
+
+
+class TestDistanceComponents:
+    @given(
+        afid_set=af_st.afid_sets(randomize_header=False),
+        template_set=af_st.afid_sets(randomize_header=False),
+    )
+    def test_matches_afid_distances(
+        self, afid_set: AfidSet, template_set: AfidSet
+    ):
+        components = af_metrics.distance_components(
+            afid_sets=[afid_set], template_afid_set=template_set
+        )
+        afid_distances = AfidDistanceSet(afid_set, template_set).afids
+
+        assert components.shape == (1, 32, 4)
+        for afid_distance, afid_components in zip(
+            afid_distances, components[0]
+        ):
+            assert afid_components == pytest.approx(
+                [
+                    afid_distance.get(component)
+                    for component in af_metrics.DISTANCE_COMPONENTS
+                ]
+            )
+
+    @given(
+        cohort=af_st.afid_cohorts(randomize_header=False),
+        template_set=af_st.afid_sets(randomize_header=False),
+    )
+    def test_mean_components_cohort(
+        self, cohort: AfidCohort, template_set: AfidSet
+    ):
+        mean_components = af_metrics.mean_distance_components(
+            afid_sets=cohort, template_afid_set=template_set
+        )
+
+        assert set(mean_components) == set(af_metrics.DISTANCE_COMPONENTS)
+        for component, mean_component in mean_components.items():
+            assert mean_component.shape == (32,)
+            assert np.allclose(
+                mean_component,
+                af_metrics.mean_distances(
+                    afid_sets=cohort.to_afid_sets(),
+                    template_afid_set=template_set,
+                    component=component,
+                ),
+            )
+        assert np.all(mean_components["distance"] >= 0)
+
+    @given(
+        cohort=af_st.afid_cohorts(randomize_header=False),
+        template_set=af_st.afid_sets(randomize_header=False),
+    )
+    @slow_generation
+    def test_mismatched_coords(
+        self, cohort: AfidCohort, template_set: AfidSet
+    ):
+        template_set.coord_system = "LPS"
+
+        with pytest.raises(ValueError, match=r"Mismatched coord.*"):
+            af_metrics.distance_components(
+                afid_sets=cohort, template_afid_set=template_set
+            )
+
+    @given(template_set=af_st.afid_sets(randomize_header=False))
+    def test_no_afid_sets(self, template_set: AfidSet):
+        for distance_fn in [
+            af_metrics.distance_components,
+            af_metrics.mean_distance_components,
+            af_metrics.mean_distances,
+        ]:
+            with pytest.raises(ValueError, match=r"No AfidSet provided.*"):
+                distance_fn(afid_sets=[], template_afid_set=template_set)
+
+
+class TestAfidSetAccumulator:
+    @given(cohort=af_st.afid_cohorts(min_size=2, randomize_header=False))
+    def test_matches_numpy(self, cohort: AfidCohort):
+        accumulator = af_metrics.AfidSetAccumulator()
+        accumulator.update_many(afid_set for afid_set in cohort)
+
+        assert accumulator.count == len(cohort)
+        assert accumulator.coord_system == "RAS"
+        assert np.allclose(
+            accumulator.mean_afid_set().coords, cohort.coords.mean(axis=0)
+        )
+        assert np.allclose(
+            accumulator.variance(), cohort.coords.var(axis=0, ddof=1)
+        )
+
+    @given(
+        cohort=af_st.afid_cohorts(min_size=2, randomize_header=False),
+        split=st.integers(min_value=0, max_value=5),
+    )
+    def test_merge(self, cohort: AfidCohort, split: int):
+        streamed = af_metrics.AfidSetAccumulator()
+        streamed.update_many(afid_set for afid_set in cohort)
+
+        first, second = (
+            af_metrics.AfidSetAccumulator(),
+            af_metrics.AfidSetAccumulator(),
+        )
+        first.update_many(cohort[:split])
+        second.update_many(cohort[split:])
+        merged = first.merge(second)
+
+        assert merged.count == streamed.count
+        assert np.allclose(
+            merged.mean_afid_set().coords, streamed.mean_afid_set().coords
+        )
+        assert np.allclose(merged.variance(), streamed.variance())
+
+    @given(cohort=af_st.afid_cohorts(min_size=2, randomize_header=False))
+    def test_dispersion(self, cohort: AfidCohort):
+        accumulator = af_metrics.AfidSetAccumulator()
+        accumulator.update_many(cohort)
+        dispersion = accumulator.dispersion()
+
+        assert dispersion.count == len(cohort)
+        assert dispersion.std.shape == (32, 3)
+        assert dispersion.radial_std.shape == (32,)
+        assert np.allclose(
+            dispersion.radial_std,
+            np.sqrt(np.sum(cohort.coords.var(axis=0, ddof=1), axis=-1)),
+        )
+
+    def test_update_from_path(self):
+        fpath = (
+            Path(__file__).parent
+            / "data"
+            / "tpl-MNI152NLin2009cAsym_afids.fcsv"
+        )
+        accumulator = af_metrics.AfidSetAccumulator()
+        accumulator.update(fpath)
+        accumulator.update(str(fpath))
+
+        assert accumulator.mean_afid_set().coords == pytest.approx(
+            AfidSet.load(fpath).coords
+        )
+        assert np.allclose(accumulator.variance(), 0)
+
+    @given(afid_set=af_st.afid_sets(randomize_header=False))
+    def test_mismatched_coords(self, afid_set: AfidSet):
+        accumulator = af_metrics.AfidSetAccumulator(coord_system="LPS")
+
+        with pytest.raises(ValueError, match=r"Mismatched coordinate.*"):
+            accumulator.update(afid_set)
+
+    def test_empty(self):
+        accumulator = af_metrics.AfidSetAccumulator()
+
+        with pytest.raises(ValueError, match=r"No AfidSet.*"):
+            accumulator.mean_afid_set()
+        with pytest.raises(ValueError, match=r"At least 2 AfidSet.*"):
+            accumulator.variance()
@@ -55,6 +55,18 @@ class TestCreateAfidNii:
         )
         assert isinstance(nii, Nifti1Image)
 
+    @given(afid_voxels=af_st.afid_voxels())
+    @af_helpers.allow_function_scoped
+    def test_create_nii_out_of_bounds(
+        self, afid_voxels: AfidVoxel, template_t1w: Nifti1Image
+    ):
+        afid_voxels.i = -1 - afid_voxels.i
+
+        with pytest.raises(ValueError, match=r".*outside of image.*"):
+            af_plot._create_afid_nii(
+                afid_voxels=[afid_voxels], afid_nii=template_t1w
+            )
+
 
 class TestPlotOrtho:
     @given(afid_voxels=af_st.afid_voxels())
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from importlib import resources
+
+from afids_utils.resources import (
+    load_fcsv_template,
+    load_json_template,
+    load_protocol,
+    load_protocol_index,
+)
+
+
+class TestLoadProtocol:
+    def test_matches_descs(self):
+        with resources.open_text(
+            "afids_utils.resources", "afids_descs.json"
+        ) as json_fpath:
+            mappings = json.load(json_fpath)["human"]
+
+        protocol = load_protocol("human")
+        assert [afid._asdict() for afid in protocol] == mappings
+
+    def test_cached(self):
+        assert load_protocol("human") is load_protocol("human")
+
+    def test_protocol_index(self):
+        protocol = load_protocol("human")
+        index = load_protocol_index("human")
+
+        assert len(index.descs) == len(protocol)
+        for label, afid in enumerate(protocol, start=1):
+            assert index.descs[label - 1] == {afid.desc, afid.acronym}
+            assert index.labels[afid.desc] == label
+            assert index.labels[afid.acronym] == label
+
+
+class TestLoadTemplates:
+    def test_fcsv_template(self):
+        template = load_fcsv_template()
+
+        assert len(template.header) == 3
+        assert template.header[2].startswith("# columns = ")
+        assert len(template.rows) == len(load_protocol())
+        assert [int(row[-3]) for row in template.rows] == list(range(1, 33))
+        assert load_fcsv_template() is template
+
+    def test_json_template(self):
+        template = load_json_template()
+
+        assert "markups" in template.root
+        assert "controlPoints" in template.markup
+        assert [
+            int(control_point["label"])
+            for control_point in template.control_points
+        ] == list(range(1, 33))
+        assert load_json_template() is template
@@ -3,12 +3,14 @@ from __future__ import annotations
 import numpy as np
 import pytest
 from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra.numpy import arrays  # type: ignore
 from numpy.typing import NDArray
 from pytest import approx  # type: ignore
 
 import afids_utils.tests.strategies as af_st
 import afids_utils.transforms as af_xfm
-from afids_utils.afids import AfidPosition, AfidSet, AfidVoxel
+from afids_utils.afids import AfidCohort, AfidPosition, AfidSet, AfidVoxel
 from afids_utils.tests.helpers import deadline
 
 
@@ -76,6 +78,100 @@ class TestAfidRoundTripConvert:
         assert afid_voxel_approx.k == approx(afid_voxel.k, abs=2)
 
 
+class TestBatchWorld2Voxel:
+    @given(afid_set=af_st.afid_sets(), nii_affine=af_st.affine_xfms())
+    @deadline(time=400)
+    def test_matches_single(
+        self, afid_set: AfidSet, nii_affine: NDArray[np.float_]
+    ):
+        voxel_pos = af_xfm.world_to_voxel_batch(afid_set, nii_affine)
+        afid_voxels = af_xfm.afid_set_to_voxels(afid_set, nii_affine)
+
+        assert voxel_pos.shape == (32, 3)
+        assert voxel_pos.dtype == np.int_
+        for afid, afid_voxel, (i, j, k) in zip(
+            afid_set.afids, afid_voxels, voxel_pos
+        ):
+            assert afid_voxel == af_xfm.world_to_voxel(afid, nii_affine)
+            assert (afid_voxel.i, afid_voxel.j, afid_voxel.k) == (i, j, k)
+
+    @given(cohort=af_st.afid_cohorts(), nii_affine=af_st.affine_xfms())
+    @deadline(time=400)
+    def test_cohort_shape(
+        self, cohort: AfidCohort, nii_affine: NDArray[np.float_]
+    ):
+        voxel_pos = af_xfm.world_to_voxel_batch(cohort, nii_affine)
+
+        assert voxel_pos.shape == cohort.coords.shape
+        assert np.array_equal(
+            voxel_pos[0], af_xfm.world_to_voxel_batch(cohort[0], nii_affine)
+        )
+
+    @given(cohort=af_st.afid_cohorts(), nii_affine=af_st.affine_xfms())
+    @deadline(time=400)
+    def test_round_trip(
+        self, cohort: AfidCohort, nii_affine: NDArray[np.float_]
+    ):
+        voxel_pos = af_xfm.world_to_voxel_batch(
+            cohort.coords.reshape(-1, 3), nii_affine
+        )
+        world_pos = af_xfm.voxel_to_world_batch(voxel_pos, nii_affine)
+
+        assert world_pos.shape == (len(cohort) * 32, 3)
+        # Very loose approx, due to lack of imposed constraints
+        assert world_pos == approx(cohort.coords.reshape(-1, 3), abs=10)
+
+    @given(nii_affine=af_st.affine_xfms())
+    def test_cached_inverse(self, nii_affine: NDArray[np.float_]):
+        af_xfm.world_to_voxel_batch(np.zeros((1, 3)), nii_affine)
+        hits = af_xfm._cached_inverse_affine.cache_info().hits
+        af_xfm.world_to_voxel_batch(np.zeros((1, 3)), nii_affine.copy())
+
+        assert af_xfm._cached_inverse_affine.cache_info().hits == hits + 1
+
+    def test_invalid_shape(self):
+        with pytest.raises(ValueError, match=r"Expected coordinates.*"):
+            af_xfm.world_to_voxel_batch(np.zeros((32, 2)), np.eye(4))
+
+
+class TestVoxelBounds:
+    @given(cohort=af_st.afid_cohorts(), nii_affine=af_st.affine_xfms())
+    @deadline(time=400)
+    def test_continuous_rounds_to_voxel(
+        self, cohort: AfidCohort, nii_affine: NDArray[np.float_]
+    ):
+        continuous_pos = af_xfm.world_to_continuous_voxel(cohort, nii_affine)
+
+        assert continuous_pos.dtype == np.float_
+        assert np.array_equal(
+            np.rint(continuous_pos).astype(int),
+            af_xfm.world_to_voxel_batch(cohort, nii_affine),
+        )
+
+    @given(
+        voxel_pos=arrays(  # type: ignore
+            dtype=np.int_,
+            shape=(32, 3),
+            elements=st.integers(min_value=-50, max_value=250),
+        ),
+        nii_shape=st.tuples(*[st.integers(min_value=1, max_value=200)] * 3),
+    )
+    def test_in_bounds_and_clip(
+        self, voxel_pos: NDArray[np.int_], nii_shape: tuple[int, int, int]
+    ):
+        in_bounds = af_xfm.voxels_in_bounds(voxel_pos, nii_shape)
+        clipped = af_xfm.clip_voxels(voxel_pos, nii_shape)
+
+        assert in_bounds.shape == (32,)
+        for pos, valid in zip(voxel_pos, in_bounds):
+            assert valid == all(
+                0 <= idx < dim for idx, dim in zip(pos, nii_shape)
+            )
+        # Clipped voxels are always valid, in-bounds voxels are unchanged
+        assert np.all(af_xfm.voxels_in_bounds(clipped, nii_shape))
+        assert np.array_equal(clipped[in_bounds], voxel_pos[in_bounds])
+
+
 class TestXfmCoordSystem:
     @given(afid_set=af_st.afid_sets())
     @deadline(time=400)
@@ -111,3 +207,69 @@ class TestXfmCoordSystem:
                 -old_afid.y,
                 old_afid.z,
             )
+
+    @given(afid_set=af_st.afid_sets(randomize_header=False))
+    @deadline(time=400)
+    def test_inplace_new_coord_system(self, afid_set: AfidSet):
+        old_coords = afid_set.coords.copy()
+        new_afid_set = af_xfm.xfm_coord_system(afid_set, inplace=True)
+
+        assert new_afid_set is afid_set
+        assert afid_set.coord_system == "LPS"
+        assert np.array_equal(afid_set.coords, old_coords * [-1, -1, 1])
+
+    @given(cohort=af_st.afid_cohorts())
+    @deadline(time=400)
+    def test_cohort_new_coord_system(self, cohort: AfidCohort):
+        new_cohort = af_xfm.xfm_coord_system(cohort, new_coord_system="LPS")
+
+        assert np.all(new_cohort.coord_systems == "LPS")
+        for afid_set, new_afid_set in zip(cohort, new_cohort):
+            assert new_afid_set == af_xfm.xfm_coord_system(afid_set)
+
+    @given(cohort=af_st.afid_cohorts(), inplace=st.booleans())
+    @deadline(time=400)
+    def test_cohort_same_coord_system(self, cohort: AfidCohort, inplace: bool):
+        new_cohort = af_xfm.xfm_coord_system(
+            cohort, new_coord_system="LPS", inplace=inplace
+        )
+
+        assert (new_cohort is cohort) == (
+            inplace or bool(np.all(cohort.coord_systems == "LPS"))
+        )
+        assert (
+            af_xfm.xfm_coord_system(new_cohort, new_coord_system="LPS")
+            is new_cohort
+        )
+
+    @given(cohort=af_st.afid_cohorts())
+    @deadline(time=400)
+    def test_cohort_inplace_keeps_views(self, cohort: AfidCohort):
+        expected = af_xfm.xfm_coord_system(cohort, new_coord_system="RAS")
+        afid_set = cohort[0]
+        old_afid_set = AfidSet.from_array(
+            afid_set.coords.copy(),
+            coord_system=afid_set.coord_system,
+            slicer_version=afid_set.slicer_version,
+        )
+        af_xfm.xfm_coord_system(cohort, new_coord_system="RAS", inplace=True)
+
+        assert cohort == expected
+        assert afid_set == old_afid_set
+
+    @given(cohort=af_st.afid_cohorts())
+    @deadline(time=400)
+    def test_inplace_view_keeps_cohort(self, cohort: AfidCohort):
+        expected = AfidCohort(
+            coords=cohort.coords.copy(),
+            coord_systems=cohort.coord_systems,
+            subject_ids=cohort.subject_ids,
+            slicer_versions=cohort.slicer_versions,
+        )
+        afid_set = cohort[0]
+        new_coord_system = "RAS" if afid_set.coord_system == "LPS" else "LPS"
+        af_xfm.xfm_coord_system(afid_set, new_coord_system, inplace=True)
+
+        # Flipping a set indexed from a cohort does not modify the cohort
+        assert afid_set.coord_system == new_coord_system
+        assert cohort == expected
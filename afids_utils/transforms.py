@@ -1,11 +1,66 @@
 """Methods for transforming between different coordinate systems"""
 from __future__ import annotations
 
-import attrs
+from functools import lru_cache
+from typing import TypeVar, cast, overload
+
 import numpy as np
 from numpy.typing import NDArray
 
-from afids_utils.afids import AfidPosition, AfidSet, AfidVoxel
+from afids_utils.afids import AfidCohort, AfidPosition, AfidSet, AfidVoxel
+
+# Slicer integer representation of coordinate systems
+_COORD_SYSTEMS: dict[str, str] = {"0": "RAS", "1": "LPS"}
+# Sign flip of x and y axes between RAS and LPS coordinates
+_RAS_LPS_FLIP: NDArray[np.float_] = np.array([-1.0, -1.0, 1.0])
+
+# Integer or continuous voxel coordinates
+_VoxelsT = TypeVar("_VoxelsT", NDArray[np.int_], NDArray[np.float_])
+
+
+@lru_cache(maxsize=64)
+def _cached_inverse_affine(affine_bytes: bytes) -> NDArray[np.float_]:
+    """Internal function to invert a (3, 4) affine, cached on its bytes"""
+    affine = np.frombuffer(affine_bytes, dtype=np.float_).reshape(3, 4)
+    inv_rotation = np.linalg.inv(affine[:3, :3])
+
+    inv_affine = np.eye(4)
+    inv_affine[:3, :3] = inv_rotation
+    inv_affine[:3, 3] = -inv_rotation @ affine[:3, 3]
+    inv_affine.flags.writeable = False
+
+    return inv_affine
+
+
+def _inverse_affine(nii_affine: NDArray[np.float_]) -> NDArray[np.float_]:
+    """Internal function to look up the inverse of an affine transformation,
+    computing it only once for repeated calls with the same affine"""
+    affine = np.ascontiguousarray(nii_affine[:3], dtype=np.float_)
+    return _cached_inverse_affine(affine.tobytes())
+
+
+def _apply_affine(
+    affine: NDArray[np.float_], coords: NDArray[np.float_]
+) -> NDArray[np.float_]:
+    """Internal function to apply an affine transformation to an array of
+    coordinates of shape (..., 3) in a single matrix multiplication"""
+    return coords @ affine[:3, :3].T + affine[:3, 3]
+
+
+def _as_coords(
+    afids: AfidSet | AfidCohort | NDArray[np.float_] | NDArray[np.int_],
+) -> NDArray[np.float_]:
+    """Internal function to extract spatial coordinates as an array"""
+    if isinstance(afids, (AfidSet, AfidCohort)):
+        return afids.coords
+
+    coords = np.asarray(afids, dtype=np.float_)
+    if coords.shape[-1:] != (3,):
+        raise ValueError(
+            f"Expected coordinates of shape (..., 3), found: {coords.shape}"
+        )
+
+    return coords
 
 
 def world_to_voxel(
@@ -33,9 +88,7 @@ def world_to_voxel(
     world_pos = np.asarray([afid_world.x, afid_world.y, afid_world.z])
 
     # Translation, rotation, and round to nearest voxel
-    voxel_pos = np.dot(
-        np.linalg.inv(nii_affine[:3, :3]), world_pos - nii_affine[:3, 3]
-    )
+    voxel_pos = _apply_affine(_inverse_affine(nii_affine), world_pos)
     voxel_pos = np.rint(voxel_pos).astype(int)
 
     return AfidVoxel(
@@ -83,23 +136,226 @@ def voxel_to_world(
     )
 
 
+def world_to_continuous_voxel(
+    afids: AfidSet | AfidCohort | NDArray[np.float_],
+    nii_affine: NDArray[np.float_],
+) -> NDArray[np.float_]:
+    """Transform many fiducials from world coordinates to continuous
+    (sub-voxel) voxel coordinates at once, e.g. for interpolation
+
+    Parameters
+    ----------
+    afids
+        ``AfidSet``, ``AfidCohort`` or array of shape (..., 3) (e.g. (N, 3)
+        or (N, 32, 3)) containing floating-point spatial coordinates
+        (x, y, z) to transform
+
+    nii_affine
+        NumPy array containing affine transformation associated with
+        NifTI image
+
+    Returns
+    -------
+    NDArray[np.float_]
+        Array with the same shape as the provided coordinates, containing
+        transformed floating-point voxel coordinates (i, j, k)
+
+    Raises
+    ------
+    ValueError
+        If last dimension of provided array is not of size 3
+    """
+    return _apply_affine(_inverse_affine(nii_affine), _as_coords(afids))
+
+
+def world_to_voxel_batch(
+    afids: AfidSet | AfidCohort | NDArray[np.float_],
+    nii_affine: NDArray[np.float_],
+) -> NDArray[np.int_]:
+    """Transform many fiducials from world coordinates to voxel coordinates
+    at once
+
+    Parameters
+    ----------
+    afids
+        ``AfidSet``, ``AfidCohort`` or array of shape (..., 3) (e.g. (N, 3)
+        or (N, 32, 3)) containing floating-point spatial coordinates
+        (x, y, z) to transform
+
+    nii_affine
+        NumPy array containing affine transformation associated with
+        NifTI image
+
+    Returns
+    -------
+    NDArray[np.int_]
+        Array with the same shape as the provided coordinates, containing
+        transformed integer voxel coordinates (i, j, k)
+
+    Raises
+    ------
+    ValueError
+        If last dimension of provided array is not of size 3
+    """
+    voxel_pos = world_to_continuous_voxel(afids, nii_affine)
+
+    return np.rint(voxel_pos).astype(int)
+
+
+def voxels_in_bounds(
+    afid_voxels: NDArray[np.int_] | NDArray[np.float_],
+    nii_shape: tuple[int, ...],
+) -> NDArray[np.bool_]:
+    """Check which voxel coordinates lie within an image
+
+    Parameters
+    ----------
+    afid_voxels
+        Array of shape (..., 3) containing integer or continuous voxel
+        coordinates (i, j, k)
+
+    nii_shape
+        Shape of NifTI image (only the first 3 dimensions are used)
+
+    Returns
+    -------
+    NDArray[np.bool_]
+        Boolean mask of shape (...), true where all voxel coordinates are
+        within the image
+    """
+    upper = np.asarray(nii_shape[:3]) - 1
+
+    return np.all((afid_voxels >= 0) & (afid_voxels <= upper), axis=-1)
+
+
+def clip_voxels(
+    afid_voxels: _VoxelsT,
+    nii_shape: tuple[int, ...],
+) -> _VoxelsT:
+    """Clip voxel coordinates to the nearest voxel within an image
+
+    Parameters
+    ----------
+    afid_voxels
+        Array of shape (..., 3) containing integer or continuous voxel
+        coordinates (i, j, k)
+
+    nii_shape
+        Shape of NifTI image (only the first 3 dimensions are used)
+
+    Returns
+    -------
+    NDArray[np.int_] | NDArray[np.float_]
+        Array of clipped voxel coordinates, with same shape and type as
+        provided voxel coordinates
+    """
+    return cast(
+        _VoxelsT, np.clip(afid_voxels, 0, np.asarray(nii_shape[:3]) - 1)
+    )
+
+
+def voxel_to_world_batch(
+    afid_voxels: NDArray[np.int_],
+    nii_affine: NDArray[np.float_],
+) -> NDArray[np.float_]:
+    """Transform many fiducials from voxel coordinates to world coordinates
+    at once
+
+    Parameters
+    ----------
+    afid_voxels
+        Array of shape (..., 3) containing voxel coordinates (i, j, k)
+
+    nii_affine
+        NumPy array containing affine transformation associated with
+        NifTI image
+
+    Returns
+    -------
+    NDArray[np.float_]
+        Array with the same shape as the provided voxel coordinates,
+        containing approximate floating-point spatial coordinates (x, y, z)
+
+    Raises
+    ------
+    ValueError
+        If last dimension of provided array is not of size 3
+    """
+    return _apply_affine(
+        np.asarray(nii_affine, dtype=np.float_), _as_coords(afid_voxels)
+    )
+
+
+def afid_set_to_voxels(
+    afid_set: AfidSet,
+    nii_affine: NDArray[np.float_],
+) -> list[AfidVoxel]:
+    """Transform all fiducials of an ``AfidSet`` to voxel coordinates
+
+    Parameters
+    ----------
+    afid_set
+        Object containing valid AfidSet
+
+    nii_affine
+        NumPy array containing affine transformation associated with
+        NifTI image
+
+    Returns
+    -------
+    list[AfidVoxel]
+        Transformed integer voxel coordinates (i, j, k), ordered by label
+    """
+    voxel_pos = world_to_voxel_batch(afid_set, nii_affine)
+
+    return [
+        AfidVoxel(label=afid.label, i=i, j=j, k=k, desc=afid.desc)
+        for afid, (i, j, k) in zip(afid_set.afids, voxel_pos.tolist())
+    ]
+
+
+@overload
 def xfm_coord_system(
-    afid_set: AfidSet, new_coord_system: str = "LPS"
+    afid_set: AfidSet, new_coord_system: str = ..., inplace: bool = ...
 ) -> AfidSet:
-    """Convert AFID set between RAS and LPS coordinates
+    ...
+
+
+@overload
+def xfm_coord_system(
+    afid_set: AfidCohort, new_coord_system: str = ..., inplace: bool = ...
+) -> AfidCohort:
+    ...
+
+
+def xfm_coord_system(
+    afid_set: AfidSet | AfidCohort,
+    new_coord_system: str = "LPS",
+    inplace: bool = False,
+) -> AfidSet | AfidCohort:
+    """Convert AFID set (or every set of a cohort) between RAS and LPS
+    coordinates
 
     Parameters
     ----------
     afid_set
-        Object containing valid AfidSet
+        Object containing valid AfidSet or AfidCohort
 
     new_coord_system
         Convert AFID set to defined coordinate system (default: 'LPS')
 
+    inplace
+        Update provided object instead of creating a copy (default: False).
+        Coordinates are only flipped in memory if owned by an ``AfidSet``,
+        so objects sharing memory (e.g. an ``AfidSet`` indexed from an
+        ``AfidCohort``) keep coordinates matching their coordinate system
+
     Returns
     -------
-    AfidSet
-        Object containing AFIDs stored in defined coordinate system
+    AfidSet | AfidCohort
+        Object containing AFIDs stored in defined coordinate system. The
+        provided object is returned as-is if already in the defined
+        coordinate system
 
     Raises
     ------
@@ -111,13 +367,60 @@ def xfm_coord_system(
             "Unrecognized coordinate system - please select RAS or LPS"
         )
 
-    if afid_set.coord_system == new_coord_system:
+    if isinstance(afid_set, AfidCohort):
+        return _xfm_cohort_coord_system(afid_set, new_coord_system, inplace)
+
+    if (
+        _COORD_SYSTEMS.get(afid_set.coord_system, afid_set.coord_system)
+        == new_coord_system
+    ):
+        return afid_set
+
+    if inplace:
+        if afid_set._coords.flags.owndata:
+            afid_set._coords *= _RAS_LPS_FLIP
+        else:
+            afid_set._coords = afid_set._coords * _RAS_LPS_FLIP
+        afid_set.coord_system = new_coord_system
         return afid_set
 
     # Create copy and update AFIDs for new coordinate system
-    new_afids = [
-        attrs.evolve(afid, x=-afid.x, y=-afid.y) for afid in afid_set.afids
-    ]
-    return attrs.evolve(
-        afid_set, coord_system=new_coord_system, afids=new_afids
+    return AfidSet._from_coords(
+        slicer_version=afid_set.slicer_version,
+        coord_system=new_coord_system,
+        coords=afid_set.coords * _RAS_LPS_FLIP,
+    )
+
+
+def _xfm_cohort_coord_system(
+    cohort: AfidCohort, new_coord_system: str, inplace: bool
+) -> AfidCohort:
+    """Internal function to convert only those subjects of a cohort not
+    already in the defined coordinate system"""
+    coord_systems = cohort.coord_systems.astype(object)
+    for slicer_coord, coord_system in _COORD_SYSTEMS.items():
+        coord_systems[coord_systems == slicer_coord] = coord_system
+    to_flip = coord_systems != new_coord_system
+
+    if not np.any(to_flip):
+        return cohort
+
+    new_coord_systems = np.where(to_flip, new_coord_system, coord_systems)
+    new_coords = np.where(
+        to_flip[:, np.newaxis, np.newaxis],
+        cohort.coords * _RAS_LPS_FLIP,
+        cohort.coords,
+    )
+    if inplace:
+        # Sets previously indexed from the cohort keep their (unflipped)
+        # coordinates, as they are not relabelled
+        cohort.coords = new_coords
+        cohort.coord_systems = new_coord_systems  # pyright: ignore
+        return cohort
+
+    return AfidCohort(
+        coords=new_coords,
+        coord_systems=new_coord_systems,
+        subject_ids=cohort.subject_ids,
+        slicer_versions=cohort.slicer_versions,
     )